@@ -1,24 +1,58 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
-from requests.auth import HTTPBasicAuth
 
-from .compat_typing import Literal, List, Dict
-from .api.syntax import SyntaxCheckResult, syntax_check
+from .compat_typing import Literal, Iterator, List, Dict, Optional, Tuple, Union
+from .api.syntax import (
+    SyntaxCheckInput,
+    SyntaxCheckResult,
+    chunk_syntax_check_inputs,
+    syntax_check,
+    syntax_check_many,
+)
 from .api.objectstructure import object_structure
+from .api.nodestructure import RepositoryNode, node_structure
 from .api.prettyprint import (
     PrettyPrintSettings,
     prettyprint,
     set_pretty_printer_settings,
 )
 from .api.create import create, create_test_class_include
-from .api.activate import activate
+from .api.activate import (
+    ActivationResult,
+    activate,
+    activate_many,
+    get_inactive_objects,
+)
 from .api.create import ObjectTypes
 from .api.delete import delete
 from .api.lock import lock, unlock
-from .api.login import login
-from .api.content import get_object_source, set_object_source
-from .api.search import search_object
-from .api.unittest import UnitTestAlert, UnittestFlags, run_unit_test
+from .api.login import login, logoff
+from .api.content import (
+    get_object_source,
+    get_object_source_conditional,
+    set_object_source,
+)
+from .api.search import iter_search_object, search_object
+from .api.unittest import UnitTestAlert, UnittestFlags, run_unit_test, run_unit_tests
+from .api.usages import UsageReference, usage_references
+from .concurrency import RequestThrottle
 from .http_request import HttpRequestParameters
+from .instrumentation import Instrumentation
+from .records import (
+    ComponentRecord,
+    ObjectReferenceRecord,
+    SyntaxCheckRecord,
+    UnitTestAlertRecord,
+    to_records,
+)
+from .prettyprint_cache import PrettyPrintCache, prettyprint_cache_key
+from .search_cache import SearchCache, matches_object_type
+from .session_store import SessionStore
+from .source_cache import SourceCache
+from .usage_cache import UsageCache
+from .transport import RequestsTransport, Transport, TransportName, create_transport
 
 
 class AdtClient:
@@ -28,64 +62,311 @@ class AdtClient:
     statefulness: Literal["stateless", "stateful"] = "stateless"
 
     def __init__(
-        self, sap_host: str, username: str, password: str, client: str, language: str
+        self,
+        sap_host: str,
+        username: str,
+        password: str,
+        client: str,
+        language: str,
+        source_cache: Optional[SourceCache] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        search_cache: Optional[SearchCache] = None,
+        prettyprint_cache: Optional[PrettyPrintCache] = None,
+        session_store: Optional[SessionStore] = None,
+        transport: Union[TransportName, Transport] = "http1",
+        usage_cache: Optional[UsageCache] = None,
+        throttle: Optional[RequestThrottle] = None,
     ):
         self.username = username
-        self.session = requests.Session()
-        self.session.auth = HTTPBasicAuth(username, password)
+        self.transport = (
+            create_transport(transport) if isinstance(transport, str) else transport
+        )
+        self.transport.set_auth(username, password)
+        # kept for callers configuring the requests session directly
+        self.session: Optional[requests.Session] = (
+            self.transport.session
+            if isinstance(self.transport, RequestsTransport)
+            else None
+        )
         self.sap_host = sap_host
         self.client = client
         self.language = language
+        self.source_cache = source_cache
+        self.search_cache = search_cache
+        self.prettyprint_cache = prettyprint_cache
+        self.usage_cache = usage_cache
+        self.throttle = throttle
+        self.pretty_printer_settings: Optional[PrettyPrintSettings] = None
+        # lock handle to object uri of the locks taken in this session
+        self.locks: Dict[str, str] = {}
+        self.instrumentation = (
+            instrumentation if instrumentation is not None else Instrumentation()
+        )
+        self._request_number_lock = threading.Lock()
+        self._csrf_token_lock = threading.Lock()
+        self.session_store = session_store
+        self.session_restored = False
+        if session_store is not None:
+            self._restore_session()
 
     def build_request_parameters(self) -> HttpRequestParameters:
+        with self._request_number_lock:
+            request_number = self.request_number
+            self.request_number += 1
         http_request_parameters: HttpRequestParameters = {
             "host": self.sap_host,
             "csrf_token": self.csrf_token,
             "statefulness": self.statefulness,
-            "request_number": self.request_number,
-            "session": self.session,
+            "request_number": request_number,
+            "transport": self.transport,
+            "instrumentation": self.instrumentation,
+            "csrf_token_refresher": self.refresh_csrf_token,
         }
-        self.request_number += 1
+        if self.throttle is not None:
+            http_request_parameters["throttle"] = self.throttle
         return http_request_parameters
 
-    def login(self) -> bool:
-        http_request_parameters = self.build_request_parameters()
-        csrf_token = login(http_request_parameters)
-        if csrf_token:
-            self.csrf_token = csrf_token
-            return True
-        else:
-            raise Exception("Login failed.")
+    @property
+    def system_id(self) -> str:
+        return f"{self.sap_host}/{self.client}"
 
-    def search_object(self, query: str, max_results: int = 1) -> List[Dict[str, str]]:
+    def _invalidate_source_cache(self, object_uri: str):
+        if self.source_cache is not None:
+            self.source_cache.invalidate(self.system_id, object_uri)
+
+    def _fetch_csrf_token(self) -> str:
         http_request_parameters = self.build_request_parameters()
-        elements = search_object(http_request_parameters, query, max_results)
+        http_request_parameters["csrf_token"] = "fetch"
+        del http_request_parameters["csrf_token_refresher"]
+        return login(http_request_parameters)
+
+    def _restore_session(self):
+        stored = self.session_store.load(self.sap_host, self.client, self.username)
+        if stored is None:
+            return
+        for cookie in stored["cookies"]:
+            self.transport.cookies.set_cookie(requests.cookies.create_cookie(**cookie))
+        self.csrf_token = stored["csrf_token"]
+        self.session_restored = True
+
+    def save_session(self):
+        if self.session_store is None or self.csrf_token == "fetch":
+            return
+        cookies = [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "secure": cookie.secure,
+                "expires": cookie.expires,
+            }
+            for cookie in self.transport.cookies
+        ]
+        self.session_store.save(
+            self.sap_host, self.client, self.username, self.csrf_token, cookies
+        )
+
+    def login(self, force: bool = False) -> bool:
+        with self._csrf_token_lock:
+            if self.session_restored and not force:
+                # checked by the first request, refresh_csrf_token replaces a dead session
+                return True
+            csrf_token = self._fetch_csrf_token()
+            if csrf_token:
+                self.csrf_token = csrf_token
+                self.session_restored = False
+                self.save_session()
+                return True
+            else:
+                raise Exception("Login failed.")
+
+    def refresh_csrf_token(self, rejected_token: str) -> str:
+        with self._csrf_token_lock:
+            # another thread already replaced the rejected token
+            if self.csrf_token not in [rejected_token, "fetch"]:
+                return self.csrf_token
+            self.csrf_token = self._fetch_csrf_token()
+            self.session_restored = False
+            self.save_session()
+            return self.csrf_token
+
+    def search_object(
+        self, query: str, max_results: int = 1, compact: bool = False
+    ) -> Union[List[Dict[str, str]], List[ObjectReferenceRecord]]:
+        elements = None
+        if self.search_cache is not None:
+            elements = self.search_cache.get(query, max_results)
+
+        if elements is None:
+            http_request_parameters = self.build_request_parameters()
+            elements = search_object(http_request_parameters, query, max_results)
+            if self.search_cache is not None:
+                self.search_cache.put(query, max_results, elements)
+        if compact:
+            return list(to_records(ObjectReferenceRecord, elements))
+        return elements
+
+    def resolve_uri(
+        self, name: str, object_type: Optional[str] = None, max_results: int = 50
+    ) -> Optional[str]:
+        if self.search_cache is not None:
+            reference = self.search_cache.lookup(name, object_type)
+            if reference is not None:
+                return reference["uri"]
+
+        for reference in self.search_object(name, max_results):
+            if reference.get("name", "").upper() == name.upper() and (
+                matches_object_type(reference, object_type)
+            ):
+                return reference["uri"]
+        return None
+
+    def iter_search_object(
+        self, query: str, max_results: int = 1, compact: bool = False
+    ) -> Union[Iterator[Dict[str, str]], Iterator[ObjectReferenceRecord]]:
+        elements = self._iter_search_object(query, max_results)
+        if compact:
+            return to_records(ObjectReferenceRecord, elements)
         return elements
 
+    def _iter_search_object(self, query: str, max_results: int) -> Iterator[Dict[str, str]]:
+        if self.search_cache is None:
+            http_request_parameters = self.build_request_parameters()
+            yield from iter_search_object(http_request_parameters, query, max_results)
+            return
+
+        cached = self.search_cache.get(query, max_results)
+        if cached is not None:
+            yield from cached
+            return
+        http_request_parameters = self.build_request_parameters()
+        elements: List[Dict[str, str]] = []
+        complete = False
+        try:
+            for element in iter_search_object(http_request_parameters, query, max_results):
+                elements.append(element)
+                yield element
+            complete = True
+        finally:
+            # a search stopped early is not cached, but the names it found are
+            if complete:
+                self.search_cache.put(query, max_results, elements)
+            else:
+                self.search_cache.index(elements)
+
     def get_object_source(
         self, object_uri: str, version: Literal["active", "inactive"] = "active"
     ) -> str:
         http_request_parameters = self.build_request_parameters()
-        response = get_object_source(http_request_parameters, object_uri, version)
-        return response
+        if self.source_cache is None:
+            response = get_object_source(http_request_parameters, object_uri, version)
+            return response
+
+        key = (self.system_id, object_uri, version)
+        cached = self.source_cache.get(key)
+        response = get_object_source_conditional(
+            http_request_parameters,
+            object_uri,
+            version,
+            etag=cached["etag"] if cached else None,
+            last_modified=cached["last_modified"] if cached else None,
+        )
+        if not response["modified"] and cached is not None:
+            self.source_cache.record_hit()
+            return cached["source"]
+
+        self.source_cache.record_miss()
+        if response["etag"] or response["last_modified"]:
+            self.source_cache.put(
+                key,
+                {
+                    "source": response["source"],
+                    "etag": response["etag"],
+                    "last_modified": response["last_modified"],
+                },
+            )
+        return response["source"]
 
     def activate(self, object_name: str, object_uri: str) -> bool:
         http_request_parameters = self.build_request_parameters()
         response = activate(http_request_parameters, object_name, object_uri)
+        self._invalidate_source_cache(object_uri)
+        return response
+
+    def activate_many(
+        self, objects: List[Tuple[str, str]], chunk_size: int = 100
+    ) -> List[ActivationResult]:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        results: List[ActivationResult] = []
+        for start in range(0, len(objects), chunk_size):
+            http_request_parameters = self.build_request_parameters()
+            results.extend(
+                activate_many(
+                    http_request_parameters, objects[start : start + chunk_size]
+                )
+            )
+        for _, object_uri in objects:
+            self._invalidate_source_cache(object_uri)
+        return results
+
+    def get_inactive_objects(self) -> List[Dict[str, str]]:
+        http_request_parameters = self.build_request_parameters()
+        response = get_inactive_objects(http_request_parameters)
         return response
 
+    def activate_inactive_objects(
+        self, chunk_size: int = 100
+    ) -> List[ActivationResult]:
+        inactive_objects = self.get_inactive_objects()
+        objects = [(element["name"], element["uri"]) for element in inactive_objects]
+        return self.activate_many(objects, chunk_size)
+
     def lock(self, object_uri: str) -> str:
         self.statefulness = "stateful"
         http_request_parameters = self.build_request_parameters()
         response = lock(http_request_parameters, object_uri)
+        self.locks[response] = object_uri
         return response
 
+    def _end_lock(self, lock_handle: str):
+        self.locks.pop(lock_handle, None)
+        if not self.locks:
+            self.statefulness = "stateless"
+
     def unlock(self, object_uri: str, lock_handle: str) -> bool:
         http_request_parameters = self.build_request_parameters()
         response = unlock(http_request_parameters, object_uri, lock_handle)
+        self._end_lock(lock_handle)
+        return response
+
+    def logoff(self) -> bool:
+        """Ends the server session, which releases the locks it holds."""
+        http_request_parameters = self.build_request_parameters()
+        response = logoff(http_request_parameters)
+        self.locks.clear()
         self.statefulness = "stateless"
+        self.csrf_token = "fetch"
         return response
 
+    def release_locks(self) -> List[str]:
+        """Unlocks everything locked in this session, or ends the session when that fails.
+
+        Returns the uris of the objects that may still be locked, never raises.
+        """
+        for lock_handle, object_uri in list(self.locks.items()):
+            try:
+                self.unlock(object_uri, lock_handle)
+            except Exception:
+                pass
+        if self.statefulness == "stateful":
+            try:
+                self.logoff()
+            except Exception:
+                pass
+        return list(self.locks.values())
+
     def set_object_source(
         self, object_uri: str, source_code: str, lock_handle: str
     ) -> bool:
@@ -93,18 +374,39 @@ class AdtClient:
         response = set_object_source(
             http_request_parameters, object_uri, source_code, lock_handle
         )
+        self._invalidate_source_cache(object_uri)
         return response
 
     def run_unit_test(
-        self, object_uri: str, unit_test_flags: UnittestFlags = UnittestFlags()
-    ) -> List[UnitTestAlert]:
+        self,
+        object_uri: str,
+        unit_test_flags: UnittestFlags = UnittestFlags(),
+        compact: bool = False,
+    ) -> Union[List[UnitTestAlert], List[UnitTestAlertRecord]]:
         http_request_parameters = self.build_request_parameters()
         response = run_unit_test(http_request_parameters, object_uri, unit_test_flags)
+        if compact:
+            return list(to_records(UnitTestAlertRecord, response))
+        return response
+
+    def run_unit_tests(
+        self,
+        object_uris: List[str],
+        unit_test_flags: UnittestFlags = UnittestFlags(),
+        compact: bool = False,
+    ) -> Union[List[UnitTestAlert], List[UnitTestAlertRecord]]:
+        http_request_parameters = self.build_request_parameters()
+        response = run_unit_tests(http_request_parameters, object_uris, unit_test_flags)
+        if compact:
+            return list(to_records(UnitTestAlertRecord, response))
         return response
 
     def delete(self, object_uri: str, lock_handle: str) -> bool:
         http_request_parameters = self.build_request_parameters()
         response = delete(http_request_parameters, object_uri, lock_handle)
+        # the lock ended with the object
+        self._end_lock(lock_handle)
+        self._invalidate_source_cache(object_uri)
         return response
 
     def create(
@@ -128,14 +430,53 @@ class AdtClient:
         )
         return response
 
-    def prettyprint(self, src: str) -> str:
+    def _prettyprint_cache_key(self, src: str) -> str:
+        return prettyprint_cache_key(
+            self.system_id, self.username, self.pretty_printer_settings, src
+        )
+
+    def _prettyprint_and_cache(self, src: str) -> str:
         http_request_parameters = self.build_request_parameters()
         response = prettyprint(http_request_parameters, src)
+        if self.prettyprint_cache is not None:
+            # unknown server settings may change before the next process, keep those in memory
+            self.prettyprint_cache.put(
+                self._prettyprint_cache_key(src),
+                response,
+                persist=self.pretty_printer_settings is not None,
+            )
         return response
 
+    def prettyprint(self, src: str) -> str:
+        if self.prettyprint_cache is not None:
+            cached = self.prettyprint_cache.get(self._prettyprint_cache_key(src))
+            if cached is not None:
+                return cached
+        return self._prettyprint_and_cache(src)
+
+    def prettyprint_many(self, sources: List[str], max_workers: int = 8) -> List[str]:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        formatted: Dict[str, str] = {}
+        uncached = []
+        for src in dict.fromkeys(sources):
+            cached = None
+            if self.prettyprint_cache is not None:
+                cached = self.prettyprint_cache.get(self._prettyprint_cache_key(src))
+            if cached is None:
+                uncached.append(src)
+            else:
+                formatted[src] = cached
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            responses = executor.map(self._prettyprint_and_cache, uncached)
+            formatted.update(zip(uncached, responses))
+        return [formatted[src] for src in sources]
+
     def prettyprint_settings(self, settings: PrettyPrintSettings) -> bool:
         http_request_parameters = self.build_request_parameters()
         response = set_pretty_printer_settings(http_request_parameters, settings)
+        self.pretty_printer_settings = dict(settings)
         return response
 
     def syntax_check(
@@ -144,14 +485,65 @@ class AdtClient:
         include_uri: str,
         src: str,
         version: Literal["active", "inactive"] = "active",
-    ) -> List[SyntaxCheckResult]:
+        compact: bool = False,
+    ) -> Union[List[SyntaxCheckResult], List[SyntaxCheckRecord]]:
         http_request_parameters = self.build_request_parameters()
         response = syntax_check(
             http_request_parameters, object_uri, include_uri, src, version
         )
+        if compact:
+            return list(to_records(SyntaxCheckRecord, response))
         return response
 
-    def object_structure(self, object_uri: str):
+    def syntax_check_many(
+        self,
+        checks: List[SyntaxCheckInput],
+        chunk_size: int = 50,
+        max_chunk_bytes: int = 4 * 1024 * 1024,
+        max_workers: int = 1,
+        compact: bool = False,
+    ) -> Union[Dict[str, List[SyntaxCheckResult]], Dict[str, List[SyntaxCheckRecord]]]:
+        if chunk_size < 1 or max_workers < 1:
+            raise ValueError("chunk_size and max_workers must be at least 1")
+        chunks = chunk_syntax_check_inputs(checks, chunk_size, max_chunk_bytes)
+
+        def check_chunk(chunk: List[SyntaxCheckInput]):
+            http_request_parameters = self.build_request_parameters()
+            return syntax_check_many(http_request_parameters, chunk)
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for chunk_results in executor.map(check_chunk, chunks):
+                for object_uri, messages in chunk_results.items():
+                    if compact:
+                        messages = to_records(SyntaxCheckRecord, messages)
+                    results.setdefault(object_uri, []).extend(messages)
+        return results
+
+    def object_structure(self, object_uri: str, compact: bool = False):
         http_request_parameters = self.build_request_parameters()
         response = object_structure(http_request_parameters, object_uri)
+        if compact:
+            response["components"] = list(
+                to_records(ComponentRecord, response["components"])
+            )
+        return response
+
+    def node_structure(
+        self, parent_type: str, parent_name: str
+    ) -> List[RepositoryNode]:
+        http_request_parameters = self.build_request_parameters()
+        response = node_structure(http_request_parameters, parent_type, parent_name)
         return response
+
+    def usage_references(self, object_uri: str) -> List[UsageReference]:
+        if self.usage_cache is not None:
+            references = self.usage_cache.get(self.system_id, object_uri)
+            if references is not None:
+                return references
+
+        http_request_parameters = self.build_request_parameters()
+        references = usage_references(http_request_parameters, object_uri)
+        if self.usage_cache is not None:
+            self.usage_cache.put(self.system_id, object_uri, references)
+        return references
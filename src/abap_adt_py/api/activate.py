@@ -1,26 +1,145 @@
+import xml.etree.ElementTree as et
+from xml.sax.saxutils import quoteattr
+
+from ..compat_typing import Dict, List, Tuple, TypedDict
 from ..http_request import HttpRequestParameters, request
-from ..response_parsing import find_xml_element_attributes, find_xml_elements_attributes
+from ..response_parsing import (
+    _et_to_attributes_dict,
+    find_xml_element_attributes,
+    find_xml_elements_attributes,
+)
+from .xml_namespaces import XML_NAMESPACES
 
 
-def activate(
-    http_request_parameters: HttpRequestParameters, object_name: str, object_uri: str
-) -> bool:
+class ActivationMessage(TypedDict):
+    type: str
+    href: str
+    object_description: str
+    short_text: str
+
 
-    body = f"""
+class ActivationResult(TypedDict):
+    name: str
+    uri: str
+    activated: bool
+    messages: List[ActivationMessage]
+    # messages of the same activation call that name none of its objects
+    batch_messages: List[ActivationMessage]
+
+
+def _build_activation_body(objects: List[Tuple[str, str]]) -> str:
+    object_references = "\n".join(
+        f"        <adtcore:objectReference adtcore:uri={quoteattr(object_uri)} "
+        f"adtcore:name={quoteattr(object_name)}/>"
+        for object_name, object_uri in objects
+    )
+    return f"""
     <?xml version="1.0" encoding="UTF-8"?>
     <adtcore:objectReferences xmlns:adtcore="http://www.sap.com/adt/core">
-        <adtcore:objectReference adtcore:uri="{object_uri}" adtcore:name="{object_name}"/>
+{object_references}
     </adtcore:objectReferences>
     """
 
-    response = request(
+
+def _post_activation(
+    http_request_parameters: HttpRequestParameters, objects: List[Tuple[str, str]]
+):
+    return request(
         http_request_parameters,
         uri="/sap/bc/adt/activation",
         params={"method": "activate", "preauditRequested": "true"},
-        body=body,
+        body=_build_activation_body(objects),
         method="POST",
         content_type="application/xml",
     )
+
+
+def _parse_activation_messages(xml_text: str) -> List[ActivationMessage]:
+    root = et.fromstring(xml_text)
+    messages: List[ActivationMessage] = []
+    for msg in root.findall("msg", XML_NAMESPACES):
+        attributes = _et_to_attributes_dict(msg)
+        short_text = msg.find("shortText", XML_NAMESPACES)
+        messages.append(
+            {
+                "type": attributes.get("type", ""),
+                "href": attributes.get("href", ""),
+                "object_description": attributes.get("objDescr", ""),
+                "short_text": (
+                    "".join(short_text.itertext()).strip()
+                    if short_text is not None
+                    else ""
+                ),
+            }
+        )
+    return messages
+
+
+def _owner_index(
+    message: ActivationMessage, objects: List[Tuple[str, str]]
+) -> int:
+    # longest matching uri wins, e.g. a function module over its function group
+    href = message["href"].lower()
+    best_index, best_length = -1, -1
+    for index, (object_name, object_uri) in enumerate(objects):
+        object_uri = object_uri.lower()
+        if href and (href == object_uri or href.startswith(object_uri + "/")):
+            if len(object_uri) > best_length:
+                best_index, best_length = index, len(object_uri)
+    if best_index >= 0:
+        return best_index
+
+    description = message["object_description"].upper().split()
+    for index, (object_name, object_uri) in enumerate(objects):
+        if object_name.upper() in description:
+            return index
+    return -1
+
+
+def _parse_mass_activation_response(
+    xml_text: str, objects: List[Tuple[str, str]]
+) -> List[ActivationResult]:
+    batch_messages: List[ActivationMessage] = []
+    results: List[ActivationResult] = [
+        {
+            "name": object_name,
+            "uri": object_uri,
+            "activated": True,
+            "messages": [],
+            "batch_messages": batch_messages,
+        }
+        for object_name, object_uri in objects
+    ]
+    if not xml_text.strip():
+        return results
+
+    properties = find_xml_element_attributes(xml_text, "chkl:properties")
+    executed = (
+        properties.get("activationExecuted") == "true"
+        or properties.get("generationExecuted") == "true"
+    )
+
+    for message in _parse_activation_messages(xml_text):
+        index = _owner_index(message, objects)
+        if index < 0:
+            # whether the objects were activated is left to activationExecuted
+            batch_messages.append(message)
+            continue
+        results[index]["messages"].append(message)
+        if message["type"] in ["E", "A", "X"]:
+            results[index]["activated"] = False
+
+    if not executed:
+        for result in results:
+            result["activated"] = False
+    return results
+
+
+def activate(
+    http_request_parameters: HttpRequestParameters, object_name: str, object_uri: str
+) -> bool:
+
+    response = _post_activation(http_request_parameters, [(object_name, object_uri)])
     properties = find_xml_element_attributes(response.text, "chkl:properties")
     if (
         properties["activationExecuted"] == "true"
@@ -30,3 +149,45 @@ def activate(
     else:
         msg_elements = find_xml_elements_attributes(response.text, "msg")
         raise Exception(f"{response.status_code} - Activation failed.\n{msg_elements}")
+
+
+def activate_many(
+    http_request_parameters: HttpRequestParameters, objects: List[Tuple[str, str]]
+) -> List[ActivationResult]:
+
+    response = _post_activation(http_request_parameters, objects)
+    if 200 <= response.status_code < 300:
+        return _parse_mass_activation_response(response.text, objects)
+    else:
+        raise Exception(
+            f"{response.status_code} - Activation of {len(objects)} objects failed.\n{response.text}"
+        )
+
+
+def get_inactive_objects(
+    http_request_parameters: HttpRequestParameters,
+) -> List[Dict[str, str]]:
+
+    response = request(
+        http_request_parameters,
+        uri="/sap/bc/adt/activation/inactiveobjects",
+        params={},
+        body="",
+        method="GET",
+        content_type="application/xml",
+    )
+    if response.status_code == 200:
+        if not response.text.strip():
+            return []
+        references = find_xml_elements_attributes(
+            response.text, "ioc:entry/ioc:object/ioc:ref"
+        )
+        unique_references = {}
+        for reference in references:
+            if reference.get("uri"):
+                unique_references.setdefault(reference["uri"], reference)
+        return list(unique_references.values())
+    else:
+        raise Exception(
+            f"{response.status_code} - Failed to get inactive objects.\n{response.text}"
+        )
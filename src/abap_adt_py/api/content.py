@@ -1,7 +1,14 @@
-from ..compat_typing import Literal
+from ..compat_typing import Literal, Optional, TypedDict
 from ..http_request import HttpRequestParameters, request
 
 
+class ConditionalSourceResponse(TypedDict):
+    modified: bool
+    source: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
 def get_object_source(
     http_request_parameters: HttpRequestParameters,
     object_uri: str,
@@ -29,6 +36,54 @@ def get_object_source(
         )
 
 
+def get_object_source_conditional(
+    http_request_parameters: HttpRequestParameters,
+    object_uri: str,
+    version: Literal["active", "inactive"] = "active",
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+) -> ConditionalSourceResponse:
+
+    params = {}
+    if version:
+        params["version"] = version
+
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    response = request(
+        http_request_parameters=http_request_parameters,
+        uri=object_uri,
+        method="GET",
+        body="",
+        params=params,
+        content_type="application/xml",
+        headers=headers,
+    )
+
+    if response.status_code == 304:
+        return {
+            "modified": False,
+            "source": "",
+            "etag": response.headers.get("ETag", etag),
+            "last_modified": response.headers.get("Last-Modified", last_modified),
+        }
+    elif response.status_code == 200:
+        return {
+            "modified": True,
+            "source": response.text,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+    else:
+        raise Exception(
+            f"{response.status_code} - Failed to get object source.\n{response.text}"
+        )
+
+
 def set_object_source(
     http_request_parameters: HttpRequestParameters,
     object_uri: str,
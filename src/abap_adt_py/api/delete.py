@@ -1,4 +1,4 @@
-from ..http_request import HttpRequestParameters, request
+from ..http_request import AdtRequestError, HttpRequestParameters, request
 
 
 def delete(http_request_parameters: HttpRequestParameters, object_uri: str, lock_handle: str) -> bool:
@@ -12,6 +12,7 @@ def delete(http_request_parameters: HttpRequestParameters, object_uri: str, lock
     if response.status_code == 200:
         return True
     else:
-        raise Exception(
-            f"{response.status_code} Failed to delete {object_uri}.\n{response.text}"
+        raise AdtRequestError(
+            response.status_code,
+            f"{response.status_code} Failed to delete {object_uri}.\n{response.text}",
         )
\ No newline at end of file
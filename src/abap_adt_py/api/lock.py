@@ -1,4 +1,4 @@
-from ..http_request import HttpRequestParameters, request
+from ..http_request import AdtRequestError, HttpRequestParameters, request
 from ..response_parsing import find_xml_element_text
 
 
@@ -14,8 +14,9 @@ def lock(http_request_parameters: HttpRequestParameters, object_uri: str) -> str
         lock_handle = find_xml_element_text(response.text, ".//LOCK_HANDLE")
         return lock_handle
     else:
-        raise Exception(
-            f"{response.status_code} Failed to lock {object_uri}.\n{response.text}"
+        raise AdtRequestError(
+            response.status_code,
+            f"{response.status_code} Failed to lock {object_uri}.\n{response.text}",
         )
 
 
@@ -33,6 +34,7 @@ def unlock(
     if response.status_code == 200:
         return True
     else:
-        raise Exception(
-            f"{response.status_code} Failed to unlock {object_uri}\n{response.text}"
+        raise AdtRequestError(
+            response.status_code,
+            f"{response.status_code} Failed to unlock {object_uri}\n{response.text}",
         )
@@ -18,3 +18,19 @@ def login(http_request_parameters: HttpRequestParameters) -> str:
         return csrf_token
     else:
         raise Exception(f"{response.status_code} - Login failed.\n{response.text}")
+
+
+def logoff(http_request_parameters: HttpRequestParameters) -> bool:
+
+    response = request(
+        http_request_parameters=http_request_parameters,
+        uri="/sap/public/bc/icf/logoff",
+        method="GET",
+        body="",
+        params={},
+    )
+
+    if response.status_code == 200:
+        return True
+    else:
+        raise Exception(f"{response.status_code} - Logoff failed.\n{response.text}")
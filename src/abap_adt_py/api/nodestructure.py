@@ -0,0 +1,54 @@
+import xml.etree.ElementTree as et
+
+from ..compat_typing import List, TypedDict
+from ..http_request import HttpRequestParameters, request
+
+
+class RepositoryNode(TypedDict):
+    object_type: str
+    object_name: str
+    object_uri: str
+    description: str
+    expandable: bool
+
+
+def _parse_node_structure_response(xml_text: str) -> List[RepositoryNode]:
+    root = et.fromstring(xml_text)
+    nodes: List[RepositoryNode] = []
+    for node in root.iter("SEU_ADT_REPOSITORY_OBJ_NODE"):
+        nodes.append(
+            {
+                "object_type": node.findtext("OBJECT_TYPE", ""),
+                "object_name": node.findtext("OBJECT_NAME", ""),
+                "object_uri": node.findtext("OBJECT_URI", ""),
+                "description": node.findtext("DESCRIPTION", ""),
+                "expandable": node.findtext("EXPANDABLE", "") == "X",
+            }
+        )
+    return nodes
+
+
+def node_structure(
+    http_request_parameters: HttpRequestParameters, parent_type: str, parent_name: str
+) -> List[RepositoryNode]:
+
+    response = request(
+        http_request_parameters,
+        uri="/sap/bc/adt/repository/nodestructure",
+        params={
+            "parent_type": parent_type,
+            "parent_name": parent_name,
+            "withShortDescriptions": "false",
+        },
+        body="",
+        method="POST",
+        content_type="application/xml",
+    )
+    if response.status_code == 200:
+        if not response.text.strip():
+            return []
+        return _parse_node_structure_response(response.text)
+    else:
+        raise Exception(
+            f"{response.status_code} - Failed to read node structure of {parent_type} {parent_name}\n{response.text}"
+        )
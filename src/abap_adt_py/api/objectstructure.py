@@ -1,6 +1,8 @@
-import xml.etree.ElementTree as et
-from ..compat_typing import TypedDict, List
+from collections import deque
+
+from ..compat_typing import Iterator, TypedDict, List
 from ..http_request import HttpRequestParameters, request
+from ..response_parsing import XmlSource, iter_xml_events
 from .xml_namespaces import XML_NAMESPACES
 
 
@@ -28,12 +30,18 @@ class ClassStructureResult(TypedDict):
     components: List[ComponentInfo]
 
 
-def _parse_class_structure_response(xml_content: str) -> ClassStructureResult:
-    root = et.fromstring(xml_content)
+ATTRIBUTE_MAPPING = {
+    "{http://www.sap.com/adt/core}name": "name",
+    "{http://www.w3.org/XML/1998/namespace}base": "xml_base",
+    "visibility": "visibility",
+    "{http://www.sap.com/adt/core}type": "type",
+}
+OBJECT_STRUCTURE_ELEMENT = f"{{{XML_NAMESPACES['abapsource']}}}objectStructureElement"
+ATOM_LINK = f"{{{XML_NAMESPACES['atom']}}}link"
 
-    all_attrs = root.attrib
 
-    class_info: ClassStructureResult = {
+def _new_class_structure() -> ClassStructureResult:
+    return {
         "name": "",
         "xml_base": "",
         "visibility": "",
@@ -43,13 +51,9 @@ def _parse_class_structure_response(xml_content: str) -> ClassStructureResult:
         "components": [],
     }
 
-    attr_mapping = {
-        "{http://www.sap.com/adt/core}name": "name",
-        "{http://www.w3.org/XML/1998/namespace}base": "xml_base",
-        "visibility": "visibility",
-        "{http://www.sap.com/adt/core}type": "type",
-    }
-    for xml_attr, struct_key in attr_mapping.items():
+
+def _read_class_attributes(class_info: ClassStructureResult, all_attrs: dict):
+    for xml_attr, struct_key in ATTRIBUTE_MAPPING.items():
         if xml_attr in all_attrs:
             if struct_key == "final":
                 class_info[struct_key] = all_attrs[xml_attr] == "true"
@@ -59,33 +63,65 @@ def _parse_class_structure_response(xml_content: str) -> ClassStructureResult:
     if "final" in all_attrs:
         class_info["final"] = all_attrs["final"] == "true"
 
-    for link in root.findall("atom:link", XML_NAMESPACES):
-        class_info["links"].append(
-            {"rel": link.get("rel", ""), "href": link.get("href", "")}
-        )
-
-    for element in root.findall(".//abapsource:objectStructureElement", XML_NAMESPACES):
-        all_element_attrs = element.attrib
-
-        element_info: ComponentInfo = {
-            "name": "",
-            "type": "",
-            "links": [],
-        }
-        for attr_name, attr_value in all_element_attrs.items():
-            if attr_value in ["true", "false"]:
-                element_info[attr_name] = attr_value == "true"
-            else:
-                if attr_name in attr_mapping:
-                    attr_name = attr_mapping[attr_name]
-                element_info[attr_name] = attr_value
-
-        for link in element.findall("atom:link", XML_NAMESPACES):
-            element_info["links"].append(
-                {"rel": link.get("rel", ""), "href": link.get("href", "")}
-            )
-        class_info["components"].append(element_info)
 
+def _component_info(all_element_attrs: dict) -> ComponentInfo:
+    element_info: ComponentInfo = {
+        "name": "",
+        "type": "",
+        "links": [],
+    }
+    for attr_name, attr_value in all_element_attrs.items():
+        if attr_value in ["true", "false"]:
+            element_info[attr_name] = attr_value == "true"
+        else:
+            if attr_name in ATTRIBUTE_MAPPING:
+                attr_name = ATTRIBUTE_MAPPING[attr_name]
+            element_info[attr_name] = attr_value
+    return element_info
+
+
+def _iter_class_structure(
+    source: XmlSource, class_info: ClassStructureResult
+) -> Iterator[ComponentInfo]:
+    # components are yielded in document order once their own links are read
+    pending: "deque[list]" = deque()
+    open_components: List[list] = []
+    for event, element, stack in iter_xml_events(source):
+        depth = len(stack)
+        if event == "start":
+            if depth == 1:
+                _read_class_attributes(class_info, element.attrib)
+            elif element.tag == OBJECT_STRUCTURE_ELEMENT:
+                entry = [_component_info(element.attrib), False]
+                pending.append(entry)
+                open_components.append(entry)
+            continue
+
+        if element.tag == ATOM_LINK:
+            link: LinkInfo = {
+                "rel": element.get("rel", ""),
+                "href": element.get("href", ""),
+            }
+            if depth == 2:
+                class_info["links"].append(link)
+            elif stack[-2] == OBJECT_STRUCTURE_ELEMENT and open_components:
+                open_components[-1][0]["links"].append(link)
+        elif element.tag == OBJECT_STRUCTURE_ELEMENT and depth > 1:
+            open_components.pop()[1] = True
+            while pending and pending[0][1]:
+                yield pending.popleft()[0]
+
+        if depth > 1 and not open_components:
+            element.clear()
+
+
+def iter_class_components(source: XmlSource) -> Iterator[ComponentInfo]:
+    yield from _iter_class_structure(source, _new_class_structure())
+
+
+def _parse_class_structure_response(xml_content: XmlSource) -> ClassStructureResult:
+    class_info = _new_class_structure()
+    class_info["components"] = list(_iter_class_structure(xml_content, class_info))
     return class_info
 
 
@@ -97,9 +133,11 @@ def object_structure(http_request_parameters: HttpRequestParameters, object_uri:
         body="",
         method="GET",
         content_type="application/*",
+        stream=True,
     )
     if 200 <= response.status_code < 300:
-        content = _parse_class_structure_response(response.text)
+        with response:
+            content = _parse_class_structure_response(response)
         return content
     else:
         raise Exception(
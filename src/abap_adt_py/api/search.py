@@ -1,11 +1,11 @@
 from ..http_request import HttpRequestParameters, request
-from ..response_parsing import find_xml_elements_attributes
-from ..compat_typing import List, Dict
+from ..response_parsing import iter_xml_elements_attributes
+from ..compat_typing import Iterator, List, Dict
 
 
-def search_object(
+def iter_search_object(
     http_request_parameters: HttpRequestParameters, query: str, max_results: int = 1
-) -> List[Dict[str, str]]:
+) -> Iterator[Dict[str, str]]:
 
     response = request(
         http_request_parameters=http_request_parameters,
@@ -13,6 +13,14 @@ def search_object(
         method="GET",
         body="",
         params={"operation": "quickSearch", "query": query, "maxResults": max_results},
+        stream=True,
     )
-    elements = find_xml_elements_attributes(response.text, "adtcore:objectReference")
+    with response:
+        yield from iter_xml_elements_attributes(response, "adtcore:objectReference")
+
+
+def search_object(
+    http_request_parameters: HttpRequestParameters, query: str, max_results: int = 1
+) -> List[Dict[str, str]]:
+    elements = list(iter_search_object(http_request_parameters, query, max_results))
     return elements
@@ -1,7 +1,9 @@
 import base64
 import xml.etree.ElementTree as et
-from ..compat_typing import TypedDict, Literal, NotRequired
+from collections import OrderedDict
+from ..compat_typing import Dict, Iterator, List, Tuple, TypedDict, Literal, NotRequired
 from ..http_request import HttpRequestParameters, request
+from ..response_parsing import XmlSource, iter_xml_elements, iter_xml_events
 from .xml_namespaces import XML_NAMESPACES
 
 
@@ -13,68 +15,206 @@ class SyntaxCheckResult(TypedDict):
     short_text: str
 
 
-def _parse_syntax_check_response(response_text: str) -> list[SyntaxCheckResult]:
-    root = et.fromstring(response_text)
-    messages = []
-    for msg in root.findall(".//chkrun:checkMessage", XML_NAMESPACES):
-        uri: str = msg.get(f'{{{XML_NAMESPACES["chkrun"]}}}uri', "")
+def _syntax_check_message(msg: et.Element) -> SyntaxCheckResult:
+    uri: str = msg.get(f'{{{XML_NAMESPACES["chkrun"]}}}uri', "")
 
-        if "#start=" in uri:
-            line, offset = uri[uri.index("#start=") + 7 :].split(",")
-            line, offset = int(line), int(offset)
-            uri = uri[: uri.index("#start=")]
-        else:
-            line, offset = None, None
+    if "#start=" in uri:
+        line, offset = uri[uri.index("#start=") + 7 :].split(",")
+        line, offset = int(line), int(offset)
+        uri = uri[: uri.index("#start=")]
+    else:
+        line, offset = None, None
 
-        uri = uri.removesuffix("/source/main")
+    uri = uri.removesuffix("/source/main")
 
-        type = msg.get(f'{{{XML_NAMESPACES["chkrun"]}}}type', "")
-        short_text = msg.get(f'{{{XML_NAMESPACES["chkrun"]}}}shortText', "")
+    type = msg.get(f'{{{XML_NAMESPACES["chkrun"]}}}type', "")
+    short_text = msg.get(f'{{{XML_NAMESPACES["chkrun"]}}}shortText', "")
 
-        message: SyntaxCheckResult = {
-            "uri": uri,
-            "type": type,
-            "short_text": short_text,
-        }
+    message: SyntaxCheckResult = {
+        "uri": uri,
+        "type": type,
+        "short_text": short_text,
+    }
 
-        if line and offset:
-            message["line"] = line
-            message["offset"] = offset
+    if line and offset:
+        message["line"] = line
+        message["offset"] = offset
 
-        messages.append(message)
-    return messages
+    return message
 
 
-def syntax_check(
-    http_request_parameters: HttpRequestParameters,
-    object_uri: str,
-    include_uri: str,
-    source_code: str,
-    version: Literal["active", "inactive"] = "active",
-) -> list[SyntaxCheckResult]:
-    body = f"""
-    <?xml version="1.0" encoding="UTF-8"?>
-    <chkrun:checkObjectList xmlns:chkrun="http://www.sap.com/adt/checkrun" xmlns:adtcore="http://www.sap.com/adt/core">
-    <chkrun:checkObject adtcore:uri="{object_uri}" chkrun:version="{version}">
-        <chkrun:artifacts>
+def iter_syntax_check_messages(source: XmlSource) -> Iterator[SyntaxCheckResult]:
+    for msg in iter_xml_elements(source, ".//chkrun:checkMessage"):
+        yield _syntax_check_message(msg)
+
+
+def _parse_syntax_check_response(response_text: str) -> list[SyntaxCheckResult]:
+    return list(iter_syntax_check_messages(response_text))
+
+
+SyntaxCheckInput = Tuple[str, str, str, Literal["active", "inactive"]]
+
+CHECK_REPORT = f"{{{XML_NAMESPACES['chkrun']}}}checkReport"
+CHECK_MESSAGE = f"{{{XML_NAMESPACES['chkrun']}}}checkMessage"
+TRIGGERING_URI = f"{{{XML_NAMESPACES['chkrun']}}}triggeringUri"
+
+
+def _build_check_object(
+    object_uri: str, version: str, artifacts: List[Tuple[str, str]]
+) -> str:
+    artifact_elements = "".join(
+        f"""
         <chkrun:artifact chkrun:contentType="text/plain; charset=utf-8" chkrun:uri="{include_uri}">
             <chkrun:content>{base64.b64encode(source_code.encode("utf-8")).decode("utf-8")}</chkrun:content>
-        </chkrun:artifact>
+        </chkrun:artifact>"""
+        for include_uri, source_code in artifacts
+    )
+    return f"""
+    <chkrun:checkObject adtcore:uri="{object_uri}" chkrun:version="{version}">
+        <chkrun:artifacts>{artifact_elements}
         </chkrun:artifacts>
-    </chkrun:checkObject>
+    </chkrun:checkObject>"""
+
+
+def _build_check_object_list(check_objects: List[str]) -> str:
+    return f"""
+    <?xml version="1.0" encoding="UTF-8"?>
+    <chkrun:checkObjectList xmlns:chkrun="http://www.sap.com/adt/checkrun" xmlns:adtcore="http://www.sap.com/adt/core">{"".join(check_objects)}
     </chkrun:checkObjectList>
     """
 
-    response = request(
+
+def _post_check_run(http_request_parameters: HttpRequestParameters, body: str):
+    return request(
         http_request_parameters,
         uri="/sap/bc/adt/checkruns?reporters=abapCheckRun",
         params={},
         body=body,
         method="POST",
         content_type="application/*",
+        stream=True,
     )
+
+
+def group_syntax_check_inputs(
+    checks: List[SyntaxCheckInput],
+) -> "OrderedDict[Tuple[str, str], List[Tuple[str, str]]]":
+    groups: "OrderedDict[Tuple[str, str], List[Tuple[str, str]]]" = OrderedDict()
+    for object_uri, include_uri, source_code, version in checks:
+        groups.setdefault((object_uri, version), []).append((include_uri, source_code))
+    return groups
+
+
+def chunk_syntax_check_inputs(
+    checks: List[SyntaxCheckInput], chunk_size: int, max_chunk_bytes: int
+) -> List[List[SyntaxCheckInput]]:
+    # objects are never split, so a single large object may exceed max_chunk_bytes
+    chunks: List[List[SyntaxCheckInput]] = []
+    current: List[SyntaxCheckInput] = []
+    current_objects = 0
+    current_bytes = 0
+    for (object_uri, version), artifacts in group_syntax_check_inputs(checks).items():
+        object_bytes = sum(
+            len(source_code.encode("utf-8")) * 4 // 3 for _, source_code in artifacts
+        )
+        if current and (
+            current_objects >= chunk_size or current_bytes + object_bytes > max_chunk_bytes
+        ):
+            chunks.append(current)
+            current, current_objects, current_bytes = [], 0, 0
+        current.extend(
+            (object_uri, include_uri, source_code, version)
+            for include_uri, source_code in artifacts
+        )
+        current_objects += 1
+        current_bytes += object_bytes
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def iter_grouped_syntax_check_messages(
+    source: XmlSource,
+) -> Iterator[Tuple[str, SyntaxCheckResult]]:
+    triggering_uri = ""
+    parents: List[et.Element] = []
+    for event, element, _ in iter_xml_events(source):
+        if event == "start":
+            if element.tag == CHECK_REPORT:
+                triggering_uri = element.get(TRIGGERING_URI, "")
+            parents.append(element)
+            continue
+
+        parents.pop()
+        if element.tag == CHECK_MESSAGE:
+            yield triggering_uri, _syntax_check_message(element)
+        elif element.tag == CHECK_REPORT:
+            triggering_uri = ""
+        # detached from the parent too, otherwise the root keeps every message
+        element.clear()
+        if parents and len(parents[-1]) and parents[-1][-1] is element:
+            del parents[-1][-1]
+
+
+def _owner_object_uri(
+    object_uris: List[str], triggering_uri: str, message: SyntaxCheckResult
+) -> str:
+    for candidate in [triggering_uri, message["uri"]]:
+        candidate = candidate.lower()
+        matches = [
+            object_uri
+            for object_uri in object_uris
+            if candidate == object_uri.lower()
+            or candidate.startswith(object_uri.lower() + "/")
+        ]
+        if matches:
+            return max(matches, key=len)
+    return triggering_uri or message["uri"]
+
+
+def syntax_check_many(
+    http_request_parameters: HttpRequestParameters, checks: List[SyntaxCheckInput]
+) -> Dict[str, List[SyntaxCheckResult]]:
+    groups = group_syntax_check_inputs(checks)
+    body = _build_check_object_list(
+        [
+            _build_check_object(object_uri, version, artifacts)
+            for (object_uri, version), artifacts in groups.items()
+        ]
+    )
+
+    object_uris = list(OrderedDict.fromkeys(object_uri for object_uri, _ in groups))
+    results: Dict[str, List[SyntaxCheckResult]] = {
+        object_uri: [] for object_uri in object_uris
+    }
+    response = _post_check_run(http_request_parameters, body)
+    if 200 <= response.status_code < 300:
+        with response:
+            for triggering_uri, message in iter_grouped_syntax_check_messages(response):
+                owner = _owner_object_uri(object_uris, triggering_uri, message)
+                results.setdefault(owner, []).append(message)
+        return results
+    else:
+        raise Exception(
+            f"{response.status_code} - Failed to check syntax for {len(object_uris)} objects\n{response.text}"
+        )
+
+
+def syntax_check(
+    http_request_parameters: HttpRequestParameters,
+    object_uri: str,
+    include_uri: str,
+    source_code: str,
+    version: Literal["active", "inactive"] = "active",
+) -> list[SyntaxCheckResult]:
+    body = _build_check_object_list(
+        [_build_check_object(object_uri, version, [(include_uri, source_code)])]
+    )
+
+    response = _post_check_run(http_request_parameters, body)
     if 200 <= response.status_code < 300:
-        messages = _parse_syntax_check_response(response.text)
+        with response:
+            messages = list(iter_syntax_check_messages(response))
         return messages
     else:
         raise Exception(
@@ -1,8 +1,10 @@
 import xml.etree.ElementTree as et
+from xml.sax.saxutils import escape
 
-from ..compat_typing import List, TypedDict
+from ..compat_typing import Iterator, List, TypedDict
 from ..api.xml_namespaces import XML_NAMESPACES
 from ..http_request import HttpRequestParameters, request
+from ..response_parsing import XmlSource, iter_xml_elements
 
 
 class UnittestFlags:
@@ -30,37 +32,43 @@ class UnitTestAlert(TypedDict):
     details: List[str]
 
 
+def _unit_test_alert(alert: et.Element) -> UnitTestAlert:
+    a = {}
+    title = alert.find(".//title", XML_NAMESPACES)
+    a["title"] = title.text if title is not None else ""
+    a["kind"] = alert.attrib.get("kind", "")
+    a["severity"] = alert.attrib.get("severity", "")
+    stack = alert.find(".//stack", XML_NAMESPACES)
+    a["stack"] = stack if stack is not None else []
+    details = []
+    for detail in alert.findall("./details/detail", XML_NAMESPACES):
+        detail_str = "\n".join(
+            x.attrib["text"]
+            for x in detail.iter()
+            if "text" in x.attrib is not None
+        )
+        details.append(detail_str)
+    a["details"] = details
+    return a
+
+
+def iter_alerts(source: XmlSource) -> Iterator[UnitTestAlert]:
+    for alert in iter_xml_elements(source, ".//alert"):
+        yield _unit_test_alert(alert)
+
+
 def _parse_alerts(xml_text: str) -> List[UnitTestAlert]:
-    root = et.fromstring(xml_text)
-    errors = []
-    alerts = root.findall(".//alert", XML_NAMESPACES)
-    for alert in alerts:
-        a = {}
-        title = alert.find(".//title", XML_NAMESPACES)
-        a["title"] = title.text if title is not None else ""
-        a["kind"] = alert.attrib.get("kind", "")
-        a["severity"] = alert.attrib.get("severity", "")
-        stack = alert.find(".//stack", XML_NAMESPACES)
-        a["stack"] = stack if stack is not None else []
-        details = []
-        for detail in alert.findall("./details/detail", XML_NAMESPACES):
-            detail_str = "\n".join(
-                x.attrib["text"]
-                for x in detail.iter()
-                if "text" in x.attrib is not None
-            )
-            details.append(detail_str)
-        a["details"] = details
-        errors.append(a)
-    return errors
+    return list(iter_alerts(xml_text))
 
 
-def run_unit_test(
-    http_request_parameters: HttpRequestParameters,
-    object_uri: str,
-    unit_test_flags: UnittestFlags = UnittestFlags(),
-):
-    body = f"""
+def _build_run_configuration(
+    object_uris: List[str], unit_test_flags: UnittestFlags
+) -> str:
+    object_references = "\n".join(
+        f'                <adtcore:objectReference adtcore:uri="{escape(object_uri)}"/>'
+        for object_uri in object_uris
+    )
+    return f"""
         <?xml version="1.0" encoding="UTF-8"?>
         <aunit:runConfiguration xmlns:aunit="http://www.sap.com/adt/aunit">
         <external>
@@ -76,26 +84,53 @@ def run_unit_test(
         <adtcore:objectSets xmlns:adtcore="http://www.sap.com/adt/core">
             <objectSet kind="inclusive">
             <adtcore:objectReferences>
-                <adtcore:objectReference adtcore:uri="{object_uri}"/>
+{object_references}
             </adtcore:objectReferences>
             </objectSet>
         </adtcore:objectSets>
         </aunit:runConfiguration>
         """
 
+
+def _post_test_run(
+    http_request_parameters: HttpRequestParameters,
+    object_uris: List[str],
+    unit_test_flags: UnittestFlags,
+) -> List[UnitTestAlert]:
     response = request(
         http_request_parameters=http_request_parameters,
         uri="/sap/bc/adt/abapunit/testruns",
         method="POST",
-        body=body,
+        body=_build_run_configuration(object_uris, unit_test_flags),
         params={},
         content_type="application/xml",
+        stream=True,
     )
     if response.status_code == 200:
-        alerts = _parse_alerts(response.text)
+        with response:
+            alerts = list(iter_alerts(response))
         return alerts
 
     else:
         raise Exception(
-            f"{response.status_code} - Failed to run unit test for {object_uri}\n{response.text}"
+            f"{response.status_code} - Failed to run unit test for {', '.join(object_uris)}\n{response.text}"
         )
+
+
+def run_unit_test(
+    http_request_parameters: HttpRequestParameters,
+    object_uri: str,
+    unit_test_flags: UnittestFlags = UnittestFlags(),
+):
+    return _post_test_run(http_request_parameters, [object_uri], unit_test_flags)
+
+
+def run_unit_tests(
+    http_request_parameters: HttpRequestParameters,
+    object_uris: List[str],
+    unit_test_flags: UnittestFlags = UnittestFlags(),
+) -> List[UnitTestAlert]:
+    """Runs the tests of several objects or packages in a single test run."""
+    if not object_uris:
+        return []
+    return _post_test_run(http_request_parameters, object_uris, unit_test_flags)
@@ -0,0 +1,81 @@
+import re
+
+from ..compat_typing import Iterator, List, TypedDict
+from ..http_request import HttpRequestParameters, request
+from ..response_parsing import _et_to_attributes_dict, iter_xml_elements
+from .xml_namespaces import XML_NAMESPACES
+
+USAGE_REFERENCES_BODY = """<?xml version="1.0" encoding="UTF-8"?>
+<usagereferences:usageReferenceRequest xmlns:usagereferences="http://www.sap.com/adt/ris/usageReferences">
+  <usagereferences:affectedObjects/>
+</usagereferences:usageReferenceRequest>"""
+
+_SOURCE_PART = re.compile(r"/source/[^/]+$")
+_CLASS_INCLUDE = re.compile(r"^(/sap/bc/adt/oo/classes/[^/]+)/includes/[^/]+$")
+
+
+class UsageReference(TypedDict):
+    uri: str
+    object_uri: str
+    name: str
+    type: str
+    package_name: str
+    usage_information: str
+
+
+def main_object_uri(uri: str) -> str:
+    """Strips the position fragment and source or include part of a reference uri."""
+    uri = _SOURCE_PART.sub("", uri.split("#", 1)[0])
+    return _CLASS_INCLUDE.sub(r"\1", uri)
+
+
+def iter_usage_references(
+    http_request_parameters: HttpRequestParameters, object_uri: str
+) -> Iterator[UsageReference]:
+
+    response = request(
+        http_request_parameters,
+        uri="/sap/bc/adt/repository/informationsystem/usageReferences",
+        params={"uri": object_uri},
+        body=USAGE_REFERENCES_BODY,
+        method="POST",
+        content_type="application/vnd.sap.adt.repository.usagereferences.request.v1+xml",
+        headers={
+            "Accept": "application/vnd.sap.adt.repository.usagereferences.result.v1+xml"
+        },
+        stream=True,
+    )
+    with response:
+        if response.status_code != 200:
+            raise Exception(
+                f"{response.status_code} - Failed to read usage references of {object_uri}\n{response.text}"
+            )
+        for element in iter_xml_elements(
+            response, ".//usagereferences:referencedObject"
+        ):
+            attributes = _et_to_attributes_dict(element)
+            # the other nodes only group the results by package
+            if attributes.get("isResult") != "true":
+                continue
+            adt_object = element.find("usagereferences:adtObject", XML_NAMESPACES)
+            object_attributes = _et_to_attributes_dict(adt_object)
+            package = (
+                adt_object.find("adtcore:packageRef", XML_NAMESPACES)
+                if adt_object is not None
+                else None
+            )
+            uri = attributes.get("uri", "")
+            yield {
+                "uri": uri,
+                "object_uri": main_object_uri(uri),
+                "name": object_attributes.get("name", ""),
+                "type": object_attributes.get("type", ""),
+                "package_name": _et_to_attributes_dict(package).get("name", ""),
+                "usage_information": attributes.get("usageInformation", ""),
+            }
+
+
+def usage_references(
+    http_request_parameters: HttpRequestParameters, object_uri: str
+) -> List[UsageReference]:
+    return list(iter_usage_references(http_request_parameters, object_uri))
@@ -7,4 +7,6 @@ XML_NAMESPACES = {
     "aunit": "http://www.sap.com/adt/aunit",
     "chkrun": "http://www.sap.com/adt/checkrun",
     "abapsource": "http://www.sap.com/adt/abapsource",
+    "ioc": "http://www.sap.com/abapxml/inactiveCtsObjects",
+    "usagereferences": "http://www.sap.com/adt/ris/usageReferences",
 }
\ No newline at end of file
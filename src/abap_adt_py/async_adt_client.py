@@ -0,0 +1,296 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from requests.adapters import HTTPAdapter
+
+from .adt_client import AdtClient
+from .compat_typing import Any, AsyncIterator, Callable, Literal, List, Dict, Optional, Tuple, Union
+from .api.activate import ActivationResult
+from .api.create import ObjectTypes
+from .api.nodestructure import RepositoryNode
+from .api.prettyprint import PrettyPrintSettings
+from .api.syntax import SyntaxCheckInput, SyntaxCheckResult
+from .api.unittest import UnitTestAlert, UnittestFlags
+from .api.usages import UsageReference
+from .records import (
+    ObjectReferenceRecord,
+    SyntaxCheckRecord,
+    UnitTestAlertRecord,
+)
+from .session_pool import SessionPool
+
+
+def _lease_and_lock(pool: SessionPool, object_uri: str) -> Tuple[AdtClient, str, ExitStack]:
+    with ExitStack() as stack:
+        adt_client = stack.enter_context(pool.lease())
+        lock_handle = adt_client.lock(object_uri)
+        # the lease ends with unlock or delete
+        return adt_client, lock_handle, stack.pop_all()
+
+
+def _end_lease(lease: ExitStack, function: Callable[..., Any], *args):
+    # a session whose unlock failed is not handed out again
+    with lease:
+        return function(*args)
+
+
+class AsyncAdtClient:
+    """Runs AdtClient calls on a bounded worker pool, awaitable from asyncio.
+
+    Every lock is taken in a session of its own from a SessionPool of up to
+    ``max_concurrency`` sessions. The lock handle selects that session in
+    set_object_source, create_test_class_include, delete and unlock, so
+    several tasks can edit objects at the same time.
+    """
+
+    def __init__(
+        self,
+        sap_host: str,
+        username: str,
+        password: str,
+        client: str,
+        language: str,
+        max_concurrency: int = 10,
+        **client_options,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.adt_client = AdtClient(
+            sap_host, username, password, client, language, **client_options
+        )
+        self._credentials = (sap_host, username, password, client, language)
+        self._client_options = client_options
+        self._pool: Optional[SessionPool] = None
+        self._session_slots = None
+        self._leases: Dict[str, Tuple[AdtClient, ExitStack]] = {}
+
+        if self.adt_client.session is not None:
+            adapter = HTTPAdapter(
+                pool_connections=max_concurrency, pool_maxsize=max_concurrency
+            )
+            self.adt_client.session.mount("http://", adapter)
+            self.adt_client.session.mount("https://", adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._semaphore = None
+
+    async def __aenter__(self) -> "AsyncAdtClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        loop = asyncio.get_running_loop()
+        # waits for the running calls without blocking the event loop
+        await loop.run_in_executor(None, self._executor.shutdown)
+        self.adt_client.transport.close()
+        if self._pool is not None:
+            self._pool.close()
+
+    async def _run(self, function, *args, **kwargs):
+        # created lazily so the semaphore belongs to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(function, *args, **kwargs)
+            )
+
+    async def login(self, force: bool = False) -> bool:
+        return await self._run(self.adt_client.login, force)
+
+    async def refresh_csrf_token(self, rejected_token: str) -> str:
+        return await self._run(self.adt_client.refresh_csrf_token, rejected_token)
+
+    async def save_session(self):
+        return await self._run(self.adt_client.save_session)
+
+    async def search_object(
+        self, query: str, max_results: int = 1, compact: bool = False
+    ) -> Union[List[Dict[str, str]], List[ObjectReferenceRecord]]:
+        return await self._run(
+            self.adt_client.search_object, query, max_results, compact
+        )
+
+    async def iter_search_object(
+        self, query: str, max_results: int = 1, compact: bool = False
+    ) -> Union[AsyncIterator[Dict[str, str]], AsyncIterator[ObjectReferenceRecord]]:
+        """Yields the results while the response is read, one worker step per result."""
+        results = await self._run(
+            self.adt_client.iter_search_object, query, max_results, compact
+        )
+        done = object()
+        try:
+            while True:
+                result = await self._run(next, results, done)
+                if result is done:
+                    return
+                yield result
+        finally:
+            # closes the response of a search that was not read to the end
+            await self._run(results.close)
+
+    async def resolve_uri(
+        self, name: str, object_type: Optional[str] = None, max_results: int = 50
+    ) -> Optional[str]:
+        return await self._run(
+            self.adt_client.resolve_uri, name, object_type, max_results
+        )
+
+    async def get_object_source(
+        self, object_uri: str, version: Literal["active", "inactive"] = "active"
+    ) -> str:
+        return await self._run(self.adt_client.get_object_source, object_uri, version)
+
+    async def activate(self, object_name: str, object_uri: str) -> bool:
+        return await self._run(self.adt_client.activate, object_name, object_uri)
+
+    async def activate_many(
+        self, objects: List[Tuple[str, str]], chunk_size: int = 100
+    ) -> List[ActivationResult]:
+        return await self._run(self.adt_client.activate_many, objects, chunk_size)
+
+    async def get_inactive_objects(self) -> List[Dict[str, str]]:
+        return await self._run(self.adt_client.get_inactive_objects)
+
+    async def activate_inactive_objects(
+        self, chunk_size: int = 100
+    ) -> List[ActivationResult]:
+        return await self._run(self.adt_client.activate_inactive_objects, chunk_size)
+
+    def _locked_client(self, lock_handle: str) -> AdtClient:
+        # handles of locks taken elsewhere are used with the shared session
+        return self._leases.get(lock_handle, (self.adt_client, None))[0]
+
+    async def lock(self, object_uri: str) -> str:
+        # created lazily so the semaphore belongs to the running event loop, and
+        # waiting for a free session does not take up a worker thread
+        if self._pool is None:
+            self._pool = SessionPool(
+                *self._credentials, size=self.max_concurrency, **self._client_options
+            )
+            self._session_slots = asyncio.Semaphore(self.max_concurrency)
+        await self._session_slots.acquire()
+        try:
+            adt_client, lock_handle, lease = await self._run(
+                _lease_and_lock, self._pool, object_uri
+            )
+        except BaseException:
+            self._session_slots.release()
+            raise
+        self._leases[lock_handle] = (adt_client, lease)
+        return lock_handle
+
+    async def _end_lock(self, lock_handle: str, method: str, *args):
+        if lock_handle not in self._leases:
+            return await self._run(getattr(self.adt_client, method), *args)
+        adt_client, lease = self._leases.pop(lock_handle)
+        try:
+            return await self._run(_end_lease, lease, getattr(adt_client, method), *args)
+        finally:
+            self._session_slots.release()
+
+    async def unlock(self, object_uri: str, lock_handle: str) -> bool:
+        return await self._end_lock(lock_handle, "unlock", object_uri, lock_handle)
+
+    async def set_object_source(
+        self, object_uri: str, source_code: str, lock_handle: str
+    ) -> bool:
+        return await self._run(
+            self._locked_client(lock_handle).set_object_source,
+            object_uri,
+            source_code,
+            lock_handle,
+        )
+
+    async def run_unit_test(
+        self,
+        object_uri: str,
+        unit_test_flags: UnittestFlags = UnittestFlags(),
+        compact: bool = False,
+    ) -> Union[List[UnitTestAlert], List[UnitTestAlertRecord]]:
+        return await self._run(
+            self.adt_client.run_unit_test, object_uri, unit_test_flags, compact
+        )
+
+    async def run_unit_tests(
+        self,
+        object_uris: List[str],
+        unit_test_flags: UnittestFlags = UnittestFlags(),
+        compact: bool = False,
+    ) -> Union[List[UnitTestAlert], List[UnitTestAlertRecord]]:
+        return await self._run(
+            self.adt_client.run_unit_tests, object_uris, unit_test_flags, compact
+        )
+
+    async def delete(self, object_uri: str, lock_handle: str) -> bool:
+        return await self._end_lock(lock_handle, "delete", object_uri, lock_handle)
+
+    async def create(
+        self, object_type: ObjectTypes, name: str, parent: str, description: str
+    ) -> bool:
+        return await self._run(
+            self.adt_client.create, object_type, name, parent, description
+        )
+
+    async def create_test_class_include(self, class_name: str, lock_handle: str) -> bool:
+        return await self._run(
+            self._locked_client(lock_handle).create_test_class_include, class_name, lock_handle
+        )
+
+    async def prettyprint(self, src: str) -> str:
+        return await self._run(self.adt_client.prettyprint, src)
+
+    async def prettyprint_many(self, sources: List[str]) -> List[str]:
+        unique_sources = list(dict.fromkeys(sources))
+        responses = await asyncio.gather(*(self.prettyprint(src) for src in unique_sources))
+        formatted = dict(zip(unique_sources, responses))
+        return [formatted[src] for src in sources]
+
+    async def prettyprint_settings(self, settings: PrettyPrintSettings) -> bool:
+        return await self._run(self.adt_client.prettyprint_settings, settings)
+
+    async def syntax_check(
+        self,
+        object_uri: str,
+        include_uri: str,
+        src: str,
+        version: Literal["active", "inactive"] = "active",
+        compact: bool = False,
+    ) -> Union[List[SyntaxCheckResult], List[SyntaxCheckRecord]]:
+        return await self._run(
+            self.adt_client.syntax_check, object_uri, include_uri, src, version, compact
+        )
+
+    async def syntax_check_many(
+        self,
+        checks: List[SyntaxCheckInput],
+        chunk_size: int = 50,
+        max_chunk_bytes: int = 4 * 1024 * 1024,
+        max_workers: int = 1,
+        compact: bool = False,
+    ) -> Union[Dict[str, List[SyntaxCheckResult]], Dict[str, List[SyntaxCheckRecord]]]:
+        return await self._run(
+            self.adt_client.syntax_check_many,
+            checks,
+            chunk_size,
+            max_chunk_bytes,
+            max_workers,
+            compact,
+        )
+
+    async def object_structure(self, object_uri: str, compact: bool = False):
+        return await self._run(self.adt_client.object_structure, object_uri, compact)
+
+    async def node_structure(
+        self, parent_type: str, parent_name: str
+    ) -> List[RepositoryNode]:
+        return await self._run(self.adt_client.node_structure, parent_type, parent_name)
+
+    async def usage_references(self, object_uri: str) -> List[UsageReference]:
+        return await self._run(self.adt_client.usage_references, object_uri)
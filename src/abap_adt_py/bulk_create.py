@@ -0,0 +1,255 @@
+import json
+import time
+from urllib.parse import quote
+
+from .adt_client import AdtClient
+from .api.activate import ActivationResult
+from .api.create import CREATEABLE_TYPES, ObjectTypes
+from .compat_typing import Dict, List, NotRequired, Optional, Tuple, TypedDict
+from .session_pool import SessionPool
+
+# objects of these types need the object of the same name created first
+_SAME_NAME_DEPENDENCIES: Dict[str, str] = {
+    "DCLS/DL": "DDLS/DF",
+    "DDLX/EX": "DDLS/DF",
+}
+
+
+class ObjectSpec(TypedDict):
+    object_type: ObjectTypes
+    name: str
+    parent: str
+    description: str
+    source: NotRequired[str]
+    test_source: NotRequired[str]
+    depends_on: NotRequired[List[str]]
+
+
+class CreateResult(TypedDict):
+    name: str
+    object_type: str
+    object_uri: str
+    wave: int
+    created: bool
+    error: Optional[str]
+    create_duration: float
+    source_duration: float
+
+
+class BulkCreateResult(TypedDict):
+    objects: List[CreateResult]
+    activation: List[ActivationResult]
+    duration: float
+
+
+def created_object_uri(object_type: ObjectTypes, name: str, parent: str) -> str:
+    # the parent of a function module is its function group
+    # namespaced names like /DMO/CL_TEST are a single path segment
+    collection = CREATEABLE_TYPES[object_type]["path"].format(quote(parent.lower(), safe=""))
+    return f"{collection}/{quote(name.lower(), safe='')}"
+
+
+_REQUIRED_KEYS = ["object_type", "name", "parent", "description"]
+_OPTIONAL_KEYS = ["source", "test_source", "depends_on"]
+
+
+def _validate_spec(spec, index: int):
+    if not isinstance(spec, dict):
+        raise ValueError(f"Object {index} is not an object")
+    label = f"Object {index}"
+    if isinstance(spec.get("name"), str):
+        label += f" ({spec['name']})"
+    missing = [key for key in _REQUIRED_KEYS if key not in spec]
+    if missing:
+        raise ValueError(f"{label} lacks {', '.join(missing)}")
+    unknown = [key for key in spec if key not in _REQUIRED_KEYS + _OPTIONAL_KEYS]
+    if unknown:
+        raise ValueError(f"{label} has unknown keys {', '.join(unknown)}")
+    for key in _REQUIRED_KEYS + ["source", "test_source"]:
+        if key in spec and not isinstance(spec[key], str):
+            raise ValueError(f"{label}: {key} must be a string")
+    depends_on = spec.get("depends_on", [])
+    if not isinstance(depends_on, list) or not all(isinstance(name, str) for name in depends_on):
+        raise ValueError(f"{label}: depends_on must be a list of names")
+    if spec["object_type"] not in CREATEABLE_TYPES:
+        raise ValueError(f"{label}: cannot create objects of type {spec['object_type']}")
+
+
+def load_object_specs(path: str) -> List[ObjectSpec]:
+    """Reads a JSON manifest, a list of object specs or an object with an "objects" list.
+
+    Raises ValueError naming the first entry that is not a valid spec.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        manifest = json.load(file)
+    if isinstance(manifest, dict):
+        manifest = manifest.get("objects", [])
+    if not isinstance(manifest, list):
+        raise ValueError(f"{path} holds neither a list of objects nor an \"objects\" list")
+    for index, spec in enumerate(manifest):
+        _validate_spec(spec, index)
+    return manifest
+
+
+def _spec_key(spec: ObjectSpec) -> Tuple[str, str]:
+    return spec["object_type"], spec["name"].upper()
+
+
+def _dependencies(spec: ObjectSpec, by_name: Dict[str, List[ObjectSpec]]) -> List[Tuple[str, str]]:
+    dependencies = []
+    if spec["object_type"] == "FUGR/FF":
+        dependencies.append(("FUGR/F", spec["parent"].upper()))
+    if spec["object_type"] in _SAME_NAME_DEPENDENCIES:
+        dependencies.append((_SAME_NAME_DEPENDENCIES[spec["object_type"]], spec["name"].upper()))
+    for name in spec.get("depends_on", []):
+        dependencies.extend(_spec_key(other) for other in by_name.get(name.upper(), []))
+    # objects outside of the manifest are expected to exist already
+    keys = {_spec_key(other) for others in by_name.values() for other in others}
+    return [key for key in dependencies if key in keys and key != _spec_key(spec)]
+
+
+def creation_waves(specs: List[ObjectSpec]) -> List[List[ObjectSpec]]:
+    """Groups the specs into waves that only depend on objects of earlier waves.
+
+    Function modules depend on their function group, access controls and
+    metadata extensions on the CDS view of the same name, and every object on
+    the objects named in its ``depends_on``.
+    """
+    by_key: Dict[Tuple[str, str], ObjectSpec] = {}
+    by_name: Dict[str, List[ObjectSpec]] = {}
+    for spec in specs:
+        if spec["object_type"] not in CREATEABLE_TYPES:
+            raise ValueError(f"Cannot create objects of type {spec['object_type']}")
+        key = _spec_key(spec)
+        if key in by_key:
+            raise ValueError(f"{key[0]} {key[1]} is listed twice")
+        by_key[key] = spec
+        by_name.setdefault(key[1], []).append(spec)
+
+    remaining = {key: set(_dependencies(spec, by_name)) for key, spec in by_key.items()}
+    waves: List[List[ObjectSpec]] = []
+    while remaining:
+        ready = [key for key, dependencies in remaining.items() if not dependencies]
+        if not ready:
+            cycle = ", ".join(f"{object_type} {name}" for object_type, name in remaining)
+            raise ValueError(f"Circular dependencies between {cycle}")
+        waves.append([by_key[key] for key in ready])
+        for key in ready:
+            del remaining[key]
+        for dependencies in remaining.values():
+            dependencies.difference_update(ready)
+    return waves
+
+
+def write_initial_sources(adt_client: AdtClient, spec: ObjectSpec):
+    test_source = spec.get("test_source") if spec["object_type"] == "CLAS/OC" else None
+    if spec.get("source") is None and test_source is None:
+        return
+    object_uri = created_object_uri(spec["object_type"], spec["name"], spec["parent"])
+    lock_handle = adt_client.lock(object_uri)
+    try:
+        if spec.get("source") is not None:
+            adt_client.set_object_source(
+                f"{object_uri}/source/main", spec["source"], lock_handle
+            )
+        if test_source is not None:
+            adt_client.create_test_class_include(spec["name"], lock_handle)
+            adt_client.set_object_source(
+                f"{object_uri}/includes/testclasses", test_source, lock_handle
+            )
+    finally:
+        adt_client.unlock(object_uri, lock_handle)
+
+
+def _create_result(spec: ObjectSpec, wave: int) -> CreateResult:
+    return {
+        "name": spec["name"].upper(),
+        "object_type": spec["object_type"],
+        "object_uri": created_object_uri(spec["object_type"], spec["name"], spec["parent"]),
+        "wave": wave,
+        "created": False,
+        "error": None,
+        "create_duration": 0.0,
+        "source_duration": 0.0,
+    }
+
+
+def create_object(adt_client: AdtClient, spec: ObjectSpec, wave: int = 0) -> CreateResult:
+    """Creates the object and writes its initial sources, without raising."""
+    result = _create_result(spec, wave)
+    started = time.perf_counter()
+    try:
+        adt_client.create(
+            spec["object_type"], spec["name"], spec["parent"], spec["description"]
+        )
+        result["created"] = True
+    except Exception as exception:
+        result["error"] = str(exception)
+    created = time.perf_counter()
+    result["create_duration"] = created - started
+    if not result["created"]:
+        return result
+
+    try:
+        write_initial_sources(adt_client, spec)
+    except Exception as exception:
+        result["error"] = f"Created, writing the sources failed: {exception}"
+    result["source_duration"] = time.perf_counter() - created
+    return result
+
+
+def create_objects(
+    pool: SessionPool, specs: List[ObjectSpec], activate: bool = True
+) -> BulkCreateResult:
+    """Creates the objects wave by wave, the objects of a wave concurrently.
+
+    Objects depending on an object that could not be created or whose
+    sources could not be written are skipped. The objects created without
+    errors are activated together at the end.
+    """
+    started = time.perf_counter()
+    waves = creation_waves(specs)
+    results: List[CreateResult] = []
+    failed = set()
+    by_name: Dict[str, List[ObjectSpec]] = {}
+    for spec in specs:
+        by_name.setdefault(spec["name"].upper(), []).append(spec)
+
+    for wave_index, wave in enumerate(waves):
+        to_create = []
+        for spec in wave:
+            missing = [
+                f"{object_type} {name}"
+                for object_type, name in _dependencies(spec, by_name)
+                if (object_type, name) in failed
+            ]
+            if not missing:
+                to_create.append(spec)
+                continue
+            failed.add(_spec_key(spec))
+            skipped = _create_result(spec, wave_index)
+            skipped["error"] = f"Skipped, {', '.join(missing)} failed"
+            results.append(skipped)
+
+        wave_results = pool.map(
+            lambda adt_client, spec: create_object(adt_client, spec, wave_index), to_create
+        )
+        for spec, result in zip(to_create, wave_results):
+            if result["error"]:
+                failed.add(_spec_key(spec))
+            results.append(result)
+
+    activation: List[ActivationResult] = []
+    # an object without its sources would be activated with the generated stub
+    created = [result for result in results if result["created"] and not result["error"]]
+    if activate and created:
+        with pool.lease() as adt_client:
+            activation = adt_client.activate_many(
+                [(result["name"], result["object_uri"]) for result in created]
+            )
+    return {
+        "objects": results,
+        "activation": activation,
+        "duration": time.perf_counter() - started,
+    }
+
@@ -0,0 +1,263 @@
+import re
+import time
+from urllib.parse import unquote
+
+from .adt_client import AdtClient
+from .api.create import CREATEABLE_TYPES
+from .compat_typing import Dict, List, NotRequired, Optional, Tuple, TypedDict, Union
+from .package_tree import PACKAGE_TYPE, collect_package_objects, package_uri
+from .session_pool import SessionPool
+
+# users before the objects they use, packages once they are empty
+DELETE_ORDER = [
+    "DDLX/EX",
+    "DCLS/DL",
+    "DDLS/DF",
+    "PROG/P",
+    "CLAS/OC",
+    "FUGR/FF",
+    "FUGR/F",
+    "PROG/I",
+    "INTF/OI",
+    "TABL/DT",
+    "DTEL/DE",
+    "MSAG/N",
+    PACKAGE_TYPE,
+]
+
+_COLLECTION_TYPES = [
+    (re.compile("^" + re.escape(details["path"]).replace(r"\{\}", "[^/]+") + "/[^/]+$"), object_type)
+    for object_type, details in CREATEABLE_TYPES.items()
+] + [(re.compile(r"^/sap/bc/adt/packages/[^/]+$"), PACKAGE_TYPE)]
+
+
+class DeleteTarget(TypedDict):
+    object_uri: str
+    object_type: str
+    object_name: str
+    depth: NotRequired[int]
+
+
+class DeleteResult(TypedDict):
+    object_uri: str
+    object_type: str
+    object_name: str
+    deleted: bool
+    attempts: int
+    error: Optional[str]
+    duration: float
+
+
+class BulkDeleteResult(TypedDict):
+    objects: List[DeleteResult]
+    waves: int
+    duration: float
+
+
+def delete_target(object_uri: str) -> DeleteTarget:
+    """Derives type and name of an object from its uri."""
+    object_uri = object_uri.rstrip("/")
+    object_type = ""
+    for pattern, collection_type in _COLLECTION_TYPES:
+        if pattern.match(object_uri.lower()):
+            object_type = collection_type
+            break
+    return {
+        "object_uri": object_uri,
+        "object_type": object_type,
+        "object_name": unquote(object_uri.rsplit("/", 1)[-1]).upper(),
+    }
+
+
+def package_delete_targets(
+    adt_client: AdtClient,
+    packages: Union[str, List[str]],
+    include_packages: bool = True,
+    max_workers: int = 8,
+) -> List[DeleteTarget]:
+    """Lists the objects of packages and their subpackages for deletion.
+
+    With ``include_packages`` the packages themselves are deleted as well,
+    deeper subpackages first. Function modules of function groups that are
+    deleted are left out, they go with their group.
+    """
+    if isinstance(packages, str):
+        packages = [packages]
+    objects = collect_package_objects(adt_client, packages, max_workers=max_workers)
+
+    parents: Dict[str, str] = {}
+    for package_object in objects:
+        node = package_object["node"]
+        if node["object_type"] == PACKAGE_TYPE:
+            parents[node["object_name"].upper()] = package_object["package"]
+
+    def depth(package: str) -> int:
+        levels = 0
+        while package in parents:
+            package = parents[package]
+            levels += 1
+        return levels
+
+    groups = {
+        package_object["node"]["object_uri"].lower()
+        for package_object in objects
+        if package_object["node"]["object_type"] == "FUGR/F"
+    }
+    targets: List[DeleteTarget] = []
+    for package_object in objects:
+        node = package_object["node"]
+        object_type = node["object_type"]
+        if object_type == PACKAGE_TYPE and not include_packages:
+            continue
+        if object_type == "FUGR/FF" and node["object_uri"].lower().split("/fmodules/")[0] in groups:
+            continue
+        target: DeleteTarget = {
+            "object_uri": node["object_uri"],
+            "object_type": object_type,
+            "object_name": node["object_name"],
+        }
+        if object_type == PACKAGE_TYPE:
+            target["depth"] = depth(node["object_name"].upper())
+        targets.append(target)
+
+    if include_packages:
+        for package in packages:
+            targets.append(
+                {
+                    "object_uri": package_uri(package),
+                    "object_type": PACKAGE_TYPE,
+                    "object_name": package.upper(),
+                    "depth": 0,
+                }
+            )
+    return targets
+
+
+def _wave_key(target: DeleteTarget) -> Tuple[float, int]:
+    object_type = target["object_type"]
+    # unknown types go right before the packages
+    rank = (
+        DELETE_ORDER.index(object_type)
+        if object_type in DELETE_ORDER
+        else DELETE_ORDER.index(PACKAGE_TYPE) - 0.5
+    )
+    return rank, -target.get("depth", 0)
+
+
+def deletion_waves(targets: List[DeleteTarget]) -> List[List[DeleteTarget]]:
+    """Groups the targets by type rank, and packages by depth, in deletion order."""
+    waves: Dict[Tuple[float, int], List[DeleteTarget]] = {}
+    for target in targets:
+        waves.setdefault(_wave_key(target), []).append(target)
+    return [waves[key] for key in sorted(waves)]
+
+
+def delete_object(adt_client: AdtClient, object_uri: str):
+    lock_handle = adt_client.lock(object_uri)
+    try:
+        adt_client.delete(object_uri, lock_handle)
+    except Exception:
+        try:
+            adt_client.unlock(object_uri, lock_handle)
+        except Exception:
+            # the delete error is the one to report, the pool releases the lock
+            pass
+        raise
+
+
+def _status(error: Exception) -> Optional[int]:
+    return getattr(error, "status_code", None)
+
+
+def _is_gone(error: Exception) -> bool:
+    return _status(error) == 404
+
+
+def _is_conflict(error: Exception) -> bool:
+    """Whether the object may be deletable later: still used, not empty or locked."""
+    status = _status(error)
+    if status in [400, 409, 423]:
+        return True
+    # 403 also stands for missing authorizations, which waiting does not fix
+    return status == 403 and any(
+        word in str(error).lower() for word in ["locked", "editing", "enqueue"]
+    )
+
+
+def delete_objects(
+    pool: SessionPool, targets: List[DeleteTarget], max_rounds: int = 3
+) -> BulkDeleteResult:
+    """Deletes the targets wave by wave, each wave concurrently.
+
+    Objects that could not be deleted because another object still used
+    them or they were locked are tried again in later rounds until a round
+    deletes nothing or ``max_rounds`` is reached. Other errors, e.g. missing
+    authorizations, are not retried. Objects that no longer exist count as
+    deleted.
+    """
+    if max_rounds < 1:
+        raise ValueError("max_rounds must be at least 1")
+    started = time.perf_counter()
+    results: Dict[str, DeleteResult] = {}
+    for target in targets:
+        results.setdefault(
+            target["object_uri"],
+            {
+                "object_uri": target["object_uri"],
+                "object_type": target["object_type"],
+                "object_name": target["object_name"],
+                "deleted": False,
+                "attempts": 0,
+                "error": None,
+                "duration": 0.0,
+            },
+        )
+
+    def delete(adt_client: AdtClient, target: DeleteTarget):
+        object_started = time.perf_counter()
+        try:
+            delete_object(adt_client, target["object_uri"])
+            error = None
+        except Exception as exception:
+            error = exception
+        return error, time.perf_counter() - object_started
+
+    pending = list({target["object_uri"]: target for target in targets}.values())
+    conflicts: Dict[str, bool] = {}
+    wave_count = 0
+    for _ in range(max_rounds):
+        for wave in deletion_waves(pending):
+            wave_count += 1
+            for target, (error, duration) in zip(wave, pool.map(delete, wave)):
+                result = results[target["object_uri"]]
+                result["attempts"] += 1
+                result["duration"] += duration
+                result["deleted"] = error is None or _is_gone(error)
+                result["error"] = None if result["deleted"] else str(error)
+                conflicts[target["object_uri"]] = not result["deleted"] and _is_conflict(error)
+
+        failed = [target for target in pending if not results[target["object_uri"]]["deleted"]]
+        if len(failed) == len(pending):
+            break
+        pending = [target for target in failed if conflicts[target["object_uri"]]]
+        if not pending:
+            break
+
+    return {
+        "objects": list(results.values()),
+        "waves": wave_count,
+        "duration": time.perf_counter() - started,
+    }
+
+
+def delete_package_contents(
+    pool: SessionPool,
+    packages: Union[str, List[str]],
+    include_packages: bool = True,
+    max_rounds: int = 3,
+) -> BulkDeleteResult:
+    with pool.lease() as adt_client:
+        targets = package_delete_targets(
+            adt_client, packages, include_packages, max_workers=pool.size
+        )
+    return delete_objects(pool, targets, max_rounds)
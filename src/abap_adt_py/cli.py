@@ -0,0 +1,366 @@
+import argparse
+import getpass
+import json
+import os
+import sys
+
+from .compat_typing import Any, Dict, List, Optional
+from .daemon_protocol import (
+    SystemConfig,
+    json_default,
+    read_daemon_state,
+    send_to_daemon,
+    start_daemon,
+)
+from .session_store import SessionStore
+
+
+def _system_config(arguments: argparse.Namespace) -> SystemConfig:
+    missing = [
+        name for name in ["host", "client", "user"] if not getattr(arguments, name)
+    ]
+    if missing:
+        raise SystemExit(
+            f"Missing {', '.join(missing)}, pass --{missing[0]} or set ABAP_ADT_{missing[0].upper()}."
+        )
+    password = arguments.password or os.environ.get("ABAP_ADT_PASSWORD")
+    if password is None:
+        password = getpass.getpass(f"Password for {arguments.user}: ")
+    return {
+        "host": arguments.host,
+        "client": arguments.client,
+        "user": arguments.user,
+        "password": password,
+        "language": arguments.language,
+    }
+
+
+def call(arguments: argparse.Namespace, operation: str, operation_arguments: Dict[str, Any]):
+    """Runs an operation in the daemon when one is running, in this process otherwise."""
+    system = _system_config(arguments)
+    if not arguments.no_daemon:
+        state = read_daemon_state()
+        if state is not None:
+            try:
+                return send_to_daemon(
+                    {"system": system, "operation": operation, "arguments": operation_arguments},
+                    state,
+                )
+            except OSError:
+                # stale state file of a daemon that is gone
+                pass
+
+    # importing the client (and requests) is skipped when the daemon answers
+    from .adt_client import AdtClient
+    from .daemon import run_operation
+
+    adt_client = AdtClient(
+        system["host"],
+        system["user"],
+        system["password"],
+        system["client"],
+        system["language"],
+        session_store=None if arguments.no_session_store else SessionStore(),
+    )
+    adt_client.login()
+    return run_operation(adt_client, operation, operation_arguments)
+
+
+def _read(path: str) -> str:
+    if path == "-":
+        return sys.stdin.read()
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+def _print_json(value: Any):
+    print(json.dumps(value, indent=2, default=json_default))
+
+
+def _daemon(arguments: argparse.Namespace):
+    state = read_daemon_state()
+    if arguments.action == "start":
+        if state is not None:
+            try:
+                send_to_daemon({"operation": "status"}, state, timeout=2)
+                print(f"Daemon already running on port {state['port']}.")
+                return
+            except OSError:
+                pass
+        state = start_daemon(idle_timeout=arguments.idle_timeout)
+        print(f"Daemon started on port {state['port']} (pid {state['pid']}).")
+        return
+
+    if state is None:
+        print("Daemon is not running.")
+        return
+    try:
+        if arguments.action == "stop":
+            send_to_daemon({"operation": "shutdown"}, state, timeout=2)
+            print("Daemon stopped.")
+        else:
+            _print_json(send_to_daemon({"operation": "status"}, state, timeout=2))
+    except OSError:
+        print("Daemon is not running.")
+
+
+def _print_batch(batch):
+    errors = sum(
+        1
+        for messages in batch["syntax_messages"].values()
+        for message in messages
+        if message["type"] == "E"
+    )
+    inactive = [result["name"] for result in batch["activation"] if not result["activated"]]
+    print(
+        f"{len(batch['written'])} written, {len(batch['unchanged'])} unchanged, "
+        f"{len(batch['failed'])} failed, {errors} syntax errors, "
+        f"{len(inactive)} not activated, "
+        f"{max(batch['latencies'].values(), default=0.0):.2f}s from save to active"
+    )
+    for uri, error in batch["failed"].items():
+        print(f"  {uri}: {error}", file=sys.stderr)
+    for name in inactive:
+        print(f"  {name} not activated", file=sys.stderr)
+
+
+def _session_pool(arguments: argparse.Namespace):
+    from .session_pool import SessionPool
+
+    system = _system_config(arguments)
+    return SessionPool(
+        system["host"],
+        system["user"],
+        system["password"],
+        system["client"],
+        system["language"],
+        size=arguments.pool_size,
+    )
+
+
+def _create(arguments: argparse.Namespace):
+    from .bulk_create import create_objects, load_object_specs
+
+    specs = load_object_specs(arguments.manifest)
+    with _session_pool(arguments) as pool:
+        result = create_objects(pool, specs, activate=not arguments.no_activate)
+    _print_json(result)
+    if any(created["error"] for created in result["objects"]):
+        raise SystemExit(1)
+
+
+def _delete(arguments: argparse.Namespace):
+    from .bulk_delete import delete_objects, delete_package_contents, delete_target
+
+    with _session_pool(arguments) as pool:
+        if arguments.uris:
+            result = delete_objects(pool, [delete_target(uri) for uri in arguments.names])
+        else:
+            result = delete_package_contents(
+                pool, arguments.names, include_packages=not arguments.keep_packages
+            )
+    _print_json(result)
+    if any(not deleted["deleted"] for deleted in result["objects"]):
+        raise SystemExit(1)
+
+
+def _watch(arguments: argparse.Namespace):
+    from .watch import SourceWatcher
+
+    with _session_pool(arguments) as pool:
+        watcher = SourceWatcher(
+            pool,
+            arguments.directory,
+            debounce=arguments.debounce,
+            activate=not arguments.no_activate,
+            on_batch=_print_batch,
+        )
+        print(f"Watching {arguments.directory}, stop with Ctrl+C.")
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            pass
+
+
+def _add_commands(subparsers):
+    daemon = subparsers.add_parser("daemon", help="manage the local session daemon")
+    daemon.add_argument("action", choices=["start", "stop", "status"])
+    daemon.add_argument("--idle-timeout", type=float, default=3600.0)
+
+    search = subparsers.add_parser("search", help="quick search for objects")
+    search.add_argument("query")
+    search.add_argument("--max-results", type=int, default=50)
+    search.add_argument("--all", action="store_true", help="page through all results by prefix")
+    search.add_argument("--page-size", type=int, default=100, help="with --all")
+
+    resolve = subparsers.add_parser("resolve", help="print the uri of an object")
+    resolve.add_argument("name")
+    resolve.add_argument("--type", dest="object_type")
+
+    source = subparsers.add_parser("source", help="print the source of an object")
+    source.add_argument("source_uri")
+    source.add_argument("--version", choices=["active", "inactive"], default="active")
+
+    write = subparsers.add_parser("write", help="lock, write and unlock a source")
+    write.add_argument("object_uri")
+    write.add_argument("file", help="source file, - for stdin")
+    write.add_argument("--source-uri", help="defaults to <object_uri>/source/main")
+
+    activate = subparsers.add_parser("activate", help="activate an object")
+    activate.add_argument("name")
+    activate.add_argument("object_uri")
+
+    subparsers.add_parser("inactive", help="list inactive objects")
+
+    check = subparsers.add_parser("check", help="syntax check a source file")
+    check.add_argument("object_uri")
+    check.add_argument("file", help="source file, - for stdin")
+    check.add_argument("--include-uri", help="defaults to <object_uri>/source/main")
+    check.add_argument("--version", choices=["active", "inactive"], default="active")
+
+    unittest = subparsers.add_parser("unittest", help="run unit tests of objects or packages")
+    unittest.add_argument("object_uris", nargs="+")
+
+    prettyprint = subparsers.add_parser("prettyprint", help="pretty print a source file")
+    prettyprint.add_argument("file", help="source file, - for stdin")
+
+    structure = subparsers.add_parser("structure", help="print the object structure")
+    structure.add_argument("object_uri")
+
+    nodes = subparsers.add_parser("nodes", help="list the nodes below a repository object")
+    nodes.add_argument("parent_type", help="e.g. DEVC/K")
+    nodes.add_argument("parent_name")
+
+    watch = subparsers.add_parser(
+        "watch", help="write, check and activate files saved in a mirror directory"
+    )
+    watch.add_argument("directory")
+    watch.add_argument("--debounce", type=float, default=0.5, help="seconds")
+    watch.add_argument("--pool-size", type=int, default=8)
+    watch.add_argument("--no-activate", action="store_true")
+
+    create = subparsers.add_parser("create", help="create the objects of a JSON manifest")
+    create.add_argument("manifest")
+    create.add_argument("--pool-size", type=int, default=8)
+    create.add_argument("--no-activate", action="store_true")
+
+    delete = subparsers.add_parser("delete", help="delete packages with their contents, or objects")
+    delete.add_argument("names", nargs="+", help="package names, or object uris with --uris")
+    delete.add_argument("--uris", action="store_true")
+    delete.add_argument("--keep-packages", action="store_true", help="delete only the contents")
+    delete.add_argument("--pool-size", type=int, default=8)
+
+    usages = subparsers.add_parser("usages", help="list the objects using an object")
+    usages.add_argument("object_uri")
+
+
+def _run_command(arguments: argparse.Namespace):
+    command = arguments.command
+    if command == "search" and arguments.all:
+        _print_json(
+            call(arguments, "search_all", {"query": arguments.query, "page_size": arguments.page_size})
+        )
+    elif command == "search":
+        _print_json(
+            call(arguments, "search_object", {"query": arguments.query, "max_results": arguments.max_results})
+        )
+    elif command == "resolve":
+        uri = call(arguments, "resolve_uri", {"name": arguments.name, "object_type": arguments.object_type})
+        if uri is None:
+            raise SystemExit(f"{arguments.name} not found.")
+        print(uri)
+    elif command == "source":
+        print(
+            call(arguments, "get_object_source", {"object_uri": arguments.source_uri, "version": arguments.version}),
+            end="",
+        )
+    elif command == "write":
+        call(
+            arguments,
+            "write_source",
+            {
+                "object_uri": arguments.object_uri,
+                "source_uri": arguments.source_uri or f"{arguments.object_uri}/source/main",
+                "source": _read(arguments.file),
+            },
+        )
+    elif command == "activate":
+        call(arguments, "activate", {"object_name": arguments.name, "object_uri": arguments.object_uri})
+    elif command == "inactive":
+        _print_json(call(arguments, "get_inactive_objects", {}))
+    elif command == "check":
+        messages = call(
+            arguments,
+            "syntax_check",
+            {
+                "object_uri": arguments.object_uri,
+                "include_uri": arguments.include_uri or f"{arguments.object_uri}/source/main",
+                "src": _read(arguments.file),
+                "version": arguments.version,
+            },
+        )
+        _print_json(messages)
+        if any(message["type"] == "E" for message in messages):
+            raise SystemExit(1)
+    elif command == "unittest":
+        alerts = call(arguments, "run_unit_tests", {"object_uris": arguments.object_uris})
+        _print_json(alerts)
+        if alerts:
+            raise SystemExit(1)
+    elif command == "prettyprint":
+        print(call(arguments, "prettyprint", {"src": _read(arguments.file)}), end="")
+    elif command == "structure":
+        _print_json(call(arguments, "object_structure", {"object_uri": arguments.object_uri}))
+    elif command == "nodes":
+        _print_json(
+            call(
+                arguments,
+                "node_structure",
+                {"parent_type": arguments.parent_type, "parent_name": arguments.parent_name},
+            )
+        )
+    elif command == "create":
+        _create(arguments)
+    elif command == "delete":
+        _delete(arguments)
+    elif command == "watch":
+        _watch(arguments)
+    elif command == "usages":
+        _print_json(call(arguments, "usage_references", {"object_uri": arguments.object_uri}))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="abap-adt", description="Command line access to the ABAP Development Tools API."
+    )
+    parser.add_argument("--host", default=os.environ.get("ABAP_ADT_HOST"))
+    parser.add_argument("--client", default=os.environ.get("ABAP_ADT_CLIENT"))
+    parser.add_argument("--user", default=os.environ.get("ABAP_ADT_USER"))
+    parser.add_argument("--password", help="defaults to ABAP_ADT_PASSWORD or a prompt")
+    parser.add_argument("--language", default=os.environ.get("ABAP_ADT_LANGUAGE", "EN"))
+    parser.add_argument(
+        "--no-daemon", action="store_true", help="never use a running daemon"
+    )
+    parser.add_argument(
+        "--no-session-store",
+        action="store_true",
+        help="log in on every call instead of reusing the stored session",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    _add_commands(subparsers)
+    arguments = parser.parse_args(argv)
+
+    if arguments.command == "daemon":
+        _daemon(arguments)
+        return
+    try:
+        _run_command(arguments)
+    except SystemExit:
+        raise
+    except Exception as exception:
+        print(exception, file=sys.stderr)
+        raise SystemExit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,18 @@
-from typing import Optional, Dict, List  # Always available since Python 3.5
+from typing import (  # Always available since Python 3.5
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    IO,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 try:
     # Python 3.11+ where all are in typing
@@ -0,0 +1,274 @@
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+from .compat_typing import Dict, Iterator, List, Optional, TypedDict
+
+# statuses of a system that runs out of work processes or is shedding load
+OVERLOAD_STATUSES = [429, 503, 504]
+# rejected before a work process started on them, so safe to send again
+RETRY_STATUSES = [429, 503]
+
+
+class ThrottleStats(TypedDict):
+    limit: int
+    in_flight: int
+    drops: int
+    retries: int
+    limiter_wait: float
+    rate_limit_wait: float
+
+
+class TokenBucket:
+    """Allows ``rate`` requests per second on average and bursts of up to ``burst`` requests.
+
+    Waiting callers reserve their token up front, so they are served in order.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1")
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Takes a token, sleeping until it is available. Returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            delay = max(0.0, -self._tokens / self.rate)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+class LimiterPermit:
+    __slots__ = ("started", "epoch", "in_flight", "status")
+
+    def __init__(self, epoch: int, in_flight: int):
+        self.started = time.perf_counter()
+        self.epoch = epoch
+        self.in_flight = in_flight
+        self.status: Optional[int] = None
+
+
+class ConcurrencyLimiter(ABC):
+    """Bounds the requests in flight by a limit that adapts to latency and overload.
+
+    Subclasses update ``limit`` in ``_on_sample`` for every finished request.
+    """
+
+    def __init__(self, initial_limit: int, min_limit: int, max_limit: int):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.in_flight = 0
+        self.drops = 0
+        self.wait_time = 0.0
+        # requests started before the last decrease do not decrease the limit again
+        self._epoch = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> LimiterPermit:
+        with self._condition:
+            started = time.perf_counter()
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.wait_time += time.perf_counter() - started
+            self.in_flight += 1
+            return LimiterPermit(self._epoch, self.in_flight)
+
+    def release(self, permit: LimiterPermit, dropped: bool):
+        latency = time.perf_counter() - permit.started
+        with self._condition:
+            self.in_flight -= 1
+            if dropped:
+                self.drops += 1
+            self._on_sample(permit, latency, dropped)
+            self._condition.notify_all()
+
+    def _back_off(self, permit: LimiterPermit, ratio: float):
+        if permit.epoch == self._epoch:
+            self.limit = max(float(self.min_limit), self.limit * ratio)
+            self._epoch += 1
+
+    @abstractmethod
+    def _on_sample(self, permit: LimiterPermit, latency: float, dropped: bool):
+        pass
+
+
+class AimdLimiter(ConcurrencyLimiter):
+    """Additive increase, multiplicative decrease.
+
+    The limit grows by one per round of successful requests that used at
+    least half of it, and is multiplied by ``backoff_ratio`` on an overload
+    response, a failed request or a latency above ``latency_threshold``.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        backoff_ratio: float = 0.7,
+        latency_threshold: Optional[float] = None,
+    ):
+        if not 0 < backoff_ratio < 1:
+            raise ValueError("backoff_ratio must be between 0 and 1")
+        super().__init__(initial_limit, min_limit, max_limit)
+        self.backoff_ratio = backoff_ratio
+        self.latency_threshold = latency_threshold
+
+    def _on_sample(self, permit: LimiterPermit, latency: float, dropped: bool):
+        if dropped or (
+            self.latency_threshold is not None and latency > self.latency_threshold
+        ):
+            self._back_off(permit, self.backoff_ratio)
+        elif permit.in_flight * 2 >= self.limit:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+
+
+class GradientLimiter(ConcurrencyLimiter):
+    """Scales the limit by the ratio of the long-term to the current latency.
+
+    While requests take no longer than ``tolerance`` times the long-term
+    average the limit grows by about its square root per round of requests,
+    slower responses shrink it by up to half. Overload responses and failed
+    requests multiply it by ``backoff_ratio``.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        tolerance: float = 1.5,
+        smoothing: float = 0.2,
+        long_window: int = 500,
+        backoff_ratio: float = 0.7,
+    ):
+        if tolerance < 1:
+            raise ValueError("tolerance must be at least 1")
+        if not 0 < smoothing <= 1 or not 0 < backoff_ratio < 1:
+            raise ValueError("smoothing and backoff_ratio must be between 0 and 1")
+        super().__init__(initial_limit, min_limit, max_limit)
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.backoff_ratio = backoff_ratio
+        self._long_factor = 2 / (long_window + 1)
+        self.long_latency: Optional[float] = None
+        self.short_latency: Optional[float] = None
+
+    def _on_sample(self, permit: LimiterPermit, latency: float, dropped: bool):
+        if dropped:
+            self._back_off(permit, self.backoff_ratio)
+            return
+
+        latency = max(latency, 1e-6)
+        if self.long_latency is None or self.short_latency is None:
+            self.long_latency = self.short_latency = latency
+        self.short_latency = 0.5 * self.short_latency + 0.5 * latency
+        self.long_latency += self._long_factor * (latency - self.long_latency)
+        if self.long_latency > 2 * self.short_latency:
+            # recover quickly after a period of slow responses
+            self.long_latency *= 0.95
+
+        gradient = max(0.5, min(1.0, self.tolerance * self.long_latency / self.short_latency))
+        new_limit = self.limit * gradient + math.sqrt(self.limit)
+        if new_limit > self.limit and permit.in_flight * 2 < self.limit:
+            # the limit was not the bottleneck, do not grow it
+            return
+        # every sample moves the limit by its share of one round of requests
+        limit = self.limit + self.smoothing * (new_limit - self.limit) / self.limit
+        self.limit = max(float(self.min_limit), min(float(self.max_limit), limit))
+
+
+class RequestThrottle:
+    """Adaptive concurrency limit and per-endpoint rate limits for the requests to one system.
+
+    ``rate_limits`` maps endpoint prefixes, as reported by the
+    instrumentation (e.g. ``/sap/bc/adt/checkruns``), to token buckets; the
+    longest matching prefix applies. Requests rejected with 429 or 503 are
+    sent again up to ``max_retries`` times, after the Retry-After header or
+    an exponential backoff. Share one throttle between all clients of a
+    system, e.g. ``SessionPool(..., throttle=RequestThrottle())``.
+    """
+
+    def __init__(
+        self,
+        limiter: Optional[ConcurrencyLimiter] = None,
+        rate_limits: Optional[Dict[str, TokenBucket]] = None,
+        max_retries: int = 3,
+        retry_backoff: float = 0.1,
+        max_retry_delay: float = 10.0,
+    ):
+        if max_retries < 0:
+            raise ValueError("max_retries must not be negative")
+        self.limiter = limiter if limiter is not None else AimdLimiter()
+        self.rate_limits = dict(rate_limits or {})
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_retry_delay = max_retry_delay
+        self._prefixes: List[str] = sorted(self.rate_limits, key=len, reverse=True)
+        self._rate_limit_wait = 0.0
+        self._retries = 0
+        self._lock = threading.Lock()
+
+    def rate_limit(self, endpoint: str) -> Optional[TokenBucket]:
+        for prefix in self._prefixes:
+            if endpoint.startswith(prefix):
+                return self.rate_limits[prefix]
+        return None
+
+    @contextmanager
+    def permit(self, endpoint: str) -> Iterator[LimiterPermit]:
+        """Waits for a token and a free slot; set ``status`` of the permit to the response status."""
+        bucket = self.rate_limit(endpoint)
+        if bucket is not None:
+            waited = bucket.acquire()
+            with self._lock:
+                self._rate_limit_wait += waited
+        permit = self.limiter.acquire()
+        try:
+            yield permit
+        except BaseException:
+            # timeouts and connection errors count as overload
+            self.limiter.release(permit, dropped=True)
+            raise
+        self.limiter.release(permit, dropped=permit.status in OVERLOAD_STATUSES)
+
+    def retry_delay(
+        self, status: int, retry_after: Optional[str], attempt: int
+    ) -> Optional[float]:
+        """Seconds to wait before sending a rejected request again, None to give up."""
+        if status not in RETRY_STATUSES or attempt >= self.max_retries:
+            return None
+        with self._lock:
+            self._retries += 1
+        if retry_after is not None and retry_after.strip().isdigit():
+            return min(float(retry_after), self.max_retry_delay)
+        return min(self.retry_backoff * 2**attempt, self.max_retry_delay)
+
+    def stats(self) -> ThrottleStats:
+        with self._lock:
+            rate_limit_wait = self._rate_limit_wait
+            retries = self._retries
+        return {
+            "limit": int(self.limiter.limit),
+            "in_flight": self.limiter.in_flight,
+            "drops": self.limiter.drops,
+            "retries": retries,
+            "limiter_wait": self.limiter.wait_time,
+            "rate_limit_wait": rate_limit_wait,
+        }
@@ -0,0 +1,93 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .compat_typing import Any, Callable, Iterable, Iterator, Tuple
+
+_VALUE = "value"
+_DONE = "done"
+_FAILED = "failed"
+
+
+class Crawl:
+    """Runs ``function`` on items in a thread pool and streams its results to the caller.
+
+    ``function`` returns an iterable per item, the values are handed over one
+    at a time through a queue of ``buffer_size`` entries, so a slow consumer
+    holds back the workers instead of buffering whole responses. Iterating
+    yields ``(item, value, error)`` for every value, then ``(item, None, None)``
+    when the item is done or ``(item, None, error)`` when it failed. Items
+    submitted while iterating are picked up by the same iteration, which ends
+    once every submitted item is done.
+
+    Closing cancels the queued items and returns without waiting for the ones
+    in flight, they stop at their next value.
+    """
+
+    def __init__(
+        self,
+        function: Callable[[Any], Iterable[Any]],
+        max_workers: int = 8,
+        buffer_size: int = 256,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.function = function
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._events: "queue.Queue[Tuple[str, Any, Any]]" = queue.Queue(maxsize=buffer_size)
+        self._stopped = threading.Event()
+        self._futures = []
+        self._active = 0
+
+    def __enter__(self) -> "Crawl":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _put(self, event: Tuple[str, Any, Any]) -> bool:
+        while not self._stopped.is_set():
+            try:
+                self._events.put(event, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self, item: Any):
+        try:
+            values = iter(self.function(item))
+            try:
+                for value in values:
+                    if not self._put((_VALUE, item, value)):
+                        return
+            finally:
+                close = getattr(values, "close", None)
+                if close is not None:
+                    close()
+        except Exception as exception:
+            self._put((_FAILED, item, exception))
+            return
+        self._put((_DONE, item, None))
+
+    def submit(self, item: Any):
+        self._futures.append(self._executor.submit(self._run, item))
+        self._active += 1
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any, Any]]:
+        while self._active:
+            kind, item, payload = self._events.get()
+            if kind == _VALUE:
+                yield item, payload, None
+                continue
+            self._active -= 1
+            if kind == _FAILED:
+                yield item, None, payload
+            else:
+                yield item, None, None
+
+    def close(self):
+        self._stopped.set()
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown(wait=False)
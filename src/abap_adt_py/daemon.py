@@ -0,0 +1,201 @@
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import socketserver
+import threading
+import time
+
+from .adt_client import AdtClient
+from .compat_typing import Any, Callable, Dict, Optional, Tuple
+from .daemon_protocol import (
+    DaemonState,
+    SystemConfig,
+    encode_message,
+    read_daemon_state,
+    state_file_path,
+)
+from .paged_search import search_all
+from .session_store import write_private_file
+from .session_pool import SessionPool
+
+
+def _write_source(adt_client: AdtClient, object_uri: str, source_uri: str, source: str):
+    lock_handle = adt_client.lock(object_uri)
+    try:
+        return adt_client.set_object_source(source_uri, source, lock_handle)
+    finally:
+        adt_client.unlock(object_uri, lock_handle)
+
+
+# lock and unlock are not offered on their own, the lock lives in the session
+# that happened to serve the request
+OPERATIONS: Dict[str, Callable[..., Any]] = {
+    "search_object": AdtClient.search_object,
+    "search_all": search_all,
+    "resolve_uri": AdtClient.resolve_uri,
+    "get_object_source": AdtClient.get_object_source,
+    "write_source": _write_source,
+    "activate": AdtClient.activate,
+    "activate_many": AdtClient.activate_many,
+    "get_inactive_objects": AdtClient.get_inactive_objects,
+    "activate_inactive_objects": AdtClient.activate_inactive_objects,
+    "syntax_check": AdtClient.syntax_check,
+    "run_unit_test": AdtClient.run_unit_test,
+    "run_unit_tests": AdtClient.run_unit_tests,
+    "prettyprint": AdtClient.prettyprint,
+    "object_structure": AdtClient.object_structure,
+    "node_structure": AdtClient.node_structure,
+    "usage_references": AdtClient.usage_references,
+}
+
+
+def run_operation(adt_client: AdtClient, operation: str, arguments: Dict[str, Any]):
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown operation: {operation}")
+    return OPERATIONS[operation](adt_client, **arguments)
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    server: "AdtDaemon"
+
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            message = json.loads(line)
+            if not hmac.compare_digest(str(message.get("token", "")), self.server.token):
+                raise PermissionError("Invalid daemon token.")
+            if message.get("operation") == "shutdown":
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                response = {"ok": True, "result": True}
+            elif message.get("operation") == "status":
+                response = {"ok": True, "result": self.server.status()}
+            else:
+                result = self.server.call(
+                    message["system"], message["operation"], message.get("arguments", {})
+                )
+                response = {"ok": True, "result": result}
+        except Exception as exception:
+            response = {"ok": False, "error": f"{type(exception).__name__}: {exception}"}
+        self.wfile.write(encode_message(response))
+
+
+class AdtDaemon(socketserver.ThreadingTCPServer):
+    """Keeps logged-in session pools per system and serves AdtClient operations on localhost.
+
+    Requests are single JSON lines holding the token from the state file, the
+    system and the operation, answered by one JSON line.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        port: int = 0,
+        pool_size: int = 4,
+        idle_timeout: Optional[float] = 3600.0,
+        directory: Optional[str] = None,
+    ):
+        super().__init__(("127.0.0.1", port), _DaemonHandler)
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.directory = directory
+        self.token = secrets.token_hex(32)
+        self.last_used = time.monotonic()
+        self.active_requests = 0
+        self._activity_lock = threading.Lock()
+        self._pools: Dict[Tuple[str, ...], SessionPool] = {}
+        self._pools_lock = threading.Lock()
+
+    def _pool(self, system: SystemConfig) -> SessionPool:
+        # the password is part of the key, a wrong one never reaches a warm session
+        password_digest = hashlib.sha256(system["password"].encode("utf-8")).hexdigest()
+        key = (
+            system["host"],
+            system["client"],
+            system["user"].upper(),
+            system["language"],
+            password_digest,
+        )
+        with self._pools_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = SessionPool(
+                    system["host"],
+                    system["user"],
+                    system["password"],
+                    system["client"],
+                    system["language"],
+                    size=self.pool_size,
+                )
+                self._pools[key] = pool
+            return pool
+
+    def call(self, system: SystemConfig, operation: str, arguments: Dict[str, Any]):
+        with self._activity_lock:
+            self.active_requests += 1
+        try:
+            with self._pool(system).lease() as adt_client:
+                return run_operation(adt_client, operation, arguments)
+        finally:
+            with self._activity_lock:
+                self.active_requests -= 1
+                self.last_used = time.monotonic()
+
+    def is_idle(self) -> bool:
+        # a long search or test run keeps the daemon busy past the timeout
+        with self._activity_lock:
+            return (
+                self.active_requests == 0
+                and time.monotonic() - self.last_used > self.idle_timeout
+            )
+
+    def status(self) -> Dict[str, Any]:
+        with self._pools_lock:
+            systems = [f"{key[2]}@{key[0]}/{key[1]}" for key in self._pools]
+        return {"pid": os.getpid(), "port": self.server_address[1], "systems": systems}
+
+    def _watch_idle(self):
+        while True:
+            time.sleep(min(self.idle_timeout, 60.0))
+            if self.is_idle():
+                self.shutdown()
+                return
+
+    def serve(self):
+        state: DaemonState = {
+            "port": self.server_address[1],
+            "token": self.token,
+            "pid": os.getpid(),
+        }
+        write_private_file(state_file_path(self.directory), json.dumps(state))
+        if self.idle_timeout:
+            threading.Thread(target=self._watch_idle, daemon=True).start()
+        try:
+            self.serve_forever()
+        finally:
+            self.server_close()
+            with self._pools_lock:
+                for pool in self._pools.values():
+                    pool.close()
+            current = read_daemon_state(self.directory)
+            if current is not None and current["pid"] == os.getpid():
+                os.remove(state_file_path(self.directory))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local abap-adt session daemon.")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument(
+        "--idle-timeout", type=float, default=3600.0, help="seconds, 0 keeps it running"
+    )
+    arguments = parser.parse_args()
+    AdtDaemon(arguments.port, arguments.pool_size, arguments.idle_timeout or None).serve()
+
+
+if __name__ == "__main__":
+    main()
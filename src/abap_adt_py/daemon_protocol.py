@@ -0,0 +1,91 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as et
+
+from .compat_typing import Any, Dict, Optional, TypedDict
+from .session_store import state_directory
+
+STATE_FILE_NAME = "daemon.json"
+
+
+class SystemConfig(TypedDict):
+    host: str
+    client: str
+    user: str
+    password: str
+    language: str
+
+
+class DaemonState(TypedDict):
+    port: int
+    token: str
+    pid: int
+
+
+def state_file_path(directory: Optional[str] = None) -> str:
+    return os.path.join(directory or state_directory(), STATE_FILE_NAME)
+
+
+def read_daemon_state(directory: Optional[str] = None) -> Optional[DaemonState]:
+    try:
+        with open(state_file_path(directory), "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def json_default(value: Any):
+    if isinstance(value, et.Element):
+        return et.tostring(value, encoding="unicode")
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    return (json.dumps(message, default=json_default) + "\n").encode("utf-8")
+
+
+def send_to_daemon(
+    message: Dict[str, Any], state: DaemonState, timeout: Optional[float] = None
+) -> Any:
+    message = dict(message, token=state["token"])
+    with socket.create_connection(("127.0.0.1", state["port"]), timeout=timeout) as connection:
+        connection.sendall(encode_message(message))
+        with connection.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("The daemon closed the connection.")
+    response = json.loads(line)
+    if not response["ok"]:
+        raise Exception(response["error"])
+    return response["result"]
+
+
+def start_daemon(
+    directory: Optional[str] = None, timeout: float = 10.0, idle_timeout: float = 3600.0
+) -> DaemonState:
+    """Starts a detached daemon process and waits until its state file is written."""
+    previous = read_daemon_state(directory)
+    environment = dict(os.environ)
+    if directory is not None:
+        environment["ABAP_ADT_HOME"] = directory
+    subprocess.Popen(
+        [sys.executable, "-m", "abap_adt_py.daemon", "--idle-timeout", str(idle_timeout)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env=environment,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        state = read_daemon_state(directory)
+        if state is not None and state != previous:
+            return state
+        time.sleep(0.05)
+    raise Exception("The daemon did not start in time.")
@@ -0,0 +1,115 @@
+from .adt_client import AdtClient
+from .api.usages import UsageReference, main_object_uri
+from .compat_typing import Dict, Iterator, List, Optional, TypedDict
+from .crawl import Crawl
+
+
+class DependencyEdge(TypedDict):
+    used_uri: str
+    user_uri: str
+    depth: int
+    reference: UsageReference
+
+
+def iter_usage_edges(
+    adt_client: AdtClient,
+    object_uris: List[str],
+    max_depth: int = 1,
+    max_workers: int = 8,
+    max_objects: Optional[int] = None,
+    object_types: Optional[List[str]] = None,
+    failed: Optional[Dict[str, str]] = None,
+) -> Iterator[DependencyEdge]:
+    """Yields (used object, using object) edges of the where-used graph as they arrive.
+
+    The graph is expanded breadth first from ``object_uris`` up to
+    ``max_depth`` levels, with at most ``max_workers`` usage reference
+    requests in flight. Every object is expanded once and every edge is
+    yielded once. ``max_objects`` caps the number of expanded objects.
+    ``object_types`` keeps only using objects of these types, e.g. CLAS/OC.
+    Objects whose usages cannot be read are put into ``failed`` when given,
+    otherwise the error is raised.
+
+    Give the client a UsageCache to make repeated crawls cheap.
+    """
+    roots = list(dict.fromkeys(main_object_uri(uri) for uri in object_uris))
+    expanded = set(roots)
+    edges = set()
+    level = roots
+    depth = 1
+    with Crawl(adt_client.usage_references, max_workers) as crawl:
+        while level:
+            # levels are expanded one after another, so every object is
+            # expanded at its shortest distance
+            for object_uri in level:
+                crawl.submit(object_uri)
+            next_level: List[str] = []
+            for used_uri, reference, error in crawl:
+                if error is not None:
+                    if failed is None:
+                        raise error
+                    failed[used_uri] = str(error)
+                    continue
+                if reference is None:
+                    continue
+
+                user_uri = reference["object_uri"]
+                if user_uri == used_uri or (used_uri, user_uri) in edges:
+                    continue
+                if object_types is not None and reference["type"] not in object_types:
+                    continue
+                edges.add((used_uri, user_uri))
+                yield {
+                    "used_uri": used_uri,
+                    "user_uri": user_uri,
+                    "depth": depth,
+                    "reference": reference,
+                }
+                if (
+                    depth < max_depth
+                    and user_uri not in expanded
+                    and (max_objects is None or len(expanded) < max_objects)
+                ):
+                    expanded.add(user_uri)
+                    next_level.append(user_uri)
+            level = next_level
+            depth += 1
+
+
+def usage_graph(
+    adt_client: AdtClient,
+    object_uris: List[str],
+    max_depth: int = 1,
+    max_workers: int = 8,
+    max_objects: Optional[int] = None,
+    object_types: Optional[List[str]] = None,
+) -> Dict[str, List[str]]:
+    """Maps every expanded object uri to the uris of the objects using it."""
+    graph: Dict[str, List[str]] = {
+        main_object_uri(object_uri): [] for object_uri in object_uris
+    }
+    for edge in iter_usage_edges(
+        adt_client, object_uris, max_depth, max_workers, max_objects, object_types
+    ):
+        graph.setdefault(edge["used_uri"], []).append(edge["user_uri"])
+    return graph
+
+
+def impacted_objects(
+    adt_client: AdtClient,
+    object_uris: List[str],
+    max_depth: int = 2,
+    max_workers: int = 8,
+    max_objects: Optional[int] = None,
+    object_types: Optional[List[str]] = None,
+) -> Dict[str, int]:
+    """Maps every object that directly or indirectly uses the given objects to its distance."""
+    roots = {main_object_uri(object_uri) for object_uri in object_uris}
+    distances: Dict[str, int] = {}
+    for edge in iter_usage_edges(
+        adt_client, object_uris, max_depth, max_workers, max_objects, object_types
+    ):
+        user_uri = edge["user_uri"]
+        if user_uri not in roots and edge["depth"] < distances.get(user_uri, max_depth + 1):
+            distances[user_uri] = edge["depth"]
+    return distances
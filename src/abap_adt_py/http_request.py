@@ -1,5 +1,11 @@
+import threading
+import time
+
 import requests
-from .compat_typing import Literal, TypedDict
+from .concurrency import RequestThrottle
+from .compat_typing import Callable, Dict, Literal, NotRequired, Optional, Tuple, TypedDict
+from .instrumentation import Instrumentation, endpoint_template
+from .transport import HttpxResponse, RequestsTransport, Transport, TransportResponse
 
 
 class HttpRequestParameters(TypedDict):
@@ -7,7 +13,142 @@ class HttpRequestParameters(TypedDict):
     csrf_token: str
     statefulness: Literal["stateless", "stateful"]
     request_number: int
-    session: requests.Session
+    session: NotRequired[requests.Session]
+    transport: NotRequired[Transport]
+    instrumentation: NotRequired[Instrumentation]
+    csrf_token_refresher: NotRequired[Callable[[str], str]]
+    throttle: NotRequired[RequestThrottle]
+
+
+class AdtRequestError(Exception):
+    """A request the system answered with an error status, ``status_code`` holds the status."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _transport(http_request_parameters: HttpRequestParameters) -> Transport:
+    transport = http_request_parameters.get("transport")
+    if transport is None:
+        transport = RequestsTransport(http_request_parameters["session"])
+    return transport
+
+
+def _send(transport: Transport, method: str, config: dict) -> TransportResponse:
+    return transport.send(method, **config)
+
+
+def is_csrf_failure(response: TransportResponse) -> bool:
+    if response.status_code != 403:
+        return False
+    if response.headers.get("x-csrf-token", "").lower() == "required":
+        return True
+    return "CSRF token validation failed" in response.text
+
+
+def _refresh_csrf_token(
+    http_request_parameters: HttpRequestParameters,
+    method: str,
+    config: dict,
+    response: TransportResponse,
+) -> bool:
+    """Replaces a rejected CSRF token in the request, True when it should be sent again."""
+    refresher = http_request_parameters.get("csrf_token_refresher")
+    if refresher is None or method == "GET" or not is_csrf_failure(response):
+        return False
+
+    response.close()
+    csrf_token = refresher(config["headers"]["x-csrf-token"])
+    config["headers"]["x-csrf-token"] = csrf_token
+    http_request_parameters["csrf_token"] = csrf_token
+    return True
+
+
+def _send_with_csrf_retry(
+    http_request_parameters: HttpRequestParameters,
+    transport: Transport,
+    method: str,
+    config: dict,
+) -> Tuple[TransportResponse, int]:
+    response = _send(transport, method, config)
+    if not _refresh_csrf_token(http_request_parameters, method, config, response):
+        return response, 0
+    return _send(transport, method, config), 1
+
+
+def _send_throttled(
+    http_request_parameters: HttpRequestParameters,
+    transport: Transport,
+    method: str,
+    config: dict,
+    endpoint: str,
+) -> Tuple[TransportResponse, int]:
+    throttle = http_request_parameters.get("throttle")
+    if throttle is None:
+        return _send_with_csrf_retry(http_request_parameters, transport, method, config)
+    attempt = 0
+    csrf_retries = 0
+    while True:
+        # a streamed body is read after the slot was given back
+        with throttle.permit(endpoint) as permit:
+            response = _send(transport, method, config)
+            permit.status = response.status_code
+        # refreshed without holding the slot, fetching the token needs a slot of its own
+        if csrf_retries == 0 and _refresh_csrf_token(
+            http_request_parameters, method, config, response
+        ):
+            csrf_retries = 1
+            continue
+        delay = throttle.retry_delay(
+            response.status_code, response.headers.get("Retry-After"), attempt
+        )
+        if delay is None:
+            return response, csrf_retries + attempt
+        # reading the short error body keeps the connection reusable
+        response.content
+        response.close()
+        time.sleep(delay)
+        attempt += 1
+
+
+def _endpoint(uri: str, params: dict) -> str:
+    endpoint = endpoint_template(uri)
+    if "_action" in params:
+        endpoint += f"?_action={params['_action']}"
+    return endpoint
+
+
+def _response_bytes(response: TransportResponse) -> int:
+    content_length = response.headers.get("Content-Length")
+    if content_length is not None and content_length.isdigit():
+        return int(content_length)
+    return len(response.content)
+
+
+def _streamed_bytes(response: TransportResponse) -> int:
+    """Bytes of a streamed body read so far."""
+    if isinstance(response, HttpxResponse):
+        return response.response.num_bytes_downloaded
+    try:
+        return response.raw.tell()
+    except (AttributeError, OSError):
+        return 0
+
+
+def _record_on_close(response: TransportResponse, record: Callable[[], None]):
+    close = response.close
+    recorded = threading.Event()
+
+    def close_and_record():
+        try:
+            close()
+        finally:
+            if not recorded.is_set():
+                recorded.set()
+                record()
+
+    response.close = close_and_record
 
 
 def request(
@@ -17,7 +158,9 @@ def request(
     body: str,
     params: dict,
     content_type: str = "application/xml",
-) -> requests.Response:
+    headers: Optional[Dict[str, str]] = None,
+    stream: bool = False,
+) -> TransportResponse:
 
     config = {
         "params": params,
@@ -30,17 +173,67 @@ def request(
         },
         "url": http_request_parameters["host"] + uri,
         "data": body,
+        "stream": stream,
     }
+    if headers:
+        config["headers"].update(headers)
+
+    transport = _transport(http_request_parameters)
+    endpoint = _endpoint(uri, params)
+    instrumentation = http_request_parameters.get("instrumentation")
+    if instrumentation is None:
+        response, _ = _send_throttled(
+            http_request_parameters, transport, method, config, endpoint
+        )
+        return response
+
+    request_bytes = len(body.encode("utf-8")) if body else 0
+    instrumentation.before_request(
+        {
+            "method": method,
+            "uri": uri,
+            "endpoint": endpoint,
+            "request_number": http_request_parameters["request_number"],
+            "request_bytes": request_bytes,
+        }
+    )
+
+    started = time.perf_counter()
+
+    def record(
+        response: Optional[TransportResponse],
+        response_bytes: int,
+        retries: int,
+        error: Optional[str],
+    ):
+        instrumentation.after_request(
+            {
+                "method": method,
+                "uri": uri,
+                "endpoint": endpoint,
+                "status": response.status_code if response is not None else None,
+                "latency": time.perf_counter() - started,
+                "request_bytes": request_bytes,
+                "response_bytes": response_bytes,
+                "retries": retries,
+                "request_number": http_request_parameters["request_number"],
+                "error": error,
+            }
+        )
+
+    try:
+        response, retries = _send_throttled(
+            http_request_parameters, transport, method, config, endpoint
+        )
+    except Exception as exception:
+        record(None, 0, 0, f"{type(exception).__name__}: {exception}")
+        raise
 
-    session = http_request_parameters["session"]
-    if method == "POST":
-        response = session.post(**config)
-    elif method == "GET":
-        response = session.get(**config)
-    elif method == "PUT":
-        response = session.put(**config)
-    elif method == "DELETE":
-        response = session.delete(**config)
+    if stream and 200 <= response.status_code < 300:
+        # the caller reads and parses the body, it is measured until the response is closed
+        _record_on_close(
+            response, lambda: record(response, _streamed_bytes(response), retries, None)
+        )
     else:
-        raise ValueError(f"Unsupported method: {method}")
+        record(response, _response_bytes(response), retries, None)
     return response
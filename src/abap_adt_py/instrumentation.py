@@ -0,0 +1,196 @@
+import bisect
+import logging
+import re
+import threading
+from collections import deque
+
+from .compat_typing import Callable, Dict, List, Optional, TypedDict
+
+OBJECT_COLLECTIONS = [
+    "programs/programs",
+    "programs/includes",
+    "oo/classes",
+    "oo/interfaces",
+    "functions/groups",
+    "ddic/tables",
+    "ddic/structures",
+    "ddic/dataelements",
+    "ddic/domains",
+    "ddic/ddl/sources",
+    "ddic/ddlx/sources",
+    "acm/dcl/sources",
+    "messageclass",
+    "packages",
+]
+_OBJECT_NAME_PATTERNS = [
+    re.compile(f"(/sap/bc/adt/{re.escape(collection)}/)[^/?#]+")
+    for collection in OBJECT_COLLECTIONS
+] + [re.compile(r"(/fmodules/)[^/?#]+")]
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+class RequestInfo(TypedDict):
+    method: str
+    uri: str
+    endpoint: str
+    request_number: int
+    request_bytes: int
+
+
+class RequestRecord(TypedDict):
+    method: str
+    uri: str
+    endpoint: str
+    status: Optional[int]
+    latency: float
+    request_bytes: int
+    response_bytes: int
+    retries: int
+    request_number: int
+    error: Optional[str]
+
+
+class EndpointSummary(TypedDict):
+    method: str
+    endpoint: str
+    count: int
+    errors: int
+    total_latency: float
+    min_latency: float
+    max_latency: float
+    p50_latency: float
+    p99_latency: float
+    request_bytes: int
+    response_bytes: int
+    histogram: Dict[str, int]
+
+
+PreRequestHook = Callable[[RequestInfo], None]
+PostRequestHook = Callable[[RequestRecord], None]
+
+
+def endpoint_template(uri: str) -> str:
+    endpoint = uri.split("?", 1)[0]
+    for pattern in _OBJECT_NAME_PATTERNS:
+        endpoint = pattern.sub(r"\1{name}", endpoint)
+    return endpoint
+
+
+class _EndpointStatistics:
+    def __init__(self, method: str, endpoint: str):
+        self.method = method
+        self.endpoint = endpoint
+        self.count = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.min_latency = float("inf")
+        self.max_latency = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def add(self, record: RequestRecord):
+        self.count += 1
+        if record["error"] is not None or (record["status"] or 0) >= 400:
+            self.errors += 1
+        self.total_latency += record["latency"]
+        self.min_latency = min(self.min_latency, record["latency"])
+        self.max_latency = max(self.max_latency, record["latency"])
+        self.request_bytes += record["request_bytes"]
+        self.response_bytes += record["response_bytes"]
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, record["latency"] * 1000)] += 1
+
+    def _percentile(self, fraction: float) -> float:
+        # upper bound of the bucket holding the percentile, capped by the maximum seen
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if index < len(LATENCY_BUCKETS_MS):
+                    return min(LATENCY_BUCKETS_MS[index] / 1000, self.max_latency)
+                break
+        return self.max_latency
+
+    def summary(self) -> EndpointSummary:
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [
+            f">{LATENCY_BUCKETS_MS[-1]}ms"
+        ]
+        return {
+            "method": self.method,
+            "endpoint": self.endpoint,
+            "count": self.count,
+            "errors": self.errors,
+            "total_latency": self.total_latency,
+            "min_latency": self.min_latency if self.count else 0.0,
+            "max_latency": self.max_latency,
+            "p50_latency": self._percentile(0.5),
+            "p99_latency": self._percentile(0.99),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "histogram": dict(zip(labels, self.buckets)),
+        }
+
+
+class Instrumentation:
+    """Collects a RequestRecord for every request and aggregates them per endpoint.
+
+    The last ``max_records`` records are kept in ``records``. Successful
+    streamed responses are recorded when they are closed, so their latency
+    includes reading and parsing the body. Exceptions raised by hooks are
+    logged and otherwise ignored.
+    """
+
+    def __init__(self, max_records: int = 1000):
+        self.records: "deque[RequestRecord]" = deque(maxlen=max_records)
+        self._pre_request_hooks: List[PreRequestHook] = []
+        self._post_request_hooks: List[PostRequestHook] = []
+        self._statistics: Dict[str, _EndpointStatistics] = {}
+        self._lock = threading.Lock()
+
+    def add_pre_request_hook(self, hook: PreRequestHook):
+        self._pre_request_hooks.append(hook)
+
+    def add_post_request_hook(self, hook: PostRequestHook):
+        self._post_request_hooks.append(hook)
+
+    def remove_hook(self, hook: Callable):
+        if hook in self._pre_request_hooks:
+            self._pre_request_hooks.remove(hook)
+        if hook in self._post_request_hooks:
+            self._post_request_hooks.remove(hook)
+
+    def _call_hooks(self, hooks: List[Callable], argument):
+        # a failing hook must neither fail the request nor hide its error
+        for hook in list(hooks):
+            try:
+                hook(argument)
+            except Exception:
+                logger.exception("Request hook %r failed", hook)
+
+    def before_request(self, request_info: RequestInfo):
+        self._call_hooks(self._pre_request_hooks, request_info)
+
+    def after_request(self, record: RequestRecord):
+        with self._lock:
+            self.records.append(record)
+            key = f"{record['method']} {record['endpoint']}"
+            statistics = self._statistics.get(key)
+            if statistics is None:
+                statistics = _EndpointStatistics(record["method"], record["endpoint"])
+                self._statistics[key] = statistics
+            statistics.add(record)
+        self._call_hooks(self._post_request_hooks, record)
+
+    def summary(self) -> List[EndpointSummary]:
+        with self._lock:
+            summaries = [statistics.summary() for statistics in self._statistics.values()]
+        return sorted(summaries, key=lambda summary: summary["total_latency"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self.records.clear()
+            self._statistics.clear()
@@ -0,0 +1,231 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .adt_client import AdtClient
+from .api.content import get_object_source_conditional
+from .api.nodestructure import RepositoryNode
+from .api.objectstructure import object_structure
+from .package_tree import PackageObject, collect_package_objects
+from .compat_typing import Dict, List, Optional, TypedDict, Union
+
+MANIFEST_FILE_NAME = ".adt_mirror.json"
+ADT_URI_PREFIX = "/sap/bc/adt/"
+SOURCE_FILE_EXTENSION = ".abap"
+
+SOURCE_TYPES = [
+    "PROG/P",
+    "PROG/I",
+    "CLAS/OC",
+    "INTF/OI",
+    "FUGR/FF",
+    "FUGR/I",
+    "TABL/DT",
+    "DCLS/DL",
+    "DDLS/DF",
+    "DDLX/EX",
+]
+
+
+class MirroredSource(TypedDict):
+    path: str
+    object_uri: str
+    object_type: str
+    object_name: str
+    root_package: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class MirrorResult(TypedDict):
+    downloaded: List[str]
+    unchanged: List[str]
+    removed: List[str]
+    failed: Dict[str, str]
+
+
+def source_uri_to_path(source_uri: str) -> str:
+    if not source_uri.startswith(ADT_URI_PREFIX):
+        raise ValueError(f"Not an ADT uri: {source_uri}")
+    relative = source_uri[len(ADT_URI_PREFIX) :].strip("/")
+    return os.path.join(*relative.split("/")) + SOURCE_FILE_EXTENSION
+
+
+def path_to_source_uri(relative_path: str) -> str:
+    relative = relative_path.replace(os.sep, "/")
+    if relative.endswith(SOURCE_FILE_EXTENSION):
+        relative = relative[: -len(SOURCE_FILE_EXTENSION)]
+    return ADT_URI_PREFIX + relative
+
+
+def _resolve_href(object_uri: str, href: str) -> str:
+    href = href.split("#", 1)[0].split("?", 1)[0]
+    if not href:
+        return ""
+    if not href.startswith("/"):
+        href = f"{object_uri.rstrip('/')}/{href}"
+    return href
+
+
+class PackageMirror:
+    """Mirrors the sources of packages into a local directory.
+
+    Later runs only download sources whose ETag or Last-Modified changed.
+    """
+
+    def __init__(self, adt_client: AdtClient, directory: str, max_workers: int = 8):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.adt_client = adt_client
+        self.directory = directory
+        self.max_workers = max_workers
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST_FILE_NAME)
+
+    def load_manifest(self) -> Dict[str, MirroredSource]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("system") != self.adt_client.system_id:
+            return {}
+        return manifest.get("sources", {})
+
+    def _save_manifest(self, sources: Dict[str, MirroredSource]):
+        os.makedirs(self.directory, exist_ok=True)
+        temporary_path = f"{self.manifest_path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {"system": self.adt_client.system_id, "sources": sources},
+                file,
+                indent=1,
+                sort_keys=True,
+            )
+        os.replace(temporary_path, self.manifest_path)
+
+    def _source_uris(self, node: RepositoryNode) -> List[str]:
+        object_uri = node["object_uri"]
+        source_uris = [f"{object_uri}/source/main"]
+        if node["object_type"] != "CLAS/OC":
+            return source_uris
+
+        http_request_parameters = self.adt_client.build_request_parameters()
+        structure = object_structure(http_request_parameters, object_uri)
+        links = list(structure["links"])
+        for component in structure["components"]:
+            links.extend(component.get("links", []))
+        for link in links:
+            href = _resolve_href(object_uri, link["href"])
+            if "/includes/" in href and href.startswith(object_uri):
+                if href not in source_uris:
+                    source_uris.append(href)
+        return source_uris
+
+    def _download(
+        self, source_uri: str, mirror_object: PackageObject, known: Optional[MirroredSource]
+    ) -> Optional[MirroredSource]:
+        relative_path = source_uri_to_path(source_uri)
+        path = os.path.join(self.directory, relative_path)
+        if known is not None and not os.path.exists(path):
+            known = None
+
+        http_request_parameters = self.adt_client.build_request_parameters()
+        response = get_object_source_conditional(
+            http_request_parameters,
+            source_uri,
+            etag=known["etag"] if known else None,
+            last_modified=known["last_modified"] if known else None,
+        )
+        if not response["modified"] and known is not None:
+            return None
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            file.write(response["source"])
+
+        node = mirror_object["node"]
+        return {
+            "path": relative_path,
+            "object_uri": node["object_uri"],
+            "object_type": node["object_type"],
+            "object_name": node["object_name"],
+            "root_package": mirror_object["root_package"],
+            "etag": response["etag"],
+            "last_modified": response["last_modified"],
+        }
+
+    def sync(self, packages: Union[str, List[str]]) -> MirrorResult:
+        if isinstance(packages, str):
+            packages = [packages]
+        root_packages = [package.upper() for package in packages]
+
+        manifest = self.load_manifest()
+        result: MirrorResult = {
+            "downloaded": [],
+            "unchanged": [],
+            "removed": [],
+            "failed": {},
+        }
+
+        objects = collect_package_objects(
+            self.adt_client, root_packages, SOURCE_TYPES, max_workers=self.max_workers
+        )
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+
+            def list_sources(mirror_object: PackageObject):
+                try:
+                    return self._source_uris(mirror_object["node"]), None
+                except Exception as exception:
+                    return [], str(exception)
+
+            seen = set()
+            sources = []
+            for mirror_object, (source_uris, error) in zip(
+                objects, executor.map(list_sources, objects)
+            ):
+                if error is None:
+                    sources.extend((source_uri, mirror_object) for source_uri in source_uris)
+                    continue
+                object_uri = mirror_object["node"]["object_uri"]
+                result["failed"][object_uri] = error
+                # without the list of includes the local files are kept as they are
+                seen.update(
+                    source_uri
+                    for source_uri, mirrored in manifest.items()
+                    if mirrored["object_uri"] == object_uri
+                )
+
+            def download(entry):
+                source_uri, mirror_object = entry
+                try:
+                    mirrored = self._download(
+                        source_uri, mirror_object, manifest.get(source_uri)
+                    )
+                except Exception as exception:
+                    return source_uri, None, str(exception)
+                return source_uri, mirrored, None
+
+            for source_uri, mirrored, error in executor.map(download, sources):
+                seen.add(source_uri)
+                if error is not None:
+                    result["failed"][source_uri] = error
+                elif mirrored is None:
+                    result["unchanged"].append(source_uri)
+                else:
+                    manifest[source_uri] = mirrored
+                    result["downloaded"].append(source_uri)
+
+        for source_uri, mirrored in list(manifest.items()):
+            if mirrored["root_package"] in root_packages and source_uri not in seen:
+                try:
+                    os.remove(os.path.join(self.directory, mirrored["path"]))
+                except FileNotFoundError:
+                    pass
+                del manifest[source_uri]
+                result["removed"].append(source_uri)
+
+        self._save_manifest(manifest)
+        return result
@@ -0,0 +1,89 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from .adt_client import AdtClient
+from .api.nodestructure import RepositoryNode
+from .compat_typing import List, Optional, TypedDict
+
+PACKAGE_TYPE = "DEVC/K"
+CONTAINER_TYPES = ["FUGR/F"]
+
+
+class PackageObject(TypedDict):
+    node: RepositoryNode
+    package: str
+    root_package: str
+
+
+def package_uri(package: str) -> str:
+    return f"/sap/bc/adt/packages/{package.lower()}"
+
+
+def collect_package_objects(
+    adt_client: AdtClient,
+    packages: List[str],
+    object_types: Optional[List[str]] = None,
+    include_subpackages: bool = True,
+    max_workers: int = 8,
+) -> List[PackageObject]:
+    """Lists the objects of packages, level by level with parallel node structure reads.
+
+    Contents of function groups are listed as well. ``object_types`` filters the
+    result, containers and subpackages are only returned when they match it.
+    """
+
+    def wanted(node: RepositoryNode) -> bool:
+        return object_types is None or node["object_type"] in object_types
+
+    objects: List[PackageObject] = []
+    seen_packages = set()
+    level = [(package.upper(), package.upper()) for package in packages]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while level:
+            level = [
+                (package, root) for package, root in level if package not in seen_packages
+            ]
+            seen_packages.update(package for package, _ in level)
+            node_lists = executor.map(
+                lambda entry: adt_client.node_structure(PACKAGE_TYPE, entry[0]), level
+            )
+
+            next_level = []
+            containers: List[PackageObject] = []
+            for (package, root), nodes in zip(level, node_lists):
+                for node in nodes:
+                    entry: PackageObject = {
+                        "node": node,
+                        "package": package,
+                        "root_package": root,
+                    }
+                    if node["object_type"] == PACKAGE_TYPE:
+                        if include_subpackages:
+                            next_level.append((node["object_name"].upper(), root))
+                    elif node["object_type"] in CONTAINER_TYPES:
+                        containers.append(entry)
+                    if wanted(node):
+                        objects.append(entry)
+
+            container_nodes = executor.map(
+                lambda container: adt_client.node_structure(
+                    container["node"]["object_type"], container["node"]["object_name"]
+                ),
+                containers,
+            )
+            for container, nodes in zip(containers, container_nodes):
+                for node in nodes:
+                    if wanted(node):
+                        objects.append(
+                            {
+                                "node": node,
+                                "package": container["package"],
+                                "root_package": container["root_package"],
+                            }
+                        )
+            level = next_level
+
+    unique_objects = {}
+    for package_object in objects:
+        unique_objects.setdefault(package_object["node"]["object_uri"], package_object)
+    return list(unique_objects.values())
@@ -0,0 +1,79 @@
+from .adt_client import AdtClient
+from .compat_typing import Dict, Iterator, List, Optional
+from .crawl import Crawl
+
+# characters of repository object names, "/" for namespaces
+NAME_CHARACTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_/$"
+MAX_NAME_LENGTH = 40
+
+
+def partition_query(query: str) -> List[str]:
+    """Splits a prefix query like ``Z*`` into one query per next character, ``ZA*`` to ``Z$*``."""
+    if not query.endswith("*"):
+        return []
+    prefix = query[:-1]
+    return [f"{prefix}{character}*" for character in NAME_CHARACTERS]
+
+
+def iter_search_all(
+    adt_client: AdtClient,
+    query: str,
+    page_size: int = 100,
+    max_workers: int = 8,
+    failed: Optional[Dict[str, str]] = None,
+    truncated: Optional[List[str]] = None,
+) -> Iterator[Dict[str, str]]:
+    """Yields every object reference matching ``query`` as the pages stream in.
+
+    Quick search has no offset, so a page with ``page_size`` results is taken
+    as cut off and its query is split by the next character of the name, and
+    so on until every page has room left. ``page_size`` must not be larger
+    than the number of results the server returns at most. The pages are
+    requested concurrently with at most ``max_workers`` in flight and their
+    references are yielded one at a time as they are parsed, every uri once
+    and in no particular order. Queries that fail are put
+    into ``failed`` when given, otherwise the error is raised. Queries that
+    cannot be split further although their page is full go into ``truncated``.
+
+    An object named exactly like a split prefix, e.g. ``ZA`` for ``ZA*``, is
+    only found when it is on the page of that prefix, which it is when the
+    server returns the results in name order.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    query = query.strip().upper()
+    seen = set()
+    page_lengths: Dict[str, int] = {}
+
+    def search(page_query: str) -> Iterator[Dict[str, str]]:
+        return adt_client.iter_search_object(page_query, page_size)
+
+    with Crawl(search, max_workers, buffer_size=page_size) as crawl:
+        crawl.submit(query)
+        for page_query, reference, error in crawl:
+            if reference is not None:
+                page_lengths[page_query] = page_lengths.get(page_query, 0) + 1
+                uri = reference.get("uri")
+                if uri not in seen:
+                    seen.add(uri)
+                    yield reference
+                continue
+            if error is not None:
+                if failed is None:
+                    raise error
+                failed[page_query] = str(error)
+                continue
+
+            if page_lengths.pop(page_query, 0) >= page_size:
+                partitions = partition_query(page_query)
+                if partitions and len(page_query) <= MAX_NAME_LENGTH:
+                    for partition in partitions:
+                        crawl.submit(partition)
+                elif truncated is not None:
+                    truncated.append(page_query)
+
+
+def search_all(
+    adt_client: AdtClient, query: str, page_size: int = 100, max_workers: int = 8
+) -> List[Dict[str, str]]:
+    return list(iter_search_all(adt_client, query, page_size, max_workers))
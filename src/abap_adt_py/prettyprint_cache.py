@@ -0,0 +1,113 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from .api.prettyprint import PrettyPrintSettings
+from .compat_typing import Optional, TypedDict
+
+logger = logging.getLogger(__name__)
+
+
+class PrettyPrintCacheStats(TypedDict):
+    hits: int
+    misses: int
+
+
+def prettyprint_cache_key(
+    system: str, username: str, settings: Optional[PrettyPrintSettings], src: str
+) -> str:
+    # None stands for the settings stored on the server, as they were never set by this client;
+    # those are kept per user
+    settings_text = json.dumps(settings, sort_keys=True)
+    digest = hashlib.sha256()
+    digest.update(f"{system}\n{username.upper()}\n{settings_text}\n".encode("utf-8"))
+    digest.update(src.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class PrettyPrintCache:
+    """Formatted sources keyed by a hash of system, user, pretty printer settings and source.
+
+    Entries live in an in-memory LRU and, when ``directory`` is given and
+    ``persist`` is set, in one file per key so they survive the process.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_entries: int = 4096):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.directory = directory
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.abap")
+
+    def _remember(self, key: str, formatted: str):
+        self._entries[key] = formatted
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            formatted = self._entries.get(key)
+            if formatted is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return formatted
+
+        if self.directory is not None:
+            try:
+                with open(self._path(key), "r", encoding="utf-8", newline="") as file:
+                    formatted = file.read()
+            except OSError:
+                formatted = None
+
+        with self._lock:
+            if formatted is None:
+                self.misses += 1
+                return None
+            self._remember(key, formatted)
+            self.hits += 1
+            return formatted
+
+    def put(self, key: str, formatted: str, persist: bool = True):
+        with self._lock:
+            self._remember(key, formatted)
+        if self.directory is not None and persist:
+            path = self._path(key)
+            temporary_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                with open(temporary_path, "w", encoding="utf-8", newline="") as file:
+                    file.write(formatted)
+                os.replace(temporary_path, path)
+            except OSError:
+                # a full or read-only disk only costs the entry its persistence
+                logger.warning("Could not write pretty printer cache entry %s", path, exc_info=True)
+                try:
+                    os.remove(temporary_path)
+                except OSError:
+                    pass
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.directory is not None:
+            for file_name in os.listdir(self.directory):
+                if file_name.endswith(".abap"):
+                    try:
+                        os.remove(os.path.join(self.directory, file_name))
+                    except FileNotFoundError:
+                        pass
+
+    def stats(self) -> PrettyPrintCacheStats:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
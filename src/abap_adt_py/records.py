@@ -0,0 +1,144 @@
+import sys
+
+from .compat_typing import Any, Dict, Iterable, Iterator, List, Tuple, Type, TypeVar
+
+R = TypeVar("R", bound="_Record")
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class _Record:
+    """Compact, slots based form of a result dict.
+
+    ``_fields`` maps dict keys to attribute names, values of ``_interned``
+    attributes are interned as they repeat across many records. Keys outside of
+    ``_fields`` are kept in ``extra``. Missing keys are stored as None and left
+    out again by ``to_dict``.
+    """
+
+    __slots__ = ("extra",)
+    _fields: Tuple[Tuple[str, str], ...] = ()
+    _interned: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls: Type[R], values: Dict[str, Any]) -> R:
+        record = cls.__new__(cls)
+        for key, attribute in cls._fields:
+            value = values.get(key)
+            if attribute in cls._interned:
+                value = _intern(value)
+            setattr(record, attribute, cls._convert(attribute, value))
+        known_keys = {key for key, _ in cls._fields}
+        extra = {
+            _intern(key): value for key, value in values.items() if key not in known_keys
+        }
+        record.extra = extra or None
+        return record
+
+    @classmethod
+    def _convert(cls, attribute: str, value: Any) -> Any:
+        return value
+
+    def _export(self, attribute: str, value: Any) -> Any:
+        return value
+
+    def to_dict(self) -> Dict[str, Any]:
+        values = {}
+        for key, attribute in self._fields:
+            value = getattr(self, attribute)
+            if value is not None:
+                values[key] = self._export(attribute, value)
+        if self.extra:
+            values.update(self.extra)
+        return values
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        attributes = ", ".join(
+            f"{attribute}={getattr(self, attribute)!r}" for _, attribute in self._fields
+        )
+        return f"{type(self).__name__}({attributes})"
+
+
+class ObjectReferenceRecord(_Record):
+    __slots__ = ("uri", "type", "name", "package_name", "description")
+    _fields = (
+        ("uri", "uri"),
+        ("type", "type"),
+        ("name", "name"),
+        ("packageName", "package_name"),
+        ("description", "description"),
+    )
+    _interned = ("type", "package_name")
+
+
+class SyntaxCheckRecord(_Record):
+    __slots__ = ("uri", "line", "offset", "type", "short_text")
+    _fields = (
+        ("uri", "uri"),
+        ("line", "line"),
+        ("offset", "offset"),
+        ("type", "type"),
+        ("short_text", "short_text"),
+    )
+    _interned = ("uri", "type", "short_text")
+
+
+class UnitTestAlertRecord(_Record):
+    __slots__ = ("title", "kind", "severity", "details", "stack")
+    _fields = (
+        ("title", "title"),
+        ("kind", "kind"),
+        ("severity", "severity"),
+        ("details", "details"),
+        ("stack", "stack"),
+    )
+    _interned = ("kind", "severity")
+
+    @classmethod
+    def _convert(cls, attribute: str, value: Any) -> Any:
+        if attribute == "details" and value is not None:
+            return tuple(value)
+        return value
+
+    def _export(self, attribute: str, value: Any) -> Any:
+        if attribute == "details":
+            return list(value)
+        return value
+
+
+class ComponentRecord(_Record):
+    __slots__ = ("name", "type", "links", "level", "clif_name", "visibility")
+    _fields = (
+        ("name", "name"),
+        ("type", "type"),
+        ("links", "links"),
+        ("level", "level"),
+        ("clif_name", "clif_name"),
+        ("visibility", "visibility"),
+    )
+    _interned = ("type", "level", "clif_name", "visibility")
+
+    @classmethod
+    def _convert(cls, attribute: str, value: Any) -> Any:
+        if attribute == "links" and value is not None:
+            return tuple((_intern(link["rel"]), link["href"]) for link in value)
+        return value
+
+    def _export(self, attribute: str, value: Any) -> Any:
+        if attribute == "links":
+            return [{"rel": rel, "href": href} for rel, href in value]
+        return value
+
+
+def to_records(record_class: Type[R], values: Iterable[Dict[str, Any]]) -> Iterator[R]:
+    for value in values:
+        yield record_class.from_dict(value)
+
+
+def to_dicts(records: Iterable[_Record]) -> List[Dict[str, Any]]:
+    return [record.to_dict() for record in records]
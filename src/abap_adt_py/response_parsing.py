@@ -1,6 +1,13 @@
+import io
 from xml.etree import ElementTree as et
-from .compat_typing import Optional, Dict, List
+
+import requests
+
+from .compat_typing import IO, Optional, Dict, Iterator, List, Tuple, Union
 from .api.xml_namespaces import XML_NAMESPACES
+from .transport import HttpxResponse
+
+XmlSource = Union[str, bytes, IO[bytes], requests.Response, HttpxResponse]
 
 
 def _strip_namespace(name: str) -> str:
@@ -20,14 +27,93 @@ def _et_to_attributes_dict(element: Optional[et.Element]) -> Dict[str, str]:
     return cleaned
 
 
-def find_xml_elements_attributes(xml_text: str, tag_name: str) -> List[Dict[str, str]]:
-    root = et.fromstring(xml_text)
-    elements = root.findall(tag_name, XML_NAMESPACES)
-    processed_elements = []
-    for element in elements:
-        cleaned = _et_to_attributes_dict(element)
-        processed_elements.append(cleaned)
-    return processed_elements
+def _qualify(tag_name: str) -> str:
+    if ":" in tag_name and not tag_name.startswith("{"):
+        prefix, local_name = tag_name.split(":", 1)
+        return f"{{{XML_NAMESPACES[prefix]}}}{local_name}"
+    return tag_name
+
+
+def _compile_path(tag_path: str) -> Tuple[bool, List[str]]:
+    anywhere = tag_path.startswith(".//")
+    if anywhere:
+        tag_path = tag_path[3:]
+    return anywhere, [_qualify(part) for part in tag_path.split("/") if part]
+
+
+def _path_matches(anywhere: bool, parts: List[str], stack: List[str]) -> bool:
+    if anywhere:
+        return len(stack) > len(parts) and stack[-len(parts) :] == parts
+    return stack[1:] == parts
+
+
+def _as_byte_stream(source: XmlSource) -> IO[bytes]:
+    if isinstance(source, requests.Response):
+        source.raw.decode_content = True
+        return source.raw
+    if isinstance(source, str):
+        return io.BytesIO(source.encode("utf-8"))
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    if isinstance(source, HttpxResponse):
+        return source.raw
+    return source
+
+
+def iter_xml_events(
+    source: XmlSource, events: Tuple[str, ...] = ("start", "end")
+) -> Iterator[Tuple[str, et.Element, List[str]]]:
+    """Yields (event, element, tag stack) while parsing the byte stream incrementally."""
+    stack: List[str] = []
+    for event, element in et.iterparse(_as_byte_stream(source), events=("start", "end")):
+        if event == "start":
+            stack.append(element.tag)
+            if "start" in events:
+                yield event, element, stack
+        else:
+            if "end" in events:
+                yield event, element, stack
+            stack.pop()
+
+
+def iter_xml_elements(source: XmlSource, tag_path: str) -> Iterator[et.Element]:
+    """Yields the elements matching tag_path and discards them afterwards.
+
+    tag_path is relative to the root element like in ElementTree.findall, a
+    leading ".//" matches at any depth. Elements are yielded when they end,
+    so of nested matches the innermost comes first.
+    """
+    anywhere, parts = _compile_path(tag_path)
+    parents: List[et.Element] = []
+    matched: List[bool] = []
+    for event, element, stack in iter_xml_events(source):
+        if event == "start":
+            matched.append(_path_matches(anywhere, parts, stack))
+            parents.append(element)
+            continue
+
+        is_match = matched.pop()
+        parents.pop()
+        if is_match:
+            yield element
+        # keep the subtree of an enclosing match, drop everything else
+        if not any(matched):
+            element.clear()
+            if parents and len(parents[-1]) and parents[-1][-1] is element:
+                del parents[-1][-1]
+
+
+def iter_xml_elements_attributes(
+    source: XmlSource, tag_name: str
+) -> Iterator[Dict[str, str]]:
+    for element in iter_xml_elements(source, tag_name):
+        yield _et_to_attributes_dict(element)
+
+
+def find_xml_elements_attributes(
+    xml_text: XmlSource, tag_name: str
+) -> List[Dict[str, str]]:
+    return list(iter_xml_elements_attributes(xml_text, tag_name))
 
 
 def find_xml_element_attributes(xml_text: str, tag_name: str) -> Dict[str, str]:
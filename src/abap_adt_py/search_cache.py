@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import OrderedDict
+
+from .compat_typing import Dict, List, Optional, TypedDict
+
+
+class SearchCacheStats(TypedDict):
+    hits: int
+    misses: int
+    index_hits: int
+    index_misses: int
+
+
+def matches_object_type(reference: Dict[str, str], object_type: Optional[str]) -> bool:
+    if not object_type:
+        return True
+    reference_type = reference.get("type", "").upper()
+    object_type = object_type.upper()
+    if "/" in object_type:
+        return reference_type == object_type
+    return reference_type.split("/", 1)[0] == object_type
+
+
+class _TtlLru:
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict" = OrderedDict()
+
+    def get(self, key, now: float):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value, now: float):
+        self._entries[key] = (now + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SearchCache:
+    """TTL and size bounded cache of quickSearch results.
+
+    Every cached response also fills a name index that resolves an object name
+    (and optionally its type) to its object reference without another request.
+    """
+
+    def __init__(
+        self, ttl: float = 300.0, max_entries: int = 1024, max_names: int = 100000
+    ):
+        if max_entries < 1 or max_names < 1:
+            raise ValueError("max_entries and max_names must be at least 1")
+        self._results = _TtlLru(ttl, max_entries)
+        self._names = _TtlLru(ttl, max_names)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.index_hits = 0
+        self.index_misses = 0
+
+    def get(self, query: str, max_results: int) -> Optional[List[Dict[str, str]]]:
+        with self._lock:
+            results = self._results.get((query.upper(), max_results), time.monotonic())
+            if results is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return [dict(reference) for reference in results]
+
+    def put(self, query: str, max_results: int, results: List[Dict[str, str]]):
+        now = time.monotonic()
+        with self._lock:
+            self._results.put(
+                (query.upper(), max_results),
+                [dict(reference) for reference in results],
+                now,
+            )
+            self._index(results, now)
+
+    def index(self, results: List[Dict[str, str]]):
+        with self._lock:
+            self._index(results, time.monotonic())
+
+    def _index(self, results: List[Dict[str, str]], now: float):
+        for reference in results:
+            name = reference.get("name", "").upper()
+            if not name or not reference.get("uri"):
+                continue
+            references: Dict[str, Dict[str, str]] = dict(
+                self._names.get(name, now) or {}
+            )
+            references[reference.get("type", "")] = dict(reference)
+            self._names.put(name, references, now)
+
+    def lookup(
+        self, name: str, object_type: Optional[str] = None
+    ) -> Optional[Dict[str, str]]:
+        with self._lock:
+            references = self._names.get(name.upper(), time.monotonic()) or {}
+            for reference in references.values():
+                if matches_object_type(reference, object_type):
+                    self.index_hits += 1
+                    return dict(reference)
+            self.index_misses += 1
+            return None
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self._names.clear()
+
+    def stats(self) -> SearchCacheStats:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "index_hits": self.index_hits,
+                "index_misses": self.index_misses,
+            }
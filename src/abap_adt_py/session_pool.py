@@ -0,0 +1,137 @@
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from .adt_client import AdtClient
+from .compat_typing import Callable, Iterable, Iterator, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class _PooledSession:
+    def __init__(self, adt_client: AdtClient):
+        self.adt_client = adt_client
+        self.uses = 0
+
+
+class SessionPool:
+    """Leases logged-in AdtClient sessions, each with its own enqueue context."""
+
+    def __init__(
+        self,
+        sap_host: str,
+        username: str,
+        password: str,
+        client: str,
+        language: str,
+        size: int = 4,
+        max_uses: Optional[int] = None,
+        **client_options,
+    ):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        if max_uses is not None and max_uses < 1:
+            raise ValueError("max_uses must be at least 1")
+        if client_options.get("session_store") is not None:
+            # restored sessions would all share one server session and its locks
+            raise ValueError("Pooled sessions cannot use a session store.")
+        if not isinstance(client_options.get("transport", "http1"), str):
+            # a shared transport would also share its cookies, pass the transport name
+            raise ValueError("Pooled sessions need a transport name, not an instance.")
+        self.sap_host = sap_host
+        self.username = username
+        self.password = password
+        self.client = client
+        self.language = language
+        self.size = size
+        self.max_uses = max_uses
+        self.client_options = client_options
+
+        self._idle: "queue.LifoQueue[_PooledSession]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+
+    def __enter__(self) -> "SessionPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _new_session(self) -> _PooledSession:
+        adt_client = AdtClient(
+            self.sap_host,
+            self.username,
+            self.password,
+            self.client,
+            self.language,
+            **self.client_options,
+        )
+        adt_client.login()
+        return _PooledSession(adt_client)
+
+    def _discard(self, pooled: _PooledSession):
+        adt_client = pooled.adt_client
+        if adt_client.statefulness == "stateful":
+            # the server keeps the locks of a dropped session until it times out
+            still_locked = adt_client.release_locks()
+            if still_locked:
+                logger.warning("Could not release the locks of %s", ", ".join(still_locked))
+        adt_client.transport.close()
+
+    @contextmanager
+    def lease(self) -> Iterator[AdtClient]:
+        if self._closed:
+            raise Exception("Session pool is closed.")
+        self._slots.acquire()
+        try:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                pooled = self._new_session()
+
+            try:
+                yield pooled.adt_client
+            except BaseException:
+                # the session may be in the middle of an edit, never hand it out again
+                self._discard(pooled)
+                raise
+
+            pooled.uses += 1
+            adt_client = pooled.adt_client
+            if (
+                self._closed
+                or adt_client.statefulness == "stateful"
+                or (self.max_uses is not None and pooled.uses >= self.max_uses)
+            ):
+                self._discard(pooled)
+            else:
+                self._idle.put(pooled)
+        finally:
+            self._slots.release()
+
+    def map(
+        self,
+        function: Callable[[AdtClient, T], R],
+        items: Iterable[T],
+        max_workers: Optional[int] = None,
+    ) -> List[R]:
+        def run(item: T) -> R:
+            with self.lease() as adt_client:
+                return function(adt_client, item)
+
+        with ThreadPoolExecutor(max_workers=max_workers or self.size) as executor:
+            return list(executor.map(run, items))
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(pooled)
@@ -0,0 +1,66 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .compat_typing import Any, Dict, List, Optional, TypedDict
+
+SESSION_DIRECTORY_NAME = "sessions"
+
+
+class StoredSession(TypedDict):
+    csrf_token: str
+    cookies: List[Dict[str, Any]]
+    saved: float
+
+
+def state_directory() -> str:
+    return os.environ.get("ABAP_ADT_HOME", os.path.join(os.path.expanduser("~"), ".abap_adt"))
+
+
+def write_private_file(path: str, content: str):
+    """Writes a file only readable by the current user, replacing it atomically."""
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    descriptor = os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+        file.write(content)
+    os.replace(temporary_path, path)
+
+
+class SessionStore:
+    """Session cookies and CSRF tokens per (host, client, user), stored in files only the owner can read.
+
+    Entries older than ``max_age`` seconds are ignored, the server usually ends
+    idle sessions long before.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_age: float = 8 * 3600.0):
+        self.directory = directory or os.path.join(state_directory(), SESSION_DIRECTORY_NAME)
+        self.max_age = max_age
+
+    def _path(self, host: str, client: str, user: str) -> str:
+        key = f"{host.rstrip('/')}\n{client}\n{user.upper()}"
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def load(self, host: str, client: str, user: str) -> Optional[StoredSession]:
+        try:
+            with open(self._path(host, client, user), "r", encoding="utf-8") as file:
+                stored: StoredSession = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if time.time() - stored.get("saved", 0) > self.max_age:
+            return None
+        return stored
+
+    def save(self, host: str, client: str, user: str, csrf_token: str, cookies: List[Dict[str, Any]]):
+        stored: StoredSession = {"csrf_token": csrf_token, "cookies": cookies, "saved": time.time()}
+        write_private_file(self._path(host, client, user), json.dumps(stored))
+
+    def delete(self, host: str, client: str, user: str):
+        try:
+            os.remove(self._path(host, client, user))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from urllib.parse import quote
+
+from .compat_typing import List, Optional, Tuple, TypedDict
+
+SourceCacheKey = Tuple[str, str, str]
+
+
+class SourceCacheEntry(TypedDict):
+    source: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class SourceCacheStats(TypedDict):
+    hits: int
+    misses: int
+    invalidations: int
+
+
+class SourceCache(ABC):
+    """Base class of the source caches used by AdtClient.get_object_source.
+
+    Keys are (system, object uri, version) tuples. A cached body is only served
+    after the server confirmed it with 304 Not Modified.
+    """
+
+    def __init__(self):
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @abstractmethod
+    def get(self, key: SourceCacheKey) -> Optional[SourceCacheEntry]:
+        pass
+
+    @abstractmethod
+    def put(self, key: SourceCacheKey, entry: SourceCacheEntry):
+        pass
+
+    @abstractmethod
+    def keys(self) -> List[SourceCacheKey]:
+        pass
+
+    @abstractmethod
+    def _remove(self, key: SourceCacheKey):
+        pass
+
+    @abstractmethod
+    def _invalidate(self, system: str, object_uri: str) -> int:
+        """Removes the entries of the lowercase uri and the uris below it, returns how many."""
+
+    def invalidate(self, system: str, object_uri: str):
+        removed = self._invalidate(system, object_uri.lower())
+        with self._stats_lock:
+            self.invalidations += removed
+
+    def clear(self):
+        for key in self.keys():
+            self._remove(key)
+
+    def record_hit(self):
+        with self._stats_lock:
+            self.hits += 1
+
+    def record_miss(self):
+        with self._stats_lock:
+            self.misses += 1
+
+    def stats(self) -> SourceCacheStats:
+        with self._stats_lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+class MemorySourceCache(SourceCache):
+    def __init__(self, max_entries: int = 1024):
+        super().__init__()
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[SourceCacheKey, SourceCacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: SourceCacheKey) -> Optional[SourceCacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: SourceCacheKey, entry: SourceCacheEntry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def keys(self) -> List[SourceCacheKey]:
+        with self._lock:
+            return list(self._entries.keys())
+
+    def _remove(self, key: SourceCacheKey):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _invalidate(self, system: str, object_uri: str) -> int:
+        with self._lock:
+            removed = [
+                key
+                for key in self._entries
+                if key[0] == system
+                and (
+                    key[1].lower() == object_uri
+                    or key[1].lower().startswith(object_uri + "/")
+                )
+            ]
+            for key in removed:
+                del self._entries[key]
+        return len(removed)
+
+
+class DiskSourceCache(SourceCache):
+    """One file per source, in a directory per system and uri path.
+
+    Invalidating an object removes its directory, the sources below it
+    included, without reading other entries.
+    """
+
+    def __init__(self, directory: str):
+        super().__init__()
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _uri_directory(self, system: str, object_uri: str) -> str:
+        system_directory = hashlib.sha256(system.encode("utf-8")).hexdigest()[:16]
+        segments = [
+            # "." and ".." would leave the cache directory
+            quote(segment, safe="") if segment.strip(".") else segment.replace(".", "%2E")
+            for segment in object_uri.lower().split("/")
+            if segment
+        ]
+        return os.path.join(self.directory, system_directory, *segments)
+
+    def _path(self, key: SourceCacheKey) -> str:
+        system, object_uri, version = key
+        return os.path.join(self._uri_directory(system, object_uri), f"{version}.json")
+
+    def get(self, key: SourceCacheKey) -> Optional[SourceCacheEntry]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as file:
+                stored = json.load(file)
+        except (OSError, ValueError):
+            return None
+        # uris that differ only in case share a file
+        if tuple(stored.get("key", [])) != key:
+            return None
+        return stored["entry"]
+
+    def put(self, key: SourceCacheKey, entry: SourceCacheEntry):
+        path = self._path(key)
+        temporary_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temporary_path, "w", encoding="utf-8") as file:
+                json.dump({"key": list(key), "entry": entry}, file)
+            os.replace(temporary_path, path)
+        except FileNotFoundError:
+            # the directory was invalidated meanwhile, the entry is outdated anyway
+            pass
+
+    def _entry_paths(self, directory: str) -> List[str]:
+        return [
+            os.path.join(root, file_name)
+            for root, _, file_names in os.walk(directory)
+            for file_name in file_names
+            if file_name.endswith(".json")
+        ]
+
+    def keys(self) -> List[SourceCacheKey]:
+        keys = []
+        for path in self._entry_paths(self.directory):
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    keys.append(tuple(json.load(file)["key"]))
+            except (OSError, ValueError, KeyError):
+                continue
+        return keys
+
+    def _remove(self, key: SourceCacheKey):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _invalidate(self, system: str, object_uri: str) -> int:
+        directory = self._uri_directory(system, object_uri)
+        removed = len(self._entry_paths(directory))
+        shutil.rmtree(directory, ignore_errors=True)
+        return removed
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+
+
+class TieredSourceCache(SourceCache):
+    """In-memory LRU in front of an on-disk store."""
+
+    def __init__(self, directory: str, max_entries: int = 1024):
+        super().__init__()
+        self.memory = MemorySourceCache(max_entries)
+        self.disk = DiskSourceCache(directory)
+
+    def get(self, key: SourceCacheKey) -> Optional[SourceCacheEntry]:
+        entry = self.memory.get(key)
+        if entry is None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self.memory.put(key, entry)
+        return entry
+
+    def put(self, key: SourceCacheKey, entry: SourceCacheEntry):
+        self.memory.put(key, entry)
+        self.disk.put(key, entry)
+
+    def keys(self) -> List[SourceCacheKey]:
+        return list(set(self.memory.keys()) | set(self.disk.keys()))
+
+    def _remove(self, key: SourceCacheKey):
+        self.memory._remove(key)
+        self.disk._remove(key)
+
+    def _invalidate(self, system: str, object_uri: str) -> int:
+        return max(
+            self.memory._invalidate(system, object_uri),
+            self.disk._invalidate(system, object_uri),
+        )
+
+    def clear(self):
+        self.memory.clear()
+        self.disk.clear()
@@ -0,0 +1,141 @@
+import hashlib
+from urllib.parse import unquote
+
+from .adt_client import AdtClient
+from .api.activate import ActivationResult
+from .api.usages import main_object_uri
+from .compat_typing import Dict, List, NotRequired, Optional, TypedDict
+from .session_pool import SessionPool
+
+
+class SourceWrite(TypedDict):
+    object_uri: str
+    source_uri: str
+    source: str
+    object_name: NotRequired[str]
+
+
+class SourceSyncResult(TypedDict):
+    written: List[str]
+    unchanged: List[str]
+    failed: Dict[str, str]
+    activation: List[ActivationResult]
+
+
+def source_digest(source: str) -> str:
+    # the server may answer with CRLF line endings
+    normalized = source.replace("\r\n", "\n")
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def source_object_name(write: SourceWrite) -> str:
+    """Name of the object a source belongs to, taken from its uri when not given."""
+    if write.get("object_name"):
+        return write["object_name"]
+    return unquote(write["object_uri"].rstrip("/").rsplit("/", 1)[-1]).upper()
+
+
+def is_source_changed(
+    adt_client: AdtClient, write: SourceWrite, known_digest: Optional[str] = None
+) -> bool:
+    """Compares with a known digest, or with the inactive server version otherwise."""
+    if known_digest is None:
+        try:
+            server_source = adt_client.get_object_source(write["source_uri"], "inactive")
+        except Exception:
+            return True
+        known_digest = source_digest(server_source)
+    return source_digest(write["source"]) != known_digest
+
+
+def write_object_sources(adt_client: AdtClient, writes: List[SourceWrite]):
+    """Writes the sources of one object under a single lock."""
+    object_uri = writes[0]["object_uri"]
+    lock_handle = adt_client.lock(object_uri)
+    try:
+        for write in writes:
+            adt_client.set_object_source(write["source_uri"], write["source"], lock_handle)
+    except Exception:
+        # a failed unlock must not hide why the write failed
+        try:
+            adt_client.unlock(object_uri, lock_handle)
+        except Exception:
+            pass
+        raise
+    adt_client.unlock(object_uri, lock_handle)
+
+
+def sync_object_sources(
+    pool: SessionPool,
+    writes: List[SourceWrite],
+    activate: bool = True,
+    known_digests: Optional[Dict[str, str]] = None,
+) -> SourceSyncResult:
+    """Writes only the sources that differ from the server and activates the changed objects.
+
+    ``known_digests`` maps source uris to the source_digest of the server
+    version, sources without an entry are compared with one GET each of the
+    inactive version. Written sources are added to it. Unchanged objects
+    that are still inactive, e.g. because an earlier activation failed, are
+    activated along with the written ones.
+    """
+    if known_digests is None:
+        known_digests = {}
+    result: SourceSyncResult = {
+        "written": [],
+        "unchanged": [],
+        "failed": {},
+        "activation": [],
+    }
+
+    def compare(adt_client: AdtClient, write: SourceWrite):
+        return is_source_changed(adt_client, write, known_digests.get(write["source_uri"]))
+
+    changed_by_object: Dict[str, List[SourceWrite]] = {}
+    for write, changed in zip(writes, pool.map(compare, writes)):
+        if changed:
+            changed_by_object.setdefault(write["object_uri"], []).append(write)
+        else:
+            result["unchanged"].append(write["source_uri"])
+
+    def write_object(adt_client: AdtClient, object_writes: List[SourceWrite]):
+        try:
+            write_object_sources(adt_client, object_writes)
+        except Exception as exception:
+            return str(exception)
+        return None
+
+    object_writes = list(changed_by_object.values())
+    written_objects = []
+    for writes_of_object, error in zip(object_writes, pool.map(write_object, object_writes)):
+        if error is None:
+            written_objects.append(writes_of_object[0])
+            for write in writes_of_object:
+                result["written"].append(write["source_uri"])
+                known_digests[write["source_uri"]] = source_digest(write["source"])
+        else:
+            for write in writes_of_object:
+                result["failed"][write["source_uri"]] = error
+
+    if not activate:
+        return result
+    unchanged = set(result["unchanged"])
+    unchanged_objects = {
+        write["object_uri"].lower(): write
+        for write in writes
+        if write["source_uri"] in unchanged and write["object_uri"] not in changed_by_object
+    }
+    with pool.lease() as adt_client:
+        to_activate = list(written_objects)
+        if unchanged_objects:
+            for inactive_object in adt_client.get_inactive_objects():
+                write = unchanged_objects.pop(
+                    main_object_uri(inactive_object["uri"]).lower(), None
+                )
+                if write is not None:
+                    to_activate.append(write)
+        if to_activate:
+            result["activation"] = adt_client.activate_many(
+                [(source_object_name(write), write["object_uri"]) for write in to_activate]
+            )
+    return result
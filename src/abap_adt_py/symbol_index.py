@@ -0,0 +1,372 @@
+import difflib
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .adt_client import AdtClient
+from .api.content import get_object_source_conditional
+from .compat_typing import Dict, List, Optional, Tuple, TypedDict, Union
+from .package_tree import PackageObject, collect_package_objects
+
+SYMBOL_OBJECT_TYPES = ["CLAS/OC", "INTF/OI"]
+DEFINITION_RELATION = "http://www.sap.com/adt/relations/source/definitionIdentifier"
+IMPLEMENTATION_RELATION = "http://www.sap.com/adt/relations/source/implementationIdentifier"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    uri TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    package TEXT NOT NULL,
+    root_package TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    object_uri TEXT NOT NULL REFERENCES objects(uri) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    name_upper TEXT NOT NULL,
+    type TEXT NOT NULL,
+    visibility TEXT,
+    level TEXT,
+    definition_uri TEXT,
+    implementation_uri TEXT
+);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols(name_upper);
+CREATE INDEX IF NOT EXISTS symbols_object ON symbols(object_uri);
+CREATE TABLE IF NOT EXISTS name_trigrams (
+    trigram TEXT NOT NULL,
+    name_upper TEXT NOT NULL,
+    PRIMARY KEY (trigram, name_upper)
+) WITHOUT ROWID;
+"""
+
+# names sharing the most of the rarer trigrams with the text are ranked by similarity
+FUZZY_CANDIDATES = 200
+FUZZY_MAX_POSTINGS = 5000
+
+
+class Symbol(TypedDict):
+    name: str
+    type: str
+    visibility: Optional[str]
+    level: Optional[str]
+    object_name: str
+    object_type: str
+    object_uri: str
+    definition_uri: Optional[str]
+    implementation_uri: Optional[str]
+
+
+class SymbolIndexResult(TypedDict):
+    indexed: List[str]
+    unchanged: List[str]
+    removed: List[str]
+    failed: Dict[str, str]
+    duration: float
+
+
+_SYMBOL_COLUMNS = """
+    symbols.name, symbols.type, symbols.visibility, symbols.level,
+    objects.name, objects.type, objects.uri,
+    symbols.definition_uri, symbols.implementation_uri
+"""
+
+
+def _symbol(row: tuple) -> Symbol:
+    return {
+        "name": row[0],
+        "type": row[1],
+        "visibility": row[2],
+        "level": row[3],
+        "object_name": row[4],
+        "object_type": row[5],
+        "object_uri": row[6],
+        "definition_uri": row[7],
+        "implementation_uri": row[8],
+    }
+
+
+def name_trigrams(name: str) -> List[str]:
+    padded = f"  {name.upper()} "
+    return list(dict.fromkeys(padded[index : index + 3] for index in range(len(padded) - 2)))
+
+
+def _component_uris(object_uri: str, links: List[dict]) -> Tuple[Optional[str], Optional[str]]:
+    definition_uri = None
+    implementation_uri = None
+    for link in links:
+        href = link["href"]
+        if not href.startswith("/"):
+            # keeps the #start=line,column fragment used for navigation
+            href = f"{object_uri.rstrip('/')}/{href}"
+        if link["rel"] == DEFINITION_RELATION and definition_uri is None:
+            definition_uri = href
+        elif link["rel"] == IMPLEMENTATION_RELATION and implementation_uri is None:
+            implementation_uri = href
+    return definition_uri, implementation_uri
+
+
+class SymbolIndex:
+    """Local sqlite index of the components of classes and interfaces.
+
+    ``update`` crawls packages and re-reads the object structure only of
+    objects whose source changed since the last run. Queries never contact
+    the server.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        # indexes written before the trigram table existed
+        with self._connection:
+            if self._connection.execute(
+                "SELECT NOT EXISTS (SELECT 1 FROM name_trigrams) AND EXISTS (SELECT 1 FROM symbols)"
+            ).fetchone()[0]:
+                rows = self._connection.execute("SELECT DISTINCT name_upper FROM symbols")
+                self._add_trigrams([name for (name,) in rows])
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "SymbolIndex":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _add_trigrams(self, names: List[str]):
+        self._connection.executemany(
+            "INSERT OR IGNORE INTO name_trigrams VALUES (?, ?)",
+            [(trigram, name) for name in names for trigram in name_trigrams(name)],
+        )
+
+    def _known_versions(self) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT uri, etag, last_modified FROM objects"
+            ).fetchall()
+        return {uri: (etag, last_modified) for uri, etag, last_modified in rows}
+
+    def _read_object(
+        self,
+        adt_client: AdtClient,
+        package_object: PackageObject,
+        known: Optional[Tuple[Optional[str], Optional[str]]],
+    ) -> Optional[Tuple[dict, Optional[str], Optional[str]]]:
+        object_uri = package_object["node"]["object_uri"]
+        response = get_object_source_conditional(
+            adt_client.build_request_parameters(),
+            f"{object_uri}/source/main",
+            etag=known[0] if known else None,
+            last_modified=known[1] if known else None,
+        )
+        if not response["modified"] and known is not None:
+            return None
+        structure = adt_client.object_structure(object_uri)
+        return structure, response["etag"], response["last_modified"]
+
+    def _store_object(
+        self,
+        package_object: PackageObject,
+        structure: dict,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ):
+        node = package_object["node"]
+        object_uri = node["object_uri"]
+        symbols = [
+            (
+                object_uri,
+                node["object_name"],
+                node["object_name"].upper(),
+                node["object_type"],
+                structure.get("visibility") or None,
+                None,
+                object_uri,
+                None,
+            )
+        ]
+        for component in structure["components"]:
+            if not component.get("name"):
+                continue
+            definition_uri, implementation_uri = _component_uris(
+                object_uri, component.get("links", [])
+            )
+            symbols.append(
+                (
+                    object_uri,
+                    component["name"],
+                    component["name"].upper(),
+                    component.get("type", ""),
+                    component.get("visibility"),
+                    component.get("level"),
+                    definition_uri,
+                    implementation_uri,
+                )
+            )
+
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM symbols WHERE object_uri = ?", (object_uri,))
+            self._connection.execute(
+                "INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    object_uri,
+                    node["object_name"],
+                    node["object_type"],
+                    package_object["package"],
+                    package_object["root_package"],
+                    etag,
+                    last_modified,
+                    time.time(),
+                ),
+            )
+            self._connection.executemany(
+                "INSERT INTO symbols VALUES (?, ?, ?, ?, ?, ?, ?, ?)", symbols
+            )
+            self._add_trigrams(list({symbol[2] for symbol in symbols}))
+
+    def update(
+        self,
+        adt_client: AdtClient,
+        packages: Union[str, List[str]],
+        max_workers: int = 8,
+    ) -> SymbolIndexResult:
+        """Indexes new and changed classes and interfaces of the packages.
+
+        Objects that left the packages are removed from the index.
+        """
+        started = time.perf_counter()
+        if isinstance(packages, str):
+            packages = [packages]
+        root_packages = [package.upper() for package in packages]
+        result: SymbolIndexResult = {
+            "indexed": [],
+            "unchanged": [],
+            "removed": [],
+            "failed": {},
+            "duration": 0.0,
+        }
+
+        objects = collect_package_objects(
+            adt_client, root_packages, SYMBOL_OBJECT_TYPES, max_workers=max_workers
+        )
+        known_versions = self._known_versions()
+
+        def read(package_object: PackageObject):
+            object_uri = package_object["node"]["object_uri"]
+            try:
+                return self._read_object(
+                    adt_client, package_object, known_versions.get(object_uri)
+                ), None
+            except Exception as exception:
+                return None, str(exception)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for package_object, (read_result, error) in zip(
+                objects, executor.map(read, objects)
+            ):
+                object_uri = package_object["node"]["object_uri"]
+                if error is not None:
+                    result["failed"][object_uri] = error
+                elif read_result is None:
+                    result["unchanged"].append(object_uri)
+                else:
+                    self._store_object(package_object, *read_result)
+                    result["indexed"].append(object_uri)
+
+        seen = {package_object["node"]["object_uri"] for package_object in objects}
+        with self._lock, self._connection:
+            placeholders = ", ".join("?" for _ in root_packages)
+            rows = self._connection.execute(
+                f"SELECT uri FROM objects WHERE root_package IN ({placeholders})",
+                root_packages,
+            ).fetchall()
+            removed = [uri for (uri,) in rows if uri not in seen]
+            self._connection.executemany(
+                "DELETE FROM objects WHERE uri = ?", [(uri,) for uri in removed]
+            )
+            if removed or result["indexed"]:
+                self._connection.execute(
+                    "DELETE FROM name_trigrams WHERE name_upper NOT IN (SELECT name_upper FROM symbols)"
+                )
+        result["removed"] = removed
+        result["duration"] = time.perf_counter() - started
+        return result
+
+    def find_prefix(
+        self, prefix: str, limit: int = 50, object_name: Optional[str] = None
+    ) -> List[Symbol]:
+        prefix = prefix.upper()
+        query = (
+            f"SELECT {_SYMBOL_COLUMNS} FROM symbols JOIN objects ON objects.uri = symbols.object_uri "
+            "WHERE symbols.name_upper >= ? AND symbols.name_upper < ?"
+        )
+        # the range keeps the name index usable, unlike LIKE
+        parameters: list = [prefix, prefix + "\uffff"]
+        if object_name is not None:
+            query += " AND objects.name = ?"
+            parameters.append(object_name.upper())
+        query += " ORDER BY symbols.name_upper LIMIT ?"
+        parameters.append(limit)
+        with self._lock:
+            rows = self._connection.execute(query, parameters).fetchall()
+        return [_symbol(row) for row in rows]
+
+    def find_fuzzy(self, text: str, limit: int = 20, cutoff: float = 0.6) -> List[Symbol]:
+        text = text.upper()
+        with self._lock:
+            counted = sorted(
+                (
+                    self._connection.execute(
+                        "SELECT COUNT(*) FROM name_trigrams WHERE trigram = ?", (trigram,)
+                    ).fetchone()[0],
+                    trigram,
+                )
+                for trigram in name_trigrams(text)
+            )
+            # trigrams shared by many names, like GET, add little but cost the most
+            trigrams: List[str] = []
+            postings = 0
+            for count, trigram in counted:
+                if count == 0:
+                    continue
+                if trigrams and postings + count > FUZZY_MAX_POSTINGS:
+                    break
+                trigrams.append(trigram)
+                postings += count
+            placeholders = ", ".join("?" for _ in trigrams)
+            candidates = [
+                name
+                for (name,) in self._connection.execute(
+                    f"SELECT name_upper FROM name_trigrams WHERE trigram IN ({placeholders}) "
+                    "GROUP BY name_upper ORDER BY COUNT(*) DESC LIMIT ?",
+                    [*trigrams, FUZZY_CANDIDATES],
+                )
+            ]
+        matches = difflib.get_close_matches(text, candidates, n=limit, cutoff=cutoff)
+        symbols: List[Symbol] = []
+        with self._lock:
+            for name in matches:
+                rows = self._connection.execute(
+                    f"SELECT {_SYMBOL_COLUMNS} FROM symbols JOIN objects ON objects.uri = symbols.object_uri "
+                    "WHERE symbols.name_upper = ?",
+                    (name,),
+                ).fetchall()
+                symbols.extend(_symbol(row) for row in rows)
+        return symbols[:limit]
+
+    def object_symbols(self, object_name: str) -> List[Symbol]:
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {_SYMBOL_COLUMNS} FROM symbols JOIN objects ON objects.uri = symbols.object_uri "
+                "WHERE objects.name = ? ORDER BY symbols.rowid",
+                (object_name.upper(),),
+            ).fetchall()
+        return [_symbol(row) for row in rows]
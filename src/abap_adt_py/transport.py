@@ -0,0 +1,216 @@
+import functools
+import io
+import ssl
+from abc import ABC, abstractmethod
+from http.cookiejar import CookieJar
+
+import requests
+from requests.auth import HTTPBasicAuth
+
+from .compat_typing import Dict, Iterator, Literal, Optional, Union
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+TransportName = Literal["http1", "http2"]
+
+
+class _IteratorReader(io.RawIOBase):
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(target), len(self._buffer))
+        target[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+class HttpxResponse:
+    """Exposes an httpx response with the parts of requests.Response the api modules use.
+
+    ``raw`` is a decoded byte stream, as the streaming XML parser expects.
+    """
+
+    def __init__(self, response: "httpx.Response"):
+        self.response = response
+        self._raw: Optional[io.BufferedReader] = None
+
+    @property
+    def status_code(self) -> int:
+        return self.response.status_code
+
+    @property
+    def headers(self):
+        return self.response.headers
+
+    @property
+    def content(self) -> bytes:
+        return self.response.read()
+
+    @property
+    def text(self) -> str:
+        self.response.read()
+        return self.response.text
+
+    @property
+    def raw(self) -> io.BufferedReader:
+        if self._raw is None:
+            self._raw = io.BufferedReader(_IteratorReader(self.response.iter_bytes()))
+        return self._raw
+
+    def close(self):
+        self.response.close()
+
+    def __enter__(self) -> "HttpxResponse":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+TransportResponse = Union[requests.Response, HttpxResponse]
+
+
+class Transport(ABC):
+    """Sends the HTTP requests of an AdtClient and holds its cookies."""
+
+    @abstractmethod
+    def set_auth(self, username: str, password: str):
+        pass
+
+    @property
+    @abstractmethod
+    def cookies(self) -> CookieJar:
+        pass
+
+    @abstractmethod
+    def send(
+        self,
+        method: str,
+        url: str,
+        params: dict,
+        headers: Dict[str, str],
+        data: str,
+        stream: bool,
+    ) -> TransportResponse:
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+
+class RequestsTransport(Transport):
+    """HTTP/1.1 over a requests.Session, one connection per concurrent request."""
+
+    def __init__(self, session: Optional[requests.Session] = None):
+        self.session = session if session is not None else requests.Session()
+
+    def set_auth(self, username: str, password: str):
+        self.session.auth = HTTPBasicAuth(username, password)
+
+    @property
+    def cookies(self) -> CookieJar:
+        return self.session.cookies
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        params: dict,
+        headers: Dict[str, str],
+        data: str,
+        stream: bool,
+    ) -> requests.Response:
+        if method not in ["GET", "POST", "PUT", "DELETE"]:
+            raise ValueError(f"Unsupported method: {method}")
+        return self.session.request(
+            method, url, params=params, headers=headers, data=data, stream=stream
+        )
+
+    def close(self):
+        self.session.close()
+
+
+@functools.lru_cache(maxsize=None)
+def _default_ssl_context() -> ssl.SSLContext:
+    # loading the trust store is slow, pooled clients share one context
+    return ssl.create_default_context()
+
+
+class HttpxTransport(Transport):
+    """httpx client that multiplexes concurrent requests over one HTTP/2 connection.
+
+    HTTP/2 is negotiated through TLS (ALPN), plain http:// hosts are served
+    with HTTP/1.1. Needs the optional dependency: pip install abap-adt-py[http2]
+    """
+
+    def __init__(
+        self,
+        http2: bool = True,
+        max_connections: int = 10,
+        timeout: Optional[float] = None,
+        verify: Union[bool, ssl.SSLContext] = True,
+    ):
+        if httpx is None:
+            raise ImportError(
+                "HttpxTransport requires httpx, install it with: pip install abap-adt-py[http2]"
+            )
+        self.client = httpx.Client(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            timeout=timeout,
+            verify=_default_ssl_context() if verify is True else verify,
+        )
+
+    def set_auth(self, username: str, password: str):
+        self.client.auth = httpx.BasicAuth(username, password)
+
+    @property
+    def cookies(self) -> CookieJar:
+        return self.client.cookies.jar
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        params: dict,
+        headers: Dict[str, str],
+        data: str,
+        stream: bool,
+    ) -> HttpxResponse:
+        if method not in ["GET", "POST", "PUT", "DELETE"]:
+            raise ValueError(f"Unsupported method: {method}")
+        request = self.client.build_request(
+            method,
+            url,
+            params={key: str(value) for key, value in params.items()},
+            headers=headers,
+            content=data.encode("utf-8") if data else None,
+        )
+        return HttpxResponse(self.client.send(request, stream=stream))
+
+    def close(self):
+        self.client.close()
+
+
+def create_transport(name: TransportName) -> Transport:
+    if name == "http1":
+        return RequestsTransport()
+    if name == "http2":
+        return HttpxTransport(http2=True)
+    raise ValueError(f"Unknown transport: {name}")
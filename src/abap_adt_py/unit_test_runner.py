@@ -0,0 +1,135 @@
+import time
+
+from .adt_client import AdtClient
+from .api.unittest import UnitTestAlert, UnittestFlags
+from .compat_typing import Dict, List, Optional, TypedDict, Union
+from .package_tree import collect_package_objects, package_uri
+from .session_pool import SessionPool
+
+TESTABLE_TYPES = ["CLAS/OC", "PROG/P", "FUGR/F"]
+
+
+class UnitTestShard(TypedDict):
+    index: int
+    object_uris: List[str]
+    alerts: List[UnitTestAlert]
+    duration: float
+    error: Optional[str]
+
+
+class ShardedUnitTestRun(TypedDict):
+    alerts: List[UnitTestAlert]
+    shards: List[UnitTestShard]
+    duration: float
+
+
+def shard_object_uris(
+    object_uris: List[str], shards: int, weights: Optional[Dict[str, float]] = None
+) -> List[List[str]]:
+    """Splits objects into at most ``shards`` lists of similar total weight.
+
+    Objects without a weight count as the average known weight, or 1.0.
+    """
+    if shards < 1:
+        raise ValueError("shards must be at least 1")
+    weights = weights or {}
+    default_weight = sum(weights.values()) / len(weights) if weights else 1.0
+    object_uris = list(dict.fromkeys(object_uris))
+
+    buckets: List[List[str]] = [[] for _ in range(min(shards, len(object_uris)))]
+    loads = [0.0] * len(buckets)
+    for object_uri in sorted(
+        object_uris, key=lambda uri: weights.get(uri, default_weight), reverse=True
+    ):
+        index = loads.index(min(loads))
+        buckets[index].append(object_uri)
+        loads[index] += weights.get(object_uri, default_weight)
+    return buckets
+
+
+def shard_weights(run: ShardedUnitTestRun) -> Dict[str, float]:
+    """Estimates per-object durations from a run, to balance the shards of the next one."""
+    weights = {}
+    for shard in run["shards"]:
+        if shard["error"] is None and shard["object_uris"]:
+            duration = shard["duration"] / len(shard["object_uris"])
+            for object_uri in shard["object_uris"]:
+                weights[object_uri] = duration
+    return weights
+
+
+def testable_objects(
+    adt_client: AdtClient, packages: Union[str, List[str]], max_workers: int = 8
+) -> List[str]:
+    if isinstance(packages, str):
+        packages = [packages]
+    objects = collect_package_objects(
+        adt_client, packages, TESTABLE_TYPES, max_workers=max_workers
+    )
+    return [package_object["node"]["object_uri"] for package_object in objects]
+
+
+def run_unit_tests_sharded(
+    pool: SessionPool,
+    object_uris: List[str],
+    shards: Optional[int] = None,
+    unit_test_flags: UnittestFlags = UnittestFlags(),
+    weights: Optional[Dict[str, float]] = None,
+) -> ShardedUnitTestRun:
+    """Runs the tests of the objects in parallel test runs, one session per shard.
+
+    A failing shard is reported with its error, the alerts of the other shards
+    are still merged.
+    """
+    started = time.perf_counter()
+    shard_lists = shard_object_uris(object_uris, shards or pool.size, weights)
+
+    def run_shard(adt_client: AdtClient, index: int) -> UnitTestShard:
+        shard: UnitTestShard = {
+            "index": index,
+            "object_uris": shard_lists[index],
+            "alerts": [],
+            "duration": 0.0,
+            "error": None,
+        }
+        shard_started = time.perf_counter()
+        try:
+            shard["alerts"] = adt_client.run_unit_tests(
+                shard_lists[index], unit_test_flags
+            )
+        except Exception as exception:
+            shard["error"] = str(exception)
+        shard["duration"] = time.perf_counter() - shard_started
+        return shard
+
+    results = pool.map(
+        run_shard, range(len(shard_lists)), max_workers=max(1, len(shard_lists))
+    )
+    return {
+        "alerts": [alert for shard in results for alert in shard["alerts"]],
+        "shards": results,
+        "duration": time.perf_counter() - started,
+    }
+
+
+def run_package_unit_tests(
+    pool: SessionPool,
+    packages: Union[str, List[str]],
+    shards: Optional[int] = None,
+    unit_test_flags: UnittestFlags = UnittestFlags(),
+    weights: Optional[Dict[str, float]] = None,
+) -> ShardedUnitTestRun:
+    """Runs the tests of packages and their subpackages.
+
+    With a single shard the packages are submitted as one test run, otherwise
+    their testable objects are listed and spread over the shards.
+    """
+    if isinstance(packages, str):
+        packages = [packages]
+    if (shards or pool.size) == 1:
+        return run_unit_tests_sharded(
+            pool, [package_uri(package) for package in packages], 1, unit_test_flags
+        )
+    with pool.lease() as adt_client:
+        object_uris = testable_objects(adt_client, packages)
+    return run_unit_tests_sharded(pool, object_uris, shards, unit_test_flags, weights)
@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from .api.usages import UsageReference
+from .compat_typing import List, Optional, Tuple, TypedDict
+
+UsageCacheKey = Tuple[str, str]
+
+
+class UsageCacheStats(TypedDict):
+    hits: int
+    misses: int
+
+
+class UsageCache:
+    """TTL and size bounded cache of usage references per (system, object uri).
+
+    With a ``path`` the entries are read from that JSON file on creation and
+    written back by ``save``, so later impact analyses reuse an earlier crawl.
+    Where-used lists change whenever another object changes, the TTL bounds
+    how stale they get.
+    """
+
+    def __init__(
+        self, ttl: float = 3600.0, max_entries: int = 100000, path: Optional[str] = None
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+        self._entries: "OrderedDict[UsageCacheKey, Tuple[float, List[UsageReference]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if path is not None and os.path.exists(path):
+            self._load(path)
+
+    def _load(self, path: str):
+        with open(path, "r", encoding="utf-8") as file:
+            entries = json.load(file)
+        now = time.time()
+        for system, object_uri, stored, references in entries:
+            if stored + self.ttl >= now:
+                self._remember((system, object_uri.lower()), stored, references)
+
+    def _remember(
+        self, key: UsageCacheKey, stored: float, references: List[UsageReference]
+    ):
+        self._entries[key] = (stored, references)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, system: str, object_uri: str) -> Optional[List[UsageReference]]:
+        key = (system, object_uri.lower())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] + self.ttl < time.time():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return [dict(reference) for reference in entry[1]]
+
+    def put(self, system: str, object_uri: str, references: List[UsageReference]):
+        with self._lock:
+            self._remember(
+                (system, object_uri.lower()),
+                time.time(),
+                [dict(reference) for reference in references],
+            )
+
+    def invalidate(self, system: str, object_uri: str):
+        with self._lock:
+            self._entries.pop((system, object_uri.lower()), None)
+
+    def save(self):
+        if self.path is None:
+            raise ValueError("UsageCache has no path to save to")
+        with self._lock:
+            entries = [
+                [system, object_uri, stored, references]
+                for (system, object_uri), (stored, references) in self._entries.items()
+            ]
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(entries, file)
+        os.replace(temporary_path, self.path)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> UsageCacheStats:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,238 @@
+import json
+import os
+import threading
+import time
+
+from .api.activate import ActivationResult
+from .api.syntax import SyntaxCheckResult
+from .api.usages import main_object_uri
+from .compat_typing import Callable, Dict, List, Optional, Tuple, TypedDict
+from .mirror import MANIFEST_FILE_NAME, SOURCE_FILE_EXTENSION, path_to_source_uri
+from .session_pool import SessionPool
+from .source_sync import SourceWrite, source_object_name, sync_object_sources
+
+FileVersion = Tuple[int, int]
+
+
+class WatchBatch(TypedDict):
+    paths: List[str]
+    written: List[str]
+    unchanged: List[str]
+    failed: Dict[str, str]
+    syntax_messages: Dict[str, List[SyntaxCheckResult]]
+    activation: List[ActivationResult]
+    latencies: Dict[str, float]
+    duration: float
+
+
+class SourceWatcher:
+    """Pushes files saved in a mirror directory to the server in debounced batches.
+
+    Files are mapped to source uris through the PackageMirror manifest, other
+    ``.abap`` files through their path. A batch starts once no file changed for
+    ``debounce`` seconds, or ``max_delay`` seconds after its first change. The
+    changed sources of a batch are written concurrently, then checked with one
+    syntax check and activated with one activation request. ``latencies`` holds
+    the seconds from saving each file to the end of its batch. Files whose
+    write failed go with the next batch, or on their own after
+    ``retry_delay`` seconds.
+
+    Watching starts from the modification time and size of the files, only
+    files saved afterwards are read and pushed. Resync the mirror first when
+    the files may not match the server. The first save of a file is compared
+    with the inactive server version, later saves with the last written one.
+    """
+
+    def __init__(
+        self,
+        pool: SessionPool,
+        directory: str,
+        debounce: float = 0.5,
+        poll_interval: float = 0.2,
+        max_delay: float = 5.0,
+        retry_delay: float = 5.0,
+        activate: bool = True,
+        syntax_check: bool = True,
+        on_batch: Optional[Callable[[WatchBatch], None]] = None,
+    ):
+        self.pool = pool
+        self.directory = directory
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.max_delay = max_delay
+        self.retry_delay = retry_delay
+        self.activate = activate
+        self.syntax_check = syntax_check
+        self.on_batch = on_batch
+        self._stop = threading.Event()
+        self._versions = self._scan()
+        self._changed: Dict[str, float] = {}
+        self._first_change = 0.0
+        self._last_change = 0.0
+        self._retry: Dict[str, float] = {}
+        self._retry_at = 0.0
+        # filled by the writes, a large mirror is not read when watching starts
+        self._digests: Dict[str, str] = {}
+
+    def _load_manifest(self) -> Dict[str, SourceWrite]:
+        try:
+            with open(
+                os.path.join(self.directory, MANIFEST_FILE_NAME), "r", encoding="utf-8"
+            ) as file:
+                sources = json.load(file).get("sources", {})
+        except (OSError, ValueError):
+            return {}
+        return {
+            os.path.normpath(mirrored["path"]): {
+                "object_uri": mirrored["object_uri"],
+                "source_uri": source_uri,
+                "source": "",
+                "object_name": mirrored["object_name"],
+            }
+            for source_uri, mirrored in sources.items()
+        }
+
+    def _source_write(
+        self, relative_path: str, source: str, manifest: Dict[str, SourceWrite]
+    ) -> SourceWrite:
+        known = manifest.get(os.path.normpath(relative_path))
+        if known is not None:
+            return {**known, "source": source}
+        source_uri = path_to_source_uri(relative_path)
+        return {
+            "object_uri": main_object_uri(source_uri),
+            "source_uri": source_uri,
+            "source": source,
+        }
+
+    def _scan(self) -> Dict[str, FileVersion]:
+        versions: Dict[str, FileVersion] = {}
+        for root, _, file_names in os.walk(self.directory):
+            for file_name in file_names:
+                if not file_name.endswith(SOURCE_FILE_EXTENSION):
+                    continue
+                path = os.path.join(root, file_name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                versions[os.path.relpath(path, self.directory)] = (
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                )
+        return versions
+
+    def _read(self, relative_path: str) -> Optional[str]:
+        try:
+            with open(
+                os.path.join(self.directory, relative_path), "r", encoding="utf-8", newline=""
+            ) as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def poll(self) -> Optional[WatchBatch]:
+        """Scans the directory once and pushes a batch when its debounce window closed."""
+        now = time.monotonic()
+        versions = self._scan()
+        for relative_path, version in versions.items():
+            if self._versions.get(relative_path) != version:
+                if not self._changed:
+                    self._first_change = now
+                self._changed[relative_path] = version[0] / 1e9
+                self._last_change = now
+        self._versions = versions
+
+        if not self._changed:
+            if self._retry and now >= self._retry_at:
+                retry, self._retry = self._retry, {}
+                return self.push(retry)
+            return None
+        if (
+            now - self._last_change < self.debounce
+            and now - self._first_change < self.max_delay
+        ):
+            return None
+        saved_at, self._changed = self._changed, {}
+        saved_at = {**self._retry, **saved_at}
+        self._retry = {}
+        return self.push(saved_at)
+
+    def push(self, saved_at: Dict[str, float]) -> WatchBatch:
+        """Writes, checks and activates the files, keyed by path with their save time."""
+        started = time.perf_counter()
+        manifest = self._load_manifest()
+        writes: List[SourceWrite] = []
+        paths: Dict[str, str] = {}
+        for relative_path in saved_at:
+            source = self._read(relative_path)
+            # deleted files are not deleted on the server
+            if source is not None:
+                write = self._source_write(relative_path, source, manifest)
+                writes.append(write)
+                paths[write["source_uri"]] = relative_path
+
+        # updates the digests of the written sources
+        result = sync_object_sources(
+            self.pool, writes, activate=False, known_digests=self._digests
+        )
+        written_uris = set(result["written"])
+        written = [write for write in writes if write["source_uri"] in written_uris]
+        for source_uri in result["failed"]:
+            self._retry[paths[source_uri]] = saved_at[paths[source_uri]]
+        if result["failed"]:
+            self._retry_at = time.monotonic() + self.retry_delay
+
+        batch: WatchBatch = {
+            "paths": sorted(saved_at),
+            "written": result["written"],
+            "unchanged": result["unchanged"],
+            "failed": result["failed"],
+            "syntax_messages": {},
+            "activation": [],
+            "latencies": {},
+            "duration": 0.0,
+        }
+        if written and (self.syntax_check or self.activate):
+            objects = {write["object_uri"]: source_object_name(write) for write in written}
+            try:
+                with self.pool.lease() as adt_client:
+                    if self.syntax_check:
+                        batch["syntax_messages"] = adt_client.syntax_check_many(
+                            [
+                                (write["object_uri"], write["source_uri"], write["source"], "inactive")
+                                for write in written
+                            ]
+                        )
+                    if self.activate:
+                        batch["activation"] = adt_client.activate_many(
+                            [(object_name, object_uri) for object_uri, object_name in objects.items()]
+                        )
+            except Exception as exception:
+                # the sources are written, a failed check or activation must not stop watching
+                for object_uri in objects:
+                    batch["failed"][object_uri] = str(exception)
+
+        finished = time.time()
+        batch["latencies"] = {
+            relative_path: max(finished - saved, 0.0)
+            for relative_path, saved in saved_at.items()
+        }
+        batch["duration"] = time.perf_counter() - started
+        return batch
+
+    def run(self, max_batches: Optional[int] = None):
+        """Polls until stop is called, passing every batch to on_batch."""
+        batches = 0
+        while not self._stop.is_set():
+            batch = self.poll()
+            if batch is not None:
+                if self.on_batch is not None:
+                    self.on_batch(batch)
+                batches += 1
+                if max_batches is not None and batches >= max_batches:
+                    return
+            self._stop.wait(self.poll_interval)
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,304 @@
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from abap_adt_py.adt_client import AdtClient
+from abap_adt_py.async_adt_client import AsyncAdtClient
+from abap_adt_py.concurrency import AimdLimiter, GradientLimiter, RequestThrottle
+from abap_adt_py.mirror import PackageMirror
+from abap_adt_py.session_pool import SessionPool
+from abap_adt_py.source_sync import sync_object_sources
+from abap_adt_py.unit_test_runner import run_package_unit_tests
+from mock_adt_server import MockAdtConfig, MockAdtProcess
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class BenchmarkResult:
+    def __init__(self, name, calls, elapsed, latencies, peak_memory):
+        self.name = name
+        self.calls = calls
+        self.elapsed = elapsed
+        self.latencies = latencies
+        self.peak_memory = peak_memory
+
+    def row(self):
+        latencies_ms = [latency * 1000 for latency in self.latencies] or [0.0]
+        return (
+            f"{self.name:<32} {self.calls:>7} {self.calls / self.elapsed:>10.1f} "
+            f"{statistics.median(latencies_ms):>9.2f} {percentile(latencies_ms, 0.99):>9.2f} "
+            + (f"{self.peak_memory / 1024:>10.1f}" if self.peak_memory is not None else f"{'-':>10}")
+        )
+
+
+HEADER = (
+    f"{'operation':<32} {'calls':>7} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'peak KiB':>10}"
+)
+
+
+# tracemalloc slows every allocation down, so memory is only traced on request
+TRACE_MEMORY = False
+
+
+def _start_tracing():
+    if TRACE_MEMORY:
+        tracemalloc.start()
+
+
+def _stop_tracing():
+    if not TRACE_MEMORY:
+        return None
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak_memory
+
+
+def measure(name, iterations, operation):
+    latencies = []
+    _start_tracing()
+    started = time.perf_counter()
+    for index in range(iterations):
+        call_started = time.perf_counter()
+        operation(index)
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    return BenchmarkResult(name, iterations, elapsed, latencies, _stop_tracing())
+
+
+def measure_bulk(name, calls, workflow):
+    _start_tracing()
+    started = time.perf_counter()
+    latencies = workflow() or []
+    elapsed = time.perf_counter() - started
+    return BenchmarkResult(name, calls, elapsed, latencies, _stop_tracing())
+
+
+def program_uri(index, object_count, package):
+    return f"/sap/bc/adt/programs/programs/{package.lower()}_prog_{index % object_count}"
+
+
+def class_uri(index, object_count, package):
+    return f"/sap/bc/adt/oo/classes/zcl_{package.lower()}_{index % object_count}"
+
+
+def single_operations(client: AdtClient, iterations: int, config: MockAdtConfig):
+    count, package = config.object_count, config.package
+    source = "REPORT z_bench.\nWRITE 'benchmark'."
+
+    def lock_edit_unlock(index):
+        uri = program_uri(index, count, package)
+        lock_handle = client.lock(uri)
+        client.set_object_source(f"{uri}/source/main", source, lock_handle)
+        client.unlock(uri, lock_handle)
+
+    operations = {
+        "login": lambda index: client.login(),
+        "search_object": lambda index: client.search_object(f"{package}*", 50),
+        "get_object_source": lambda index: client.get_object_source(
+            f"{program_uri(index, count, package)}/source/main"
+        ),
+        "lock+set_object_source+unlock": lock_edit_unlock,
+        "activate": lambda index: client.activate(
+            f"{package}_PROG_{index % count}", program_uri(index, count, package)
+        ),
+        "syntax_check": lambda index: client.syntax_check(
+            program_uri(index, count, package),
+            f"{program_uri(index, count, package)}/source/main",
+            source,
+        ),
+        "run_unit_test": lambda index: client.run_unit_test(class_uri(index, count, package)),
+        "object_structure": lambda index: client.object_structure(
+            class_uri(index, count, package)
+        ),
+        "prettyprint": lambda index: client.prettyprint(source),
+    }
+    return [measure(name, iterations, operation) for name, operation in operations.items()]
+
+
+def create_throttle(name: str):
+    if name == "aimd":
+        return RequestThrottle(AimdLimiter())
+    if name == "gradient":
+        return RequestThrottle(GradientLimiter())
+    return None
+
+
+def bulk_workflows(
+    url: str,
+    iterations: int,
+    concurrency: int,
+    config: MockAdtConfig,
+    transport: str,
+    throttle: str = "none",
+):
+    count, package = config.object_count, config.package
+    credentials = (url, "DEVELOPER", "password", "001", "EN")
+    # one throttle for all clients, it bounds the load on the whole system
+    options = {"transport": transport, "throttle": create_throttle(throttle)}
+    results = []
+
+    async def async_sources():
+        latencies = []
+        async with AsyncAdtClient(*credentials, max_concurrency=concurrency, **options) as client:
+            await client.login()
+
+            async def timed(index):
+                started = time.perf_counter()
+                await client.get_object_source(f"{program_uri(index, count, package)}/source/main")
+                latencies.append(time.perf_counter() - started)
+
+            await asyncio.gather(*(timed(index) for index in range(iterations)))
+        return latencies
+
+    results.append(
+        measure_bulk(
+            f"async get_object_source x{concurrency}",
+            iterations,
+            lambda: asyncio.run(async_sources()),
+        )
+    )
+
+    def pooled_edit():
+        latencies = []
+
+        def edit(client, index):
+            started = time.perf_counter()
+            uri = program_uri(index, count, package)
+            lock_handle = client.lock(uri)
+            client.set_object_source(f"{uri}/source/main", "REPORT z_bench.", lock_handle)
+            client.unlock(uri, lock_handle)
+            latencies.append(time.perf_counter() - started)
+
+        with SessionPool(*credentials, size=min(concurrency, count), **options) as pool:
+            pool.map(edit, range(min(iterations, count)))
+        return latencies
+
+    results.append(measure_bulk("pooled lock/edit/unlock", min(iterations, count), pooled_edit))
+
+    client = AdtClient(*credentials, **options)
+    client.login()
+    objects = [
+        (f"{package}_PROG_{index}", program_uri(index, count, package)) for index in range(count)
+    ]
+
+    def activate_many():
+        started = time.perf_counter()
+        client.activate_many(objects)
+        return [time.perf_counter() - started]
+
+    results.append(measure_bulk("activate_many", len(objects), activate_many))
+
+    def mirror():
+        with tempfile.TemporaryDirectory() as directory:
+            package_mirror = PackageMirror(client, directory, max_workers=concurrency)
+            package_mirror.sync(package)
+            started = time.perf_counter()
+            package_mirror.sync(package)
+            return [time.perf_counter() - started]
+
+    results.append(measure_bulk("mirror sync + resync", 2, mirror))
+
+    def sync_unchanged():
+        writes = []
+        for index in range(count):
+            uri = program_uri(index, count, package)
+            source = client.get_object_source(f"{uri}/source/main")
+            writes.append({"object_uri": uri, "source_uri": f"{uri}/source/main", "source": source})
+        started = time.perf_counter()
+        with SessionPool(*credentials, size=min(concurrency, count), **options) as pool:
+            sync_object_sources(pool, writes)
+        return [time.perf_counter() - started]
+
+    results.append(measure_bulk("sync unchanged sources", count, sync_unchanged))
+
+    def sharded_unit_tests():
+        with SessionPool(*credentials, size=min(concurrency, count), **options) as pool:
+            run = run_package_unit_tests(pool, package)
+        return [shard["duration"] for shard in run["shards"]]
+
+    results.append(measure_bulk("sharded package unit tests", count, sharded_unit_tests))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput benchmarks for abap-adt-py.")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.0, help="server latency in seconds")
+    parser.add_argument("--objects", type=int, default=50)
+    parser.add_argument("--source-lines", type=int, default=200)
+    parser.add_argument("--search-results", type=int, default=50)
+    parser.add_argument("--alerts", type=int, default=5)
+    parser.add_argument("--components", type=int, default=20)
+    parser.add_argument(
+        "--test-duration", type=float, default=0.0, help="server time per tested class"
+    )
+    parser.add_argument(
+        "--transport",
+        choices=["http1", "http2"],
+        default="http1",
+        help="http2 needs the http2 extra, the mock server itself only speaks HTTP/1.1",
+    )
+    parser.add_argument(
+        "--work-processes",
+        type=int,
+        default=0,
+        help="parallel requests the server handles before queueing, 0 is unlimited",
+    )
+    parser.add_argument(
+        "--throttle",
+        choices=["none", "aimd", "gradient"],
+        default="none",
+        help="adaptive concurrency limit for the bulk workflows",
+    )
+    parser.add_argument(
+        "--memory", action="store_true", help="trace peak memory (slows down the client)"
+    )
+    arguments = parser.parse_args()
+
+    global TRACE_MEMORY
+    TRACE_MEMORY = arguments.memory
+
+    config = MockAdtConfig(
+        latency=arguments.latency,
+        object_count=arguments.objects,
+        source_lines=arguments.source_lines,
+        search_results=arguments.search_results,
+        unit_test_alerts=arguments.alerts,
+        structure_components=arguments.components,
+        unit_test_duration=arguments.test_duration,
+        work_processes=arguments.work_processes,
+    )
+    server = MockAdtProcess(config)
+    url = server.start()
+    try:
+        client = AdtClient(
+            url, "DEVELOPER", "password", "001", "EN", transport=arguments.transport
+        )
+        client.login()
+        results = single_operations(client, arguments.iterations, config)
+        results += bulk_workflows(
+            url,
+            arguments.iterations,
+            arguments.concurrency,
+            config,
+            arguments.transport,
+            arguments.throttle,
+        )
+    finally:
+        server.stop()
+
+    print(HEADER)
+    for result in results:
+        print(result.row())
+
+
+if __name__ == "__main__":
+    main()
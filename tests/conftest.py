@@ -0,0 +1,29 @@
+import pytest
+
+from abap_adt_py.adt_client import AdtClient
+from abap_adt_py.session_pool import SessionPool
+from mock_adt_server import MockAdtConfig, MockAdtServer
+
+CREDENTIALS = ("DEVELOPER", "password", "001", "EN")
+
+
+@pytest.fixture
+def mock_server():
+    server = MockAdtServer(MockAdtConfig(object_count=6, source_lines=5, search_results=50))
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client(mock_server):
+    adt_client = AdtClient(mock_server.url, *CREDENTIALS)
+    adt_client.login()
+    yield adt_client
+    adt_client.transport.close()
+
+
+@pytest.fixture
+def pool(mock_server):
+    with SessionPool(mock_server.url, *CREDENTIALS, size=4) as session_pool:
+        yield session_pool
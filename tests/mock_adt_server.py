@@ -0,0 +1,595 @@
+import argparse
+import base64
+import multiprocessing
+import re
+import threading
+import time
+import uuid
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+ADT = "/sap/bc/adt"
+COLLECTIONS = {
+    f"{ADT}/programs/programs": "PROG/P",
+    f"{ADT}/programs/includes": "PROG/I",
+    f"{ADT}/oo/classes": "CLAS/OC",
+    f"{ADT}/oo/interfaces": "INTF/OI",
+    f"{ADT}/functions/groups": "FUGR/F",
+    f"{ADT}/ddic/ddl/sources": "DDLS/DF",
+    f"{ADT}/ddic/dataelements": "DTEL/DE",
+    f"{ADT}/ddic/tables": "TABL/DT",
+    f"{ADT}/ddic/ddlx/sources": "DDLX/EX",
+    f"{ADT}/acm/dcl/sources": "DCLS/DL",
+    f"{ADT}/messageclass": "MSAG/N",
+    f"{ADT}/packages": "DEVC/K",
+}
+CLASS_INCLUDES = ["definitions", "implementations", "macros", "testclasses"]
+
+
+class MockAdtConfig:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        object_count: int = 20,
+        source_lines: int = 200,
+        search_results: int = 50,
+        syntax_messages: int = 5,
+        unit_test_alerts: int = 5,
+        structure_components: int = 20,
+        unit_test_duration: float = 0.0,
+        work_processes: int = 0,
+        package: str = "ZMOCK",
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.object_count = object_count
+        self.source_lines = source_lines
+        self.search_results = search_results
+        self.syntax_messages = syntax_messages
+        self.unit_test_alerts = unit_test_alerts
+        self.structure_components = structure_components
+        self.unit_test_duration = unit_test_duration
+        # requests wait for one of this many work processes, 0 is unlimited;
+        # when as many requests are queued again the rest gets 503
+        self.work_processes = work_processes
+        self.package = package
+
+
+class MockObject:
+    def __init__(self, object_type: str, name: str, uri: str, package: str):
+        self.object_type = object_type
+        self.name = name
+        self.uri = uri
+        self.package = package
+        self.lock_handle = None
+        # the session holding the lock, its logoff releases the lock
+        self.lock_session = None
+        self.inactive = False
+        self.sources = {}
+
+
+class MockAdtState:
+    def __init__(self, config: MockAdtConfig):
+        self.config = config
+        self.lock = threading.Lock()
+        self.csrf_tokens = set()
+        self.objects = {}
+        self.versions = {}
+        self.request_count = 0
+        self.in_flight = 0
+        self.rejected_count = 0
+        self.work_process_slots = threading.Semaphore(max(config.work_processes, 1))
+        self._populate()
+
+    def _source(self, name: str) -> str:
+        lines = [f"REPORT {name.lower()}."]
+        lines += [f"WRITE / 'line {i}'." for i in range(self.config.source_lines)]
+        return "\n".join(lines)
+
+    def add_object(self, object_type: str, name: str, package: str) -> MockObject:
+        collection = next(
+            path for path, path_type in COLLECTIONS.items() if path_type == object_type
+        )
+        uri = f"{collection}/{name.lower()}"
+        mock_object = MockObject(object_type, name.upper(), uri, package.upper())
+        if object_type not in ["DEVC/K", "DTEL/DE", "FUGR/F", "MSAG/N"]:
+            mock_object.sources[f"{uri}/source/main"] = self._source(name)
+        if object_type == "CLAS/OC":
+            for include in CLASS_INCLUDES:
+                mock_object.sources[f"{uri}/includes/{include}"] = f"* {include}"
+        self.objects[uri] = mock_object
+        for source_uri in mock_object.sources:
+            self.versions[source_uri] = 1
+        return mock_object
+
+    def _populate(self):
+        package = self.config.package
+        self.add_object("DEVC/K", package, "$TMP")
+        self.add_object("DEVC/K", f"{package}_SUB", package)
+        for index in range(self.config.object_count):
+            owner = package if index % 2 == 0 else f"{package}_SUB"
+            self.add_object("PROG/P", f"{package}_PROG_{index}", owner)
+            self.add_object("CLAS/OC", f"ZCL_{package}_{index}", owner)
+
+    def find_object(self, path: str):
+        path = path.lower()
+        candidates = [uri for uri in self.objects if path == uri or path.startswith(uri + "/")]
+        if not candidates:
+            return None
+        return self.objects[max(candidates, key=len)]
+
+
+class MockAdtHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "MockAdtServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def state(self) -> MockAdtState:
+        return self.server.state
+
+    def _send(self, status: int, body: str = "", headers: dict = None, content_type="application/xml"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self) -> str:
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        return self.rfile.read(length).decode("utf-8") if length else ""
+
+    def _handle(self, method: str):
+        config = self.state.config
+        with self.state.lock:
+            self.state.in_flight += 1
+            overloaded = 0 < 2 * config.work_processes < self.state.in_flight
+            if overloaded:
+                self.state.rejected_count += 1
+        try:
+            if overloaded:
+                self._read_body()
+                return self._send(503, "No free work process", content_type="text/plain")
+            if not config.work_processes:
+                return self._handle_request(method)
+            with self.state.work_process_slots:
+                return self._handle_request(method)
+        finally:
+            with self.state.lock:
+                self.state.in_flight -= 1
+
+    def _handle_request(self, method: str):
+        config = self.state.config
+        if config.latency or config.jitter:
+            time.sleep(config.latency + config.jitter * (uuid.uuid4().int % 1000) / 1000)
+        with self.state.lock:
+            self.state.request_count += 1
+
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        body = self._read_body()
+        path = url.path
+
+        if path == f"{ADT}/compatibility/graph":
+            return self._login()
+        if method != "GET" and self.headers.get("x-csrf-token") not in self.state.csrf_tokens:
+            return self._send(
+                403, "CSRF token validation failed", {"x-csrf-token": "Required"}, "text/plain"
+            )
+
+        if path == f"{ADT}/abapunit/testruns":
+            # simulated test time must not hold the state lock
+            return self._unit_test_run(body)
+        with self.state.lock:
+            return self._route(method, path, query, body)
+
+    def _route(self, method: str, path: str, query: dict, body: str):
+        if path == "/sap/public/bc/icf/logoff":
+            return self._logoff()
+        if path == f"{ADT}/repository/informationsystem/search":
+            return self._search(query)
+        if path == f"{ADT}/repository/nodestructure":
+            return self._node_structure(query)
+        if path == f"{ADT}/repository/informationsystem/usageReferences":
+            return self._usage_references(query)
+        if path == f"{ADT}/activation":
+            return self._activate(body)
+        if path == f"{ADT}/activation/inactiveobjects":
+            return self._inactive_objects()
+        if path == f"{ADT}/checkruns":
+            return self._check_run(body)
+        if path == f"{ADT}/abapsource/prettyprinter/settings":
+            return self._send(200)
+        if path == f"{ADT}/abapsource/prettyprinter":
+            return self._send(200, body.upper(), content_type="text/plain")
+        if method == "POST" and (path.lower() in COLLECTIONS or path.endswith("/fmodules")):
+            return self._create(path, body)
+        if method == "POST" and path.endswith("/includes"):
+            return self._send(200)
+        if path.endswith("/objectstructure"):
+            return self._object_structure(path[: -len("/objectstructure")])
+
+        mock_object = self.state.find_object(path)
+        if mock_object is None:
+            return self._send(404, f"Resource {path} does not exist", content_type="text/plain")
+        if method == "POST" and query.get("_action") == "LOCK":
+            return self._lock(mock_object)
+        if method == "POST" and query.get("_action") == "UNLOCK":
+            mock_object.lock_handle = None
+            mock_object.lock_session = None
+            return self._send(200)
+        if method == "DELETE":
+            return self._delete(mock_object, query)
+        if method == "GET":
+            return self._get_source(mock_object, path)
+        if method == "PUT":
+            return self._put_source(mock_object, path, query, body)
+        return self._send(405)
+
+    def _session_id(self):
+        cookies = SimpleCookie(self.headers.get("Cookie", ""))
+        session = cookies.get("SAP_SESSIONID_MCK_001")
+        return session.value if session is not None else None
+
+    def _logoff(self):
+        session_id = self._session_id()
+        for mock_object in self.state.objects.values():
+            if session_id is not None and mock_object.lock_session == session_id:
+                mock_object.lock_handle = None
+                mock_object.lock_session = None
+        self._send(200)
+
+    def _login(self):
+        token = uuid.uuid4().hex
+        with self.state.lock:
+            self.state.csrf_tokens.add(token)
+        self._send(
+            200,
+            "<graph/>",
+            {"x-csrf-token": token, "Set-Cookie": f"SAP_SESSIONID_MCK_001={uuid.uuid4().hex}; path=/"},
+        )
+
+    def _search(self, query: dict):
+        pattern = re.escape(query.get("query", "*").upper()).replace("\\*", ".*")
+        max_results = int(query.get("maxResults", 1))
+        # in name order, like the repository information system
+        matches = sorted(
+            (
+                mock_object
+                for mock_object in self.state.objects.values()
+                if re.fullmatch(pattern, mock_object.name) or re.fullmatch(pattern + ".*", mock_object.name)
+            ),
+            key=lambda mock_object: mock_object.name,
+        )[: min(max_results, self.state.config.search_results)]
+        references = "".join(
+            f'<adtcore:objectReference adtcore:uri="{o.uri}" adtcore:type="{o.object_type}" '
+            f'adtcore:name="{o.name}" adtcore:packageName="{o.package}" adtcore:description="{o.name}"/>'
+            for o in matches
+        )
+        self._send(
+            200,
+            '<?xml version="1.0" encoding="utf-8"?><adtcore:objectReferences '
+            f'xmlns:adtcore="http://www.sap.com/adt/core">{references}</adtcore:objectReferences>',
+        )
+
+    def _node_structure(self, query: dict):
+        parent_type, parent_name = query.get("parent_type"), query.get("parent_name", "").upper()
+        if parent_type == "FUGR/F":
+            prefix = f"{ADT}/functions/groups/{parent_name.lower()}/fmodules/"
+            children = [o for o in self.state.objects.values() if o.uri.startswith(prefix)]
+        else:
+            children = [o for o in self.state.objects.values() if o.package == parent_name]
+        nodes = "".join(
+            "<SEU_ADT_REPOSITORY_OBJ_NODE>"
+            f"<OBJECT_TYPE>{o.object_type}</OBJECT_TYPE><OBJECT_NAME>{o.name}</OBJECT_NAME>"
+            f"<OBJECT_URI>{o.uri}</OBJECT_URI><DESCRIPTION>{o.name}</DESCRIPTION>"
+            "<EXPANDABLE>X</EXPANDABLE></SEU_ADT_REPOSITORY_OBJ_NODE>"
+            for o in children
+        )
+        self._send(
+            200,
+            '<?xml version="1.0" encoding="utf-8"?><asx:abap xmlns:asx="http://www.sap.com/abapxml" '
+            f'version="1.0"><asx:values><DATA><TREE_CONTENT>{nodes}</TREE_CONTENT></DATA></asx:values></asx:abap>',
+        )
+
+    def _usage_references(self, query: dict):
+        # object k of the source objects is used by the objects 2k+1 and 2k+2
+        used = self.state.find_object(query.get("uri", ""))
+        if used is None:
+            return self._send(404, "Object does not exist", content_type="text/plain")
+        source_objects = [o for o in self.state.objects.values() if o.sources]
+        index = source_objects.index(used) if used in source_objects else -1
+        users = source_objects[2 * index + 1 : 2 * index + 3] if index >= 0 else []
+        packages = "".join(
+            f'<usageReferences:referencedObject uri="{ADT}/packages/{package.lower()}" '
+            'isResult="false" canHaveChildren="true">'
+            f'<usageReferences:adtObject adtcore:name="{package}" adtcore:type="DEVC/K"/>'
+            "</usageReferences:referencedObject>"
+            for package in sorted({o.package for o in users})
+        )
+        results = "".join(
+            f'<usageReferences:referencedObject uri="{o.uri}/source/main#start=3,4" '
+            f'parentUri="{ADT}/packages/{o.package.lower()}" isResult="true" canHaveChildren="false" '
+            'usageInformation="gradeDirect,includeProductive">'
+            f'<usageReferences:adtObject adtcore:name="{o.name}" adtcore:type="{o.object_type}">'
+            f'<adtcore:packageRef adtcore:uri="{ADT}/packages/{o.package.lower()}" adtcore:name="{o.package}"/>'
+            "</usageReferences:adtObject></usageReferences:referencedObject>"
+            for o in users
+        )
+        self._send(
+            200,
+            '<?xml version="1.0" encoding="utf-8"?><usageReferences:usageReferenceResult '
+            'xmlns:usageReferences="http://www.sap.com/adt/ris/usageReferences" '
+            f'xmlns:adtcore="http://www.sap.com/adt/core" numberOfResults="{len(users)}">'
+            f"<usageReferences:referencedObjects>{packages}{results}</usageReferences:referencedObjects>"
+            "</usageReferences:usageReferenceResult>",
+        )
+
+    def _activate(self, body: str):
+        uris = re.findall(r'adtcore:uri="([^"]+)"', body)
+        for uri in uris:
+            mock_object = self.state.find_object(uri)
+            if mock_object is not None:
+                mock_object.inactive = False
+        self._send(
+            200,
+            '<?xml version="1.0" encoding="utf-8"?><chkl:messages xmlns:chkl="http://www.sap.com/abapxml/checklist">'
+            '<chkl:properties checkExecuted="true" activationExecuted="true" generationExecuted="true"/>'
+            "</chkl:messages>",
+        )
+
+    def _inactive_objects(self):
+        entries = "".join(
+            f'<ioc:entry><ioc:object ioc:user="DEVELOPER"><ioc:ref adtcore:uri="{o.uri}" '
+            f'adtcore:type="{o.object_type}" adtcore:name="{o.name}"/></ioc:object></ioc:entry>'
+            for o in self.state.objects.values()
+            if o.inactive
+        )
+        self._send(
+            200,
+            '<?xml version="1.0" encoding="utf-8"?><ioc:inactiveObjects '
+            'xmlns:ioc="http://www.sap.com/abapxml/inactiveCtsObjects" '
+            f'xmlns:adtcore="http://www.sap.com/adt/core">{entries}</ioc:inactiveObjects>',
+        )
+
+    def _check_run(self, body: str):
+        reports = []
+        for object_uri in re.findall(r'<chkrun:checkObject adtcore:uri="([^"]+)"', body):
+            messages = "".join(
+                f'<chkrun:checkMessage chkrun:uri="{object_uri}/source/main#start={i + 1},0" '
+                f'chkrun:type="W" chkrun:shortText="Mock message {i}"/>'
+                for i in range(self.state.config.syntax_messages)
+            )
+            reports.append(
+                f'<chkrun:checkReport chkrun:reporter="abapCheckRun" chkrun:triggeringUri="{object_uri}" '
+                f'chkrun:status="processed"><chkrun:checkMessageList>{messages}'
+                "</chkrun:checkMessageList></chkrun:checkReport>"
+            )
+        for content in re.findall(r"<chkrun:content>([^<]*)</chkrun:content>", body):
+            base64.b64decode(content)
+        self._send(
+            200,
+            '<?xml version="1.0" encoding="utf-8"?><chkrun:checkRunReports '
+            f'xmlns:chkrun="http://www.sap.com/adt/checkrun">{"".join(reports)}</chkrun:checkRunReports>',
+        )
+
+    def _tested_classes(self, body: str):
+        classes = []
+        for uri in re.findall(r'adtcore:uri="([^"]+)"', body):
+            mock_object = self.state.find_object(uri)
+            if mock_object is None:
+                continue
+            if mock_object.object_type == "DEVC/K":
+                packages = {mock_object.name}
+                for candidate in self.state.objects.values():
+                    if candidate.object_type == "DEVC/K" and candidate.package in packages:
+                        packages.add(candidate.name)
+                classes += [
+                    candidate
+                    for candidate in self.state.objects.values()
+                    if candidate.object_type == "CLAS/OC" and candidate.package in packages
+                ]
+            elif mock_object.object_type == "CLAS/OC":
+                classes.append(mock_object)
+        return list({mock_object.uri: mock_object for mock_object in classes}.values())
+
+    def _unit_test_run(self, body: str):
+        with self.state.lock:
+            classes = self._tested_classes(body)
+        time.sleep(self.state.config.unit_test_duration * len(classes))
+        programs = []
+        for mock_object in classes:
+            alerts = "".join(
+                f'<alert kind="failedAssertion" severity="critical"><title>{mock_object.name} alert {i}</title>'
+                f'<details><detail text="Expected {i}"><details><detail text="Actual {i + 1}"/></details></detail></details>'
+                f'<stack><stackEntry adtcore:uri="{mock_object.uri}/source/main#start=1,0" '
+                'xmlns:adtcore="http://www.sap.com/adt/core"/></stack></alert>'
+                for i in range(self.state.config.unit_test_alerts)
+            )
+            programs.append(
+                f'<program adtcore:uri="{mock_object.uri}" adtcore:name="{mock_object.name}" '
+                'xmlns:adtcore="http://www.sap.com/adt/core"><testClasses>'
+                '<testClass name="LTCL_MOCK"><testMethods><testMethod name="TEST">'
+                f"<alerts>{alerts}</alerts></testMethod></testMethods></testClass></testClasses></program>"
+            )
+        self._send(
+            200,
+            '<?xml version="1.0" encoding="utf-8"?><aunit:runResult xmlns:aunit="http://www.sap.com/adt/aunit">'
+            + "".join(programs)
+            + "</aunit:runResult>",
+        )
+
+    def _object_structure(self, object_uri: str):
+        mock_object = self.state.find_object(object_uri)
+        if mock_object is None:
+            return self._send(404)
+        includes = "".join(
+            f'<atom:link rel="http://www.sap.com/adt/relations/source" href="{uri}"/>'
+            for uri in mock_object.sources
+        )
+        components = "".join(
+            f'<abapsource:objectStructureElement adtcore:name="METHOD_{i}" adtcore:type="CLAS/OM" '
+            f'visibility="public" clif_name="{mock_object.name}" level="instance">'
+            f'<atom:link rel="http://www.sap.com/adt/relations/source/definitionIdentifier" '
+            f'href="{mock_object.uri}/source/main#start={i + 1},0"/></abapsource:objectStructureElement>'
+            for i in range(self.state.config.structure_components)
+        )
+        self._send(
+            200,
+            '<?xml version="1.0" encoding="utf-8"?><abapsource:objectStructureElement '
+            'xmlns:abapsource="http://www.sap.com/adt/abapsource" xmlns:adtcore="http://www.sap.com/adt/core" '
+            f'xmlns:atom="http://www.w3.org/2005/Atom" adtcore:name="{mock_object.name}" '
+            f'adtcore:type="{mock_object.object_type}" visibility="public" final="true" '
+            f'xml:base="{mock_object.uri}">{includes}{components}</abapsource:objectStructureElement>',
+        )
+
+    def _lock(self, mock_object: MockObject):
+        if mock_object.lock_handle is not None:
+            return self._send(403, f"{mock_object.name} is locked", content_type="text/plain")
+        mock_object.lock_handle = uuid.uuid4().hex
+        mock_object.lock_session = self._session_id()
+        self._send(
+            200,
+            '<?xml version="1.0" encoding="utf-8"?><asx:abap xmlns:asx="http://www.sap.com/abapxml" version="1.0">'
+            f"<asx:values><DATA><LOCK_HANDLE>{mock_object.lock_handle}</LOCK_HANDLE>"
+            "<CORRNR/><IS_LOCAL>X</IS_LOCAL></DATA></asx:values></asx:abap>",
+        )
+
+    def _get_source(self, mock_object: MockObject, path: str):
+        source = mock_object.sources.get(path.lower())
+        if source is None:
+            return self._send(404, f"Resource {path} does not exist", content_type="text/plain")
+        etag = f'"{self.state.versions[path.lower()]}"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, headers={"ETag": etag})
+        self._send(200, source, {"ETag": etag}, "text/plain; charset=utf-8")
+
+    def _put_source(self, mock_object: MockObject, path: str, query: dict, body: str):
+        if mock_object.lock_handle is None or query.get("lockHandle") != mock_object.lock_handle:
+            return self._send(423, "Invalid lock handle", content_type="text/plain")
+        mock_object.sources[path.lower()] = body
+        self.state.versions[path.lower()] = self.state.versions.get(path.lower(), 0) + 1
+        mock_object.inactive = True
+        self._send(200)
+
+    def _delete(self, mock_object: MockObject, query: dict):
+        if query.get("lockHandle") != mock_object.lock_handle:
+            return self._send(423, "Invalid lock handle", content_type="text/plain")
+        if mock_object.object_type == "DEVC/K" and any(
+            o.package == mock_object.name for o in self.state.objects.values()
+        ):
+            return self._send(400, f"Package {mock_object.name} is not empty", content_type="text/plain")
+        for uri in [uri for uri in self.state.objects if uri.startswith(mock_object.uri + "/")]:
+            # function modules go with their function group
+            del self.state.objects[uri]
+        del self.state.objects[mock_object.uri]
+        self._send(200)
+
+    def _create(self, path: str, body: str):
+        object_type = re.search(r'adtcore:type="([^"]+)"', body).group(1)
+        name = re.search(r'adtcore:name="([^"]+)"', body).group(1)
+        package = re.search(r'adtcore:packageRef adtcore:name="([^"]+)"', body)
+        if f"{path}/{name}".lower() in self.state.objects:
+            return self._send(400, f"{name} already exists", content_type="text/plain")
+        if object_type == "FUGR/FF":
+            if self.state.find_object(path[: -len("/fmodules")]) is None:
+                return self._send(404, "Function group does not exist", content_type="text/plain")
+            uri = f"{path.lower()}/{name.lower()}"
+            mock_object = MockObject(object_type, name.upper(), uri, "")
+            mock_object.sources[f"{uri}/source/main"] = f"FUNCTION {name.lower()}.\nENDFUNCTION."
+            self.state.objects[uri] = mock_object
+            self.state.versions[f"{uri}/source/main"] = 1
+        else:
+            self.state.add_object(object_type, name, package.group(1) if package else "$TMP")
+        self._send(201, headers={"Location": f"{path}/{escape(name.lower())}"})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+class MockAdtServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, config: MockAdtConfig = None, host: str = "127.0.0.1", port: int = 0):
+        self.state = MockAdtState(config or MockAdtConfig())
+        super().__init__((host, port), MockAdtHandler)
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def _serve(config: MockAdtConfig, connection):
+    server = MockAdtServer(config)
+    connection.send(server.url)
+    server.serve_forever()
+
+
+class MockAdtProcess:
+    """Runs the mock server in a child process so it does not share the GIL with the client."""
+
+    def __init__(self, config: MockAdtConfig = None):
+        self.config = config or MockAdtConfig()
+        self._process = None
+
+    def start(self) -> str:
+        parent_connection, child_connection = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(self.config, child_connection), daemon=True
+        )
+        self._process.start()
+        return parent_connection.recv()
+
+    def stop(self):
+        self._process.terminate()
+        self._process.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the ADT endpoints used by abap-adt-py.")
+    parser.add_argument("--port", type=int, default=50000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--objects", type=int, default=20)
+    parser.add_argument("--source-lines", type=int, default=200)
+    arguments = parser.parse_args()
+
+    server = MockAdtServer(
+        MockAdtConfig(
+            latency=arguments.latency,
+            object_count=arguments.objects,
+            source_lines=arguments.source_lines,
+        ),
+        port=arguments.port,
+    )
+    print(f"Mock ADT server listening on {server.url}")
+    server.serve_forever()
@@ -0,0 +1,92 @@
+import xml.etree.ElementTree as et
+
+from abap_adt_py.api.activate import _build_activation_body, _parse_mass_activation_response
+from abap_adt_py.api.xml_namespaces import XML_NAMESPACES
+
+OBJECTS = [
+    ("Z_REPORT", "/sap/bc/adt/programs/programs/z_report"),
+    ("ZCL_ORDER", "/sap/bc/adt/oo/classes/zcl_order"),
+]
+
+
+def activation_response(messages, executed=True):
+    flag = "true" if executed else "false"
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<chkl:messages xmlns:chkl="http://www.sap.com/abapxml/checklist" xmlns:adtcore="http://www.sap.com/adt/core">
+  {messages}
+  <chkl:properties checkExecuted="true" activationExecuted="{flag}" generationExecuted="{flag}"/>
+</chkl:messages>"""
+
+
+def message(type, href="", description="", text="Error"):
+    return (
+        f'<msg objDescr="{description}" type="{type}" line="1" href="{href}" forceSupported="true">'
+        f"<shortText><txt>{text}</txt></shortText></msg>"
+    )
+
+
+def test_names_and_uris_are_escaped():
+    object_uri = '/sap/bc/adt/oo/classes/%2fabc%2fz?a=1&b="2"'
+
+    body = _build_activation_body([('/ABC/Z&<"', object_uri)])
+
+    reference = et.fromstring(body.strip()).find("adtcore:objectReference", XML_NAMESPACES)
+    assert reference.get(f"{{{XML_NAMESPACES['adtcore']}}}name") == '/ABC/Z&<"'
+    assert reference.get(f"{{{XML_NAMESPACES['adtcore']}}}uri") == object_uri
+
+
+def test_owned_messages_go_to_their_object():
+    response = activation_response(
+        message("E", href="/sap/bc/adt/oo/classes/zcl_order/source/main#start=3,1")
+        + message("W", description="Program Z_REPORT")
+    )
+
+    results = _parse_mass_activation_response(response, OBJECTS)
+
+    assert [result["activated"] for result in results] == [True, False]
+    assert [message["type"] for message in results[0]["messages"]] == ["W"]
+    assert [message["type"] for message in results[1]["messages"]] == ["E"]
+    assert results[0]["batch_messages"] == []
+
+
+def test_unowned_messages_stay_at_batch_level():
+    response = activation_response(message("E", href="/sap/bc/adt/ddic/tables/zother"))
+
+    results = _parse_mass_activation_response(response, OBJECTS)
+
+    assert all(result["activated"] for result in results)
+    assert all(result["messages"] == [] for result in results)
+    assert results[0]["batch_messages"] == results[1]["batch_messages"]
+    assert [message["href"] for message in results[0]["batch_messages"]] == [
+        "/sap/bc/adt/ddic/tables/zother"
+    ]
+
+
+def test_nothing_is_activated_when_the_activation_did_not_run():
+    response = activation_response(
+        message("E", href="/sap/bc/adt/ddic/tables/zother"), executed=False
+    )
+
+    results = _parse_mass_activation_response(response, OBJECTS)
+
+    assert not any(result["activated"] for result in results)
+    assert len(results[0]["batch_messages"]) == 1
+
+
+def test_empty_response_activates_everything():
+    results = _parse_mass_activation_response("", OBJECTS)
+
+    assert [(result["name"], result["activated"]) for result in results] == [
+        ("Z_REPORT", True),
+        ("ZCL_ORDER", True),
+    ]
+
+
+def test_activate_many_against_the_mock_server(mock_server, client):
+    uri = "/sap/bc/adt/programs/programs/zmock_prog_0"
+    mock_server.state.objects[uri].inactive = True
+
+    results = client.activate_many([("ZMOCK_PROG_0", uri)], chunk_size=1)
+
+    assert [result["activated"] for result in results] == [True]
+    assert not mock_server.state.objects[uri].inactive
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+
+from abap_adt_py.async_adt_client import AsyncAdtClient
+from conftest import CREDENTIALS
+
+PROGRAM_URI = "/sap/bc/adt/programs/programs/zmock_prog_0"
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_requests_in_flight_are_bounded(mock_server):
+    in_flight = 0
+    peak = 0
+    counter_lock = threading.Lock()
+
+    def get_object_source(object_uri, version="active"):
+        nonlocal in_flight, peak
+        with counter_lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.05)
+        with counter_lock:
+            in_flight -= 1
+        return object_uri
+
+    async def main():
+        async with AsyncAdtClient(mock_server.url, *CREDENTIALS, max_concurrency=2) as client:
+            client.adt_client.get_object_source = get_object_source
+            return await asyncio.gather(*(client.get_object_source(str(i)) for i in range(8)))
+
+    assert _run(main()) == [str(i) for i in range(8)]
+    assert peak == 2
+
+
+def test_lock_edit_unlock_use_the_leased_session(mock_server):
+    include_uri = f"{PROGRAM_URI}/source/main"
+
+    async def main():
+        async with AsyncAdtClient(mock_server.url, *CREDENTIALS, max_concurrency=2) as client:
+            await client.login()
+            lock_handle = await client.lock(PROGRAM_URI)
+            leased, _ = client._leases[lock_handle]
+            assert leased is not client.adt_client
+            assert leased.locks == {lock_handle: PROGRAM_URI}
+
+            calls = []
+            set_object_source = leased.set_object_source
+            leased.set_object_source = lambda *args: calls.append(args) or set_object_source(*args)
+            await client.set_object_source(include_uri, "REPORT zmock_prog_0.", lock_handle)
+            assert calls == [(include_uri, "REPORT zmock_prog_0.", lock_handle)]
+
+            await client.unlock(PROGRAM_URI, lock_handle)
+            assert client._leases == {}
+            assert leased.statefulness == "stateless"
+            # the session went back to the pool
+            assert client._pool._idle.qsize() == 1
+
+    _run(main())
+    mock_object = mock_server.state.objects[PROGRAM_URI]
+    assert mock_object.sources[include_uri] == "REPORT zmock_prog_0."
+    assert mock_object.lock_handle is None
+
+
+def test_iter_search_object_yields_the_streamed_results(mock_server):
+    async def main():
+        async with AsyncAdtClient(mock_server.url, *CREDENTIALS) as client:
+            await client.login()
+            names = [result["name"] async for result in client.iter_search_object("ZMOCK_PROG*", 50)]
+            first = None
+            async for result in client.iter_search_object("ZMOCK_PROG*", 50, compact=True):
+                first = result
+                break
+            return names, first, client.adt_client.search_object("ZMOCK_PROG*", 50)
+
+    names, first, expected = _run(main())
+    assert names == [result["name"] for result in expected]
+    assert first.name == names[0]
+
+
+def test_close_shuts_down_the_workers_and_the_pool(mock_server):
+    async def main():
+        client = AsyncAdtClient(mock_server.url, *CREDENTIALS)
+        await client.login()
+        lock_handle = await client.lock(PROGRAM_URI)
+        await client.unlock(PROGRAM_URI, lock_handle)
+        await client.close()
+        return client
+
+    client = _run(main())
+    assert client._executor._shutdown
+    assert client._pool._closed
+    assert client._pool._idle.empty()
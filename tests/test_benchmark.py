@@ -0,0 +1,42 @@
+from benchmark import BenchmarkResult, bulk_workflows, measure, percentile, single_operations
+from abap_adt_py.adt_client import AdtClient
+from conftest import CREDENTIALS
+
+
+def test_percentile():
+    values = [5, 1, 4, 2, 3]
+
+    assert percentile(values, 0.0) == 1
+    assert percentile(values, 0.5) == 3
+    assert percentile(values, 1.0) == 5
+
+
+def test_measure_times_every_call():
+    calls = []
+
+    result = measure("noop", 3, calls.append)
+
+    assert calls == [0, 1, 2]
+    assert len(result.latencies) == 3
+    assert result.peak_memory is None
+    assert result.row().startswith("noop")
+
+
+def test_single_operations_run_against_the_mock_server(mock_server):
+    client = AdtClient(mock_server.url, *CREDENTIALS)
+    client.login()
+
+    results = single_operations(client, 2, mock_server.state.config)
+
+    assert all(isinstance(result, BenchmarkResult) for result in results)
+    assert {result.name for result in results} >= {"login", "activate", "prettyprint"}
+    assert all(result.calls == 2 for result in results)
+
+
+def test_bulk_workflows_run_against_the_mock_server(mock_server):
+    results = bulk_workflows(mock_server.url, 4, 2, mock_server.state.config, "http1")
+
+    assert [result.name for result in results][:2] == [
+        "async get_object_source x2",
+        "pooled lock/edit/unlock",
+    ]
@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+from abap_adt_py import bulk_create
+from abap_adt_py.bulk_create import (
+    create_objects,
+    created_object_uri,
+    creation_waves,
+    load_object_specs,
+)
+
+
+def spec(object_type, name, parent="ZMOCK", **options):
+    return {"object_type": object_type, "name": name, "parent": parent, "description": name, **options}
+
+
+def test_objects_are_created_in_dependency_waves(mock_server, pool):
+    specs = [
+        spec("FUGR/FF", "Z_ORDER_READ", parent="ZORDER_FG"),
+        spec("FUGR/F", "ZORDER_FG"),
+        spec("DCLS/DL", "ZI_ORDER"),
+        spec("DDLS/DF", "ZI_ORDER"),
+        spec("PROG/P", "ZORDER_REPORT", source="REPORT zorder_report.", depends_on=["ZI_ORDER"]),
+    ]
+
+    result = create_objects(pool, specs)
+
+    waves = {(created["object_type"], created["name"]): created["wave"] for created in result["objects"]}
+    assert waves == {
+        ("FUGR/F", "ZORDER_FG"): 0,
+        ("DDLS/DF", "ZI_ORDER"): 0,
+        ("FUGR/FF", "Z_ORDER_READ"): 1,
+        ("DCLS/DL", "ZI_ORDER"): 1,
+        # depends on the view and the access control named ZI_ORDER
+        ("PROG/P", "ZORDER_REPORT"): 2,
+    }
+    assert all(created["created"] and created["error"] is None for created in result["objects"])
+    assert len(result["activation"]) == len(specs)
+    report_uri = "/sap/bc/adt/programs/programs/zorder_report"
+    assert mock_server.state.objects[report_uri].sources[f"{report_uri}/source/main"] == (
+        "REPORT zorder_report."
+    )
+
+
+def test_dependents_of_failed_objects_are_skipped(mock_server, pool):
+    specs = [
+        # exists already
+        spec("PROG/P", "ZMOCK_PROG_0"),
+        spec("CLAS/OC", "ZCL_ORDER", depends_on=["ZMOCK_PROG_0"]),
+        spec("PROG/P", "ZORDER_REPORT"),
+    ]
+
+    result = create_objects(pool, specs)
+
+    by_name = {created["name"]: created for created in result["objects"]}
+    assert by_name["ZMOCK_PROG_0"]["error"].startswith("400")
+    assert not by_name["ZCL_ORDER"]["created"]
+    assert by_name["ZCL_ORDER"]["error"].startswith("Skipped")
+    assert "/sap/bc/adt/oo/classes/zcl_order" not in mock_server.state.objects
+    assert [activation["name"] for activation in result["activation"]] == ["ZORDER_REPORT"]
+
+
+def test_objects_whose_sources_failed_are_not_activated(mock_server, pool, monkeypatch):
+    write_initial_sources = bulk_create.write_initial_sources
+
+    def fail_for_interface(adt_client, object_spec):
+        if object_spec["name"] == "ZIF_ORDER":
+            raise Exception("423 - Invalid lock handle")
+        write_initial_sources(adt_client, object_spec)
+
+    monkeypatch.setattr(bulk_create, "write_initial_sources", fail_for_interface)
+    specs = [
+        spec("INTF/OI", "ZIF_ORDER", source="INTERFACE zif_order. ENDINTERFACE."),
+        spec("CLAS/OC", "ZCL_ORDER", depends_on=["ZIF_ORDER"]),
+    ]
+
+    result = create_objects(pool, specs)
+
+    by_name = {created["name"]: created for created in result["objects"]}
+    assert by_name["ZIF_ORDER"]["created"]
+    assert by_name["ZIF_ORDER"]["error"].startswith("Created, writing the sources failed")
+    assert by_name["ZCL_ORDER"]["error"].startswith("Skipped")
+    assert result["activation"] == []
+
+
+def test_namespaced_names_are_quoted_in_created_uris():
+    assert created_object_uri("CLAS/OC", "/DMO/CL_TEST", "/DMO/PKG") == (
+        "/sap/bc/adt/oo/classes/%2Fdmo%2Fcl_test"
+    )
+    assert created_object_uri("FUGR/FF", "/DMO/FM", "/DMO/GROUP") == (
+        "/sap/bc/adt/functions/groups/%2Fdmo%2Fgroup/fmodules/%2Fdmo%2Ffm"
+    )
+
+
+def test_circular_dependencies_are_rejected():
+    with pytest.raises(ValueError, match="Circular"):
+        creation_waves(
+            [spec("PROG/P", "ZA", depends_on=["ZB"]), spec("PROG/P", "ZB", depends_on=["ZA"])]
+        )
+
+
+@pytest.mark.parametrize(
+    "entry, message",
+    [
+        ({"object_type": "PROG/P", "name": "ZA", "parent": "ZMOCK"}, "lacks description"),
+        (dict(spec("PROG/P", "ZA"), package="ZMOCK"), "unknown keys package"),
+        (spec("XXXX/X", "ZA"), "cannot create objects of type XXXX/X"),
+        (spec("PROG/P", "ZA", depends_on="ZB"), "depends_on must be a list"),
+    ],
+)
+def test_invalid_manifest_entries_are_named(tmp_path, entry, message):
+    manifest = tmp_path / "objects.json"
+    manifest.write_text(json.dumps({"objects": [spec("PROG/P", "ZOK"), entry]}))
+
+    with pytest.raises(ValueError, match=f"Object 1 \\(ZA\\).*{message}"):
+        load_object_specs(str(manifest))
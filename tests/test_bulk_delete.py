@@ -0,0 +1,118 @@
+import pytest
+
+from abap_adt_py import bulk_delete
+from abap_adt_py.bulk_delete import (
+    delete_object,
+    delete_objects,
+    delete_package_contents,
+    delete_target,
+)
+from abap_adt_py.http_request import AdtRequestError
+from abap_adt_py.session_pool import SessionPool
+from conftest import CREDENTIALS
+
+
+def test_package_contents_are_deleted_in_waves(mock_server, pool):
+    result = delete_package_contents(pool, "ZMOCK")
+
+    assert all(deleted["deleted"] for deleted in result["objects"])
+    assert {deleted["object_name"] for deleted in result["objects"]} >= {"ZMOCK", "ZMOCK_SUB"}
+    assert mock_server.state.objects == {}
+    # the sessions ended stateless and went back to the pool
+    assert pool._idle.qsize() > 0
+
+
+def test_package_is_deleted_after_its_objects_in_a_later_round(mock_server):
+    mock_server.state.add_object("DEVC/K", "ZORDER", "$TMP")
+    mock_server.state.add_object("PROG/P", "ZORDER_REPORT", "ZORDER")
+    targets = [
+        # the package is listed first, it is tried again once the program is gone
+        {"object_uri": "/sap/bc/adt/packages/zorder", "object_type": "PROG/P", "object_name": "ZORDER"},
+        delete_target("/sap/bc/adt/programs/programs/zorder_report"),
+    ]
+
+    # a single session tries the package before the program
+    with SessionPool(mock_server.url, *CREDENTIALS, size=1) as pool:
+        result = delete_objects(pool, targets)
+
+    by_name = {deleted["object_name"]: deleted for deleted in result["objects"]}
+    assert by_name["ZORDER"]["deleted"] and by_name["ZORDER"]["attempts"] == 2
+    assert by_name["ZORDER_REPORT"]["attempts"] == 1
+
+
+def test_locked_objects_are_retried_until_no_progress(mock_server, client, pool):
+    program_uri = "/sap/bc/adt/programs/programs/zmock_prog_1"
+    client.lock(program_uri)
+
+    result = delete_package_contents(pool, "ZMOCK")
+
+    by_name = {deleted["object_name"]: deleted for deleted in result["objects"]}
+    assert not by_name["ZMOCK_PROG_1"]["deleted"]
+    assert by_name["ZMOCK_PROG_1"]["error"].startswith("403")
+    assert by_name["ZMOCK_PROG_1"]["attempts"] == 2
+    assert not by_name["ZMOCK_SUB"]["deleted"]
+    assert list(mock_server.state.objects) == [
+        "/sap/bc/adt/packages/zmock",
+        "/sap/bc/adt/packages/zmock_sub",
+        program_uri,
+    ]
+
+
+def test_authorization_errors_are_not_retried(mock_server, pool, monkeypatch):
+    delete_object = bulk_delete.delete_object
+
+    def forbid_program(adt_client, object_uri):
+        if object_uri.endswith("zmock_prog_0"):
+            raise AdtRequestError(403, f"403 Failed to lock {object_uri}\nNo authorization")
+        delete_object(adt_client, object_uri)
+
+    monkeypatch.setattr(bulk_delete, "delete_object", forbid_program)
+
+    result = delete_package_contents(pool, "ZMOCK")
+
+    by_name = {deleted["object_name"]: deleted for deleted in result["objects"]}
+    assert by_name["ZMOCK_PROG_0"]["attempts"] == 1
+    assert not by_name["ZMOCK_PROG_0"]["deleted"]
+    # the package of the program is retried as long as others are deleted
+    assert by_name["ZMOCK"]["attempts"] == 2
+
+
+def test_failed_delete_is_reported_when_the_unlock_fails_too(client, monkeypatch):
+    program_uri = "/sap/bc/adt/programs/programs/zmock_prog_0"
+
+    def fail(status_code, message):
+        def raise_error(*args):
+            raise AdtRequestError(status_code, message)
+
+        return raise_error
+
+    monkeypatch.setattr(client, "delete", fail(400, "400 Failed to delete, still in use"))
+    monkeypatch.setattr(client, "unlock", fail(423, "423 Failed to unlock"))
+
+    with pytest.raises(AdtRequestError, match="still in use") as raised:
+        delete_object(client, program_uri)
+    assert raised.value.status_code == 400
+
+
+def test_conflicts_are_told_apart_by_status_code(mock_server, pool, monkeypatch):
+    def fail(adt_client, object_uri):
+        if object_uri.endswith("zmock_prog_0"):
+            # a message that does not start with its status
+            raise AdtRequestError(409, "Object is still used by ZMOCK_PROG_1")
+        if object_uri.endswith("zmock_prog_1"):
+            raise AdtRequestError(404, "Not found")
+        raise Exception("409 looks like a conflict but carries no status")
+
+    monkeypatch.setattr(bulk_delete, "delete_object", fail)
+    targets = [
+        delete_target("/sap/bc/adt/programs/programs/zmock_prog_0"),
+        delete_target("/sap/bc/adt/programs/programs/zmock_prog_1"),
+        delete_target("/sap/bc/adt/programs/programs/zmock_prog_2"),
+    ]
+
+    result = delete_objects(pool, targets)
+
+    by_name = {deleted["object_name"]: deleted for deleted in result["objects"]}
+    assert by_name["ZMOCK_PROG_1"]["deleted"]
+    assert by_name["ZMOCK_PROG_0"]["attempts"] == 2
+    assert by_name["ZMOCK_PROG_2"]["attempts"] == 1
@@ -0,0 +1,91 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from abap_adt_py.adt_client import AdtClient
+from abap_adt_py.concurrency import AimdLimiter, RequestThrottle
+from conftest import CREDENTIALS
+
+PROGRAM_URI = "/sap/bc/adt/programs/programs/zmock_prog_0"
+
+
+def test_csrf_retry_does_not_wait_for_its_own_permit(mock_server):
+    throttle = RequestThrottle(AimdLimiter(initial_limit=1, min_limit=1, max_limit=1))
+    adt_client = AdtClient(mock_server.url, *CREDENTIALS, throttle=throttle)
+    adt_client.login()
+    mock_server.state.csrf_tokens.clear()
+    finished = []
+
+    def edit():
+        lock_handle = adt_client.lock(PROGRAM_URI)
+        adt_client.unlock(PROGRAM_URI, lock_handle)
+        finished.append(True)
+
+    thread = threading.Thread(target=edit, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+
+    assert finished
+    assert throttle.stats()["in_flight"] == 0
+
+
+def test_throttle_bounds_concurrent_requests(mock_server):
+    mock_server.state.config.latency = 0.02
+    throttle = RequestThrottle(AimdLimiter(initial_limit=2, min_limit=1, max_limit=2))
+    adt_client = AdtClient(mock_server.url, *CREDENTIALS, throttle=throttle)
+    adt_client.login()
+    peak = []
+    original_acquire = throttle.limiter.acquire
+
+    def acquire():
+        permit = original_acquire()
+        peak.append(throttle.limiter.in_flight)
+        return permit
+
+    throttle.limiter.acquire = acquire
+    threads = [
+        threading.Thread(
+            target=adt_client.get_object_source,
+            args=(f"/sap/bc/adt/programs/programs/zmock_prog_{index}/source/main",),
+        )
+        for index in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert len(peak) == 6
+    assert max(peak) <= 2
+    assert throttle.stats()["in_flight"] == 0
+
+
+def test_aimd_limit_backs_off_once_per_overload():
+    limiter = AimdLimiter(initial_limit=8, min_limit=1, max_limit=16, backoff_ratio=0.5)
+    permits = [limiter.acquire() for _ in range(3)]
+
+    for permit in permits:
+        limiter.release(permit, dropped=True)
+
+    assert limiter.limit == 4
+    assert limiter.drops == 3
+
+
+def test_overloaded_server_is_retried(mock_server):
+    mock_server.state.config.latency = 0.05
+    mock_server.state.config.work_processes = 1
+    throttle = RequestThrottle(AimdLimiter(initial_limit=8, max_limit=8), retry_backoff=0.01)
+    adt_client = AdtClient(mock_server.url, *CREDENTIALS, throttle=throttle)
+    adt_client.login()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        sources = list(
+            executor.map(
+                lambda index: adt_client.get_object_source(
+                    f"/sap/bc/adt/programs/programs/zmock_prog_{index % 6}/source/main"
+                ),
+                range(8),
+            )
+        )
+
+    assert all(source.startswith("REPORT") for source in sources)
+    assert throttle.stats()["limit"] < 8
@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+
+from abap_adt_py.crawl import Crawl
+
+
+def test_values_are_streamed_and_items_reported_done():
+    with Crawl(lambda item: range(item), max_workers=2) as crawl:
+        for item in [2, 3]:
+            crawl.submit(item)
+        events = list(crawl)
+
+    values = sorted((item, value) for item, value, error in events if value is not None)
+    done = sorted(item for item, value, error in events if value is None and error is None)
+    assert values == [(2, 0), (2, 1), (3, 0), (3, 1), (3, 2)]
+    assert done == [2, 3]
+
+
+def test_failures_are_reported_with_their_item():
+    def function(item):
+        if item == "bad":
+            raise ValueError("bad item")
+        return [item]
+
+    with Crawl(function) as crawl:
+        crawl.submit("good")
+        crawl.submit("bad")
+        errors = {item: str(error) for item, _, error in crawl if error is not None}
+
+    assert errors == {"bad": "bad item"}
+
+
+def test_items_submitted_while_iterating_belong_to_the_same_iteration():
+    seen = []
+    with Crawl(lambda item: [item], max_workers=2) as crawl:
+        crawl.submit(1)
+        for item, value, error in crawl:
+            if value is not None:
+                seen.append(value)
+                if value < 4:
+                    crawl.submit(value + 1)
+
+    assert sorted(seen) == [1, 2, 3, 4]
+
+
+def test_workers_wait_for_a_slow_consumer():
+    produced = []
+
+    def function(item):
+        for value in range(100):
+            produced.append(value)
+            yield value
+
+    with Crawl(function, buffer_size=5) as crawl:
+        crawl.submit("page")
+        events = iter(crawl)
+        next(events)
+        time.sleep(0.1)
+
+        assert len(produced) <= 7
+
+
+def test_close_returns_without_waiting_for_items_in_flight():
+    release = threading.Event()
+
+    def function(item):
+        release.wait(5)
+        return [item]
+
+    crawl = Crawl(function, max_workers=1)
+    for item in range(3):
+        crawl.submit(item)
+    started = time.perf_counter()
+    crawl.close()
+    release.set()
+
+    assert time.perf_counter() - started < 1
+
+
+def test_max_workers_must_be_positive():
+    with pytest.raises(ValueError):
+        Crawl(list, max_workers=0)
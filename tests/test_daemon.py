@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+
+import pytest
+
+from abap_adt_py import cli
+from abap_adt_py import daemon as daemon_module
+from abap_adt_py.daemon import AdtDaemon
+from abap_adt_py.daemon_protocol import read_daemon_state, send_to_daemon, state_file_path
+
+PROGRAM_URI = "/sap/bc/adt/programs/programs/zmock_prog_1"
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    monkeypatch.setenv("ABAP_ADT_HOME", str(tmp_path))
+    adt_daemon = AdtDaemon(pool_size=2, idle_timeout=None, directory=str(tmp_path))
+    thread = threading.Thread(target=adt_daemon.serve, daemon=True)
+    thread.start()
+    while read_daemon_state(str(tmp_path)) is None:
+        time.sleep(0.01)
+    yield adt_daemon
+    if thread.is_alive():
+        adt_daemon.shutdown()
+        thread.join()
+
+
+def _system(mock_server):
+    return {
+        "host": mock_server.url,
+        "client": "001",
+        "user": "DEVELOPER",
+        "password": "password",
+        "language": "EN",
+    }
+
+
+def _cli(mock_server, *argv):
+    cli.main(
+        ["--host", mock_server.url, "--client", "001", "--user", "DEVELOPER", "--password", "password", *argv]
+    )
+
+
+def test_cli_commands_are_served_by_the_daemon(mock_server, daemon, capsys):
+    _cli(mock_server, "resolve", "ZMOCK_PROG_1", "--type", "PROG")
+    assert capsys.readouterr().out == f"{PROGRAM_URI}\n"
+
+    _cli(mock_server, "source", f"{PROGRAM_URI}/source/main")
+    source = capsys.readouterr().out
+    assert source == mock_server.state.objects[PROGRAM_URI].sources[f"{PROGRAM_URI}/source/main"]
+
+    assert daemon.status()["systems"] == [f"DEVELOPER@{mock_server.url}/001"]
+
+
+def test_write_source_locks_and_unlocks_in_the_daemon(mock_server, daemon, tmp_path, capsys):
+    source_file = tmp_path / "zmock_prog_1.abap"
+    source_file.write_text("REPORT zmock_prog_1.\n")
+
+    _cli(mock_server, "write", PROGRAM_URI, str(source_file))
+
+    mock_object = mock_server.state.objects[PROGRAM_URI]
+    assert mock_object.sources[f"{PROGRAM_URI}/source/main"] == "REPORT zmock_prog_1.\n"
+    assert mock_object.lock_handle is None
+
+
+def test_unknown_requests_are_rejected(mock_server, daemon, tmp_path):
+    state = read_daemon_state(str(tmp_path))
+
+    with pytest.raises(Exception, match="Invalid daemon token"):
+        send_to_daemon({"operation": "status"}, dict(state, token="wrong"), timeout=2)
+    with pytest.raises(Exception, match="Unknown operation"):
+        send_to_daemon(
+            {"system": _system(mock_server), "operation": "lock", "arguments": {}}, state, timeout=2
+        )
+    assert send_to_daemon({"operation": "status"}, state, timeout=2)["pid"] == os.getpid()
+
+
+def test_shutdown_removes_the_state_file(daemon, tmp_path):
+    state = read_daemon_state(str(tmp_path))
+
+    assert send_to_daemon({"operation": "shutdown"}, state, timeout=2) is True
+    deadline = time.monotonic() + 5
+    while os.path.exists(state_file_path(str(tmp_path))) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not os.path.exists(state_file_path(str(tmp_path)))
+
+
+def test_daemon_is_not_idle_while_requests_are_running(mock_server, tmp_path, monkeypatch):
+    adt_daemon = AdtDaemon(idle_timeout=0.05, directory=str(tmp_path))
+    started = threading.Event()
+    finish = threading.Event()
+
+    def run_operation(adt_client, operation, arguments):
+        started.set()
+        finish.wait(5)
+        return True
+
+    monkeypatch.setattr(daemon_module, "run_operation", run_operation)
+    call = threading.Thread(target=adt_daemon.call, args=(_system(mock_server), "prettyprint", {}))
+    try:
+        call.start()
+        started.wait(5)
+        time.sleep(0.1)
+        assert not adt_daemon.is_idle()
+        finish.set()
+        call.join()
+        assert not adt_daemon.is_idle()
+        time.sleep(0.1)
+        assert adt_daemon.is_idle()
+    finally:
+        finish.set()
+        adt_daemon.server_close()
+        for pool in adt_daemon._pools.values():
+            pool.close()
@@ -0,0 +1,67 @@
+import time
+
+from abap_adt_py.dependency_graph import impacted_objects, iter_usage_edges, usage_graph
+
+PROGRAMS = "/sap/bc/adt/programs/programs"
+CLASSES = "/sap/bc/adt/oo/classes"
+
+
+def test_usage_graph_of_direct_users(mock_server, client):
+    graph = usage_graph(client, [f"{PROGRAMS}/zmock_prog_0"])
+
+    assert graph == {
+        f"{PROGRAMS}/zmock_prog_0": [f"{CLASSES}/zcl_zmock_0", f"{PROGRAMS}/zmock_prog_1"]
+    }
+
+
+def test_impacted_objects_are_found_at_their_shortest_distance(mock_server, client):
+    distances = impacted_objects(client, [f"{PROGRAMS}/zmock_prog_0/source/main"], max_depth=2)
+
+    assert distances == {
+        f"{CLASSES}/zcl_zmock_0": 1,
+        f"{PROGRAMS}/zmock_prog_1": 1,
+        f"{CLASSES}/zcl_zmock_1": 2,
+        f"{PROGRAMS}/zmock_prog_2": 2,
+        f"{CLASSES}/zcl_zmock_2": 2,
+        f"{PROGRAMS}/zmock_prog_3": 2,
+    }
+
+
+def test_object_types_and_max_objects_limit_the_crawl(mock_server, client):
+    edges = list(
+        iter_usage_edges(
+            client,
+            [f"{PROGRAMS}/zmock_prog_0"],
+            max_depth=3,
+            max_objects=2,
+            object_types=["PROG/P"],
+        )
+    )
+
+    assert [(edge["used_uri"], edge["user_uri"], edge["depth"]) for edge in edges] == [
+        (f"{PROGRAMS}/zmock_prog_0", f"{PROGRAMS}/zmock_prog_1", 1),
+        (f"{PROGRAMS}/zmock_prog_1", f"{PROGRAMS}/zmock_prog_3", 2),
+    ]
+
+
+def test_failed_objects_are_collected(mock_server, client):
+    failed = {}
+
+    edges = list(iter_usage_edges(client, [f"{PROGRAMS}/zmissing"], failed=failed))
+
+    assert edges == []
+    assert list(failed) == [f"{PROGRAMS}/zmissing"]
+    assert failed[f"{PROGRAMS}/zmissing"].startswith("404")
+
+
+def test_stopping_early_does_not_wait_for_pending_requests(mock_server, client):
+    mock_server.state.config.latency = 0.3
+    edges = iter_usage_edges(
+        client, [f"{PROGRAMS}/zmock_prog_{index}" for index in range(6)], max_workers=2
+    )
+
+    next(edges)
+    started = time.perf_counter()
+    edges.close()
+
+    assert time.perf_counter() - started < 0.2
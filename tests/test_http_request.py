@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from abap_adt_py.http_request import is_csrf_failure
+
+PROGRAM_URI = "/sap/bc/adt/programs/programs/zmock_prog_0"
+
+
+def test_expired_csrf_token_is_fetched_again(mock_server, client):
+    mock_server.state.csrf_tokens.clear()
+
+    lock_handle = client.lock(PROGRAM_URI)
+    client.unlock(PROGRAM_URI, lock_handle)
+
+    assert client.csrf_token in mock_server.state.csrf_tokens
+
+
+def test_concurrent_rejections_fetch_one_token(mock_server, client):
+    mock_server.state.csrf_tokens.clear()
+    rejected_token = client.csrf_token
+    fetched = []
+    fetch_csrf_token = client._fetch_csrf_token
+
+    def counting_fetch():
+        fetched.append(True)
+        return fetch_csrf_token()
+
+    client._fetch_csrf_token = counting_fetch
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        tokens = list(executor.map(lambda _: client.refresh_csrf_token(rejected_token), range(4)))
+
+    assert len(fetched) == 1
+    assert set(tokens) == {client.csrf_token}
+
+
+def test_other_403_responses_are_not_retried(mock_server, client):
+    lock_handle = client.lock(PROGRAM_URI)
+    requests_before = mock_server.state.request_count
+
+    with pytest.raises(Exception, match="403"):
+        client.lock(PROGRAM_URI)
+
+    assert mock_server.state.request_count == requests_before + 1
+    client.unlock(PROGRAM_URI, lock_handle)
+
+
+def test_csrf_failure_is_recognized():
+    rejected = requests.Response()
+    rejected.status_code = 403
+    rejected.headers["x-csrf-token"] = "Required"
+    forbidden = requests.Response()
+    forbidden.status_code = 403
+    forbidden._content = b"ZMOCK_PROG_0 is locked"
+
+    assert is_csrf_failure(rejected)
+    assert not is_csrf_failure(forbidden)
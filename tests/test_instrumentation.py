@@ -0,0 +1,93 @@
+import logging
+
+import pytest
+
+from abap_adt_py.instrumentation import Instrumentation, endpoint_template
+
+PROGRAM_URI = "/sap/bc/adt/programs/programs/zmock_prog_0"
+
+
+def _record(endpoint="/sap/bc/adt/programs/programs/{name}", latency=0.02, status=200, error=None):
+    return {
+        "method": "GET",
+        "uri": endpoint,
+        "endpoint": endpoint,
+        "status": status,
+        "latency": latency,
+        "request_bytes": 10,
+        "response_bytes": 100,
+        "retries": 0,
+        "request_number": 1,
+        "error": error,
+    }
+
+
+@pytest.mark.parametrize(
+    "uri, endpoint",
+    [
+        (f"{PROGRAM_URI}/source/main?version=active", "/sap/bc/adt/programs/programs/{name}/source/main"),
+        ("/sap/bc/adt/oo/classes/zcl_a/includes/testclasses", "/sap/bc/adt/oo/classes/{name}/includes/testclasses"),
+        ("/sap/bc/adt/functions/groups/zfg/fmodules/zfm/source/main", "/sap/bc/adt/functions/groups/{name}/fmodules/{name}/source/main"),
+        ("/sap/bc/adt/repository/informationsystem/search", "/sap/bc/adt/repository/informationsystem/search"),
+    ],
+)
+def test_object_names_are_removed_from_endpoints(uri, endpoint):
+    assert endpoint_template(uri) == endpoint
+
+
+def test_hooks_see_every_request_of_a_client(client):
+    before = []
+    after = []
+    client.instrumentation.add_pre_request_hook(before.append)
+    client.instrumentation.add_post_request_hook(after.append)
+
+    client.get_object_source(f"{PROGRAM_URI}/source/main")
+    client.search_object("ZMOCK*", 5)
+
+    assert [info["endpoint"] for info in before] == [record["endpoint"] for record in after]
+    source_record = after[0]
+    assert source_record["endpoint"] == "/sap/bc/adt/programs/programs/{name}/source/main"
+    assert source_record["status"] == 200
+    assert source_record["response_bytes"] > 0
+    # streamed responses are recorded when the parser closes them
+    assert after[-1]["endpoint"] == "/sap/bc/adt/repository/informationsystem/search"
+    assert after[-1]["response_bytes"] > 0
+
+
+def test_failing_hooks_are_logged_and_ignored(client, caplog):
+    def fail(record):
+        raise RuntimeError("broken hook")
+
+    client.instrumentation.add_post_request_hook(fail)
+
+    with caplog.at_level(logging.ERROR, logger="abap_adt_py.instrumentation"):
+        assert client.get_object_source(f"{PROGRAM_URI}/source/main")
+    assert "broken hook" in caplog.text
+
+    client.instrumentation.remove_hook(fail)
+    caplog.clear()
+    client.get_object_source(f"{PROGRAM_URI}/source/main")
+    assert caplog.text == ""
+
+
+def test_summary_aggregates_per_endpoint():
+    instrumentation = Instrumentation(max_records=2)
+    instrumentation.after_request(_record(latency=0.004))
+    instrumentation.after_request(_record(latency=0.03))
+    instrumentation.after_request(_record(latency=0.2, status=500))
+    instrumentation.after_request(_record(endpoint="/sap/bc/adt/checkruns", latency=0.001))
+
+    slowest, fastest = instrumentation.summary()
+    assert slowest["count"] == 3 and slowest["errors"] == 1
+    assert slowest["min_latency"] == 0.004 and slowest["max_latency"] == 0.2
+    assert slowest["histogram"]["<=5ms"] == 1
+    assert slowest["histogram"]["<=50ms"] == 1
+    assert slowest["histogram"]["<=250ms"] == 1
+    assert slowest["p50_latency"] == 0.05
+    assert slowest["p99_latency"] == 0.2
+    assert slowest["request_bytes"] == 30
+    assert fastest["endpoint"] == "/sap/bc/adt/checkruns"
+    assert len(instrumentation.records) == 2
+
+    instrumentation.reset()
+    assert instrumentation.summary() == [] and not instrumentation.records
@@ -0,0 +1,73 @@
+import json
+import os
+
+from abap_adt_py import mirror
+from abap_adt_py.mirror import (
+    MANIFEST_FILE_NAME,
+    PackageMirror,
+    path_to_source_uri,
+    source_uri_to_path,
+)
+
+CLASS_URI = "/sap/bc/adt/oo/classes/zcl_zmock_0"
+
+
+def test_source_uri_and_path_round_trip():
+    source_uri = f"{CLASS_URI}/includes/testclasses"
+
+    path = source_uri_to_path(source_uri)
+
+    assert path == os.path.join("oo", "classes", "zcl_zmock_0", "includes", "testclasses.abap")
+    assert path_to_source_uri(path) == source_uri
+
+
+def test_resync_only_downloads_changed_sources(mock_server, client, tmp_path):
+    package_mirror = PackageMirror(client, str(tmp_path), max_workers=4)
+    first = package_mirror.sync("ZMOCK")
+    source_uri = "/sap/bc/adt/programs/programs/zmock_prog_0/source/main"
+    lock_handle = client.lock("/sap/bc/adt/programs/programs/zmock_prog_0")
+    client.set_object_source(source_uri, "REPORT zmock_prog_0.", lock_handle)
+    client.unlock("/sap/bc/adt/programs/programs/zmock_prog_0", lock_handle)
+
+    second = package_mirror.sync("ZMOCK")
+
+    assert f"{CLASS_URI}/includes/testclasses" in first["downloaded"]
+    assert second["downloaded"] == [source_uri]
+    assert len(second["unchanged"]) == len(first["downloaded"]) - 1
+    assert (tmp_path / source_uri_to_path(source_uri)).read_text() == "REPORT zmock_prog_0."
+
+
+def test_sources_of_deleted_objects_are_removed(mock_server, client, tmp_path):
+    package_mirror = PackageMirror(client, str(tmp_path), max_workers=4)
+    package_mirror.sync("ZMOCK")
+    del mock_server.state.objects["/sap/bc/adt/programs/programs/zmock_prog_0"]
+
+    result = package_mirror.sync("ZMOCK")
+
+    source_uri = "/sap/bc/adt/programs/programs/zmock_prog_0/source/main"
+    assert result["removed"] == [source_uri]
+    assert not (tmp_path / source_uri_to_path(source_uri)).exists()
+
+
+def test_class_whose_includes_cannot_be_listed_keeps_its_files(
+    mock_server, client, tmp_path, monkeypatch
+):
+    package_mirror = PackageMirror(client, str(tmp_path), max_workers=4)
+    package_mirror.sync("ZMOCK")
+    object_structure = mirror.object_structure
+
+    def fail_for_class(http_request_parameters, object_uri):
+        if object_uri == CLASS_URI:
+            raise Exception("503 - No free work process")
+        return object_structure(http_request_parameters, object_uri)
+
+    monkeypatch.setattr(mirror, "object_structure", fail_for_class)
+
+    result = package_mirror.sync("ZMOCK")
+
+    assert result["failed"] == {CLASS_URI: "503 - No free work process"}
+    assert result["removed"] == []
+    with open(tmp_path / MANIFEST_FILE_NAME, encoding="utf-8") as file:
+        sources = json.load(file)["sources"]
+    assert f"{CLASS_URI}/includes/testclasses" in sources
+    assert (tmp_path / source_uri_to_path(f"{CLASS_URI}/includes/testclasses")).exists()
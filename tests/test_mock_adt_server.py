@@ -0,0 +1,74 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from mock_adt_server import MockAdtConfig, MockAdtServer
+
+ADT = "/sap/bc/adt"
+
+
+def login(url):
+    session = requests.Session()
+    response = session.get(f"{url}{ADT}/compatibility/graph", headers={"x-csrf-token": "fetch"})
+    session.headers["x-csrf-token"] = response.headers["x-csrf-token"]
+    return session
+
+
+def test_changes_need_a_csrf_token(mock_server):
+    response = requests.post(f"{mock_server.url}{ADT}/programs/programs/zmock_prog_0?_action=LOCK")
+
+    assert response.status_code == 403
+    assert response.headers["x-csrf-token"] == "Required"
+
+
+def test_second_lock_is_rejected(mock_server):
+    session = login(mock_server.url)
+    uri = f"{mock_server.url}{ADT}/programs/programs/zmock_prog_0"
+
+    first = session.post(f"{uri}?_action=LOCK&accessMode=MODIFY")
+    second = session.post(f"{uri}?_action=LOCK&accessMode=MODIFY")
+
+    assert first.status_code == 200 and "LOCK_HANDLE" in first.text
+    assert second.status_code == 403
+    assert second.text == "ZMOCK_PROG_0 is locked"
+
+
+def test_unchanged_source_is_not_modified(mock_server):
+    session = login(mock_server.url)
+    source_uri = f"{mock_server.url}{ADT}/programs/programs/zmock_prog_0/source/main"
+
+    first = session.get(source_uri)
+    second = session.get(source_uri, headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.text.startswith("REPORT zmock_prog_0.")
+    assert second.status_code == 304
+
+
+def test_search_results_are_in_name_order_and_capped(mock_server):
+    mock_server.state.config.search_results = 3
+    response = requests.get(
+        f"{mock_server.url}{ADT}/repository/informationsystem/search",
+        params={"operation": "quickSearch", "query": "ZMOCK_PROG*", "maxResults": 10},
+    )
+
+    assert response.text.count("<adtcore:objectReference ") == 3
+    assert response.text.index("ZMOCK_PROG_0") < response.text.index("ZMOCK_PROG_1")
+
+
+def test_requests_beyond_the_work_process_queue_are_rejected():
+    server = MockAdtServer(MockAdtConfig(latency=0.2, work_processes=1))
+    server.start()
+    try:
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            statuses = list(
+                executor.map(
+                    lambda _: requests.get(f"{server.url}{ADT}/compatibility/graph").status_code,
+                    range(6),
+                )
+            )
+    finally:
+        server.stop()
+
+    assert 503 in statuses
+    assert 200 in statuses
+    assert server.state.rejected_count == statuses.count(503)
@@ -0,0 +1,80 @@
+import threading
+
+import pytest
+
+from abap_adt_py.paged_search import iter_search_all, partition_query, search_all
+
+
+def test_full_pages_are_split_by_prefix(mock_server, client):
+    expected = {
+        mock_object.uri
+        for mock_object in mock_server.state.objects.values()
+        if mock_object.name.startswith("Z")
+    }
+
+    references = search_all(client, "z*", page_size=4, max_workers=4)
+
+    assert len(references) == len(expected)
+    assert {reference["uri"] for reference in references} == expected
+
+
+def test_failed_pages_are_collected(mock_server, client, monkeypatch):
+    iter_search_object = client.iter_search_object
+
+    def fail_for_classes(query, max_results=1, compact=False):
+        if query.startswith("ZC"):
+            raise Exception("500 - Failed to search")
+        return iter_search_object(query, max_results, compact)
+
+    monkeypatch.setattr(client, "iter_search_object", fail_for_classes)
+    failed = {}
+
+    references = list(iter_search_all(client, "Z*", page_size=4, failed=failed))
+
+    assert failed == {"ZC*": "500 - Failed to search"}
+    names = {reference["name"] for reference in references}
+    assert {f"ZMOCK_PROG_{index}" for index in range(6)} <= names
+
+
+def test_stopping_early_does_not_wait_for_pending_pages(mock_server, client):
+    mock_server.state.config.latency = 0.05
+    references = iter_search_all(client, "Z*", page_size=4, max_workers=2)
+
+    first = next(references)
+    references.close()
+
+    assert first["name"].startswith("Z")
+
+
+def test_page_size_must_be_positive(client):
+    with pytest.raises(ValueError):
+        list(iter_search_all(client, "Z*", page_size=0))
+
+
+def test_only_prefix_queries_are_partitioned():
+    assert partition_query("ZCL_") == []
+    assert partition_query("Z*")[:2] == ["ZA*", "ZB*"]
+
+
+
+def test_references_are_yielded_before_their_page_is_complete(mock_server, client, monkeypatch):
+    first_received = threading.Event()
+    page_complete_first = []
+    iter_search_object = client.iter_search_object
+
+    def waiting_after_the_first(query, max_results=1, compact=False):
+        for index, reference in enumerate(iter_search_object(query, max_results, compact)):
+            yield reference
+            if index == 0:
+                page_complete_first.append(not first_received.wait(5))
+
+    monkeypatch.setattr(client, "iter_search_object", waiting_after_the_first)
+    references = iter_search_all(client, "ZMOCK_PROG*", page_size=50, max_workers=1)
+
+    first = next(references)
+    first_received.set()
+    rest = list(references)
+
+    assert first["name"] == "ZMOCK_PROG_0"
+    assert len(rest) == 5
+    assert page_complete_first == [False]
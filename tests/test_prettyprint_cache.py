@@ -0,0 +1,59 @@
+import logging
+import os
+
+from abap_adt_py.adt_client import AdtClient
+from abap_adt_py.prettyprint_cache import PrettyPrintCache, prettyprint_cache_key
+from conftest import CREDENTIALS
+
+SETTINGS = {"indentation": True, "style": "keywordUpper"}
+
+
+def test_entries_survive_the_process(tmp_path):
+    key = prettyprint_cache_key("host", "developer", SETTINGS, "report z.")
+    PrettyPrintCache(str(tmp_path)).put(key, "REPORT z.")
+
+    cache = PrettyPrintCache(str(tmp_path))
+    assert cache.get(key) == "REPORT z."
+    assert cache.stats() == {"hits": 1, "misses": 0}
+
+
+def test_keys_depend_on_user_and_settings():
+    key = prettyprint_cache_key("host", "developer", SETTINGS, "report z.")
+
+    assert key == prettyprint_cache_key("host", "DEVELOPER", dict(SETTINGS), "report z.")
+    assert key != prettyprint_cache_key("host", "other", SETTINGS, "report z.")
+    assert key != prettyprint_cache_key("host", "developer", None, "report z.")
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = PrettyPrintCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+
+
+def test_failed_disk_write_keeps_the_formatted_source(mock_server, tmp_path, monkeypatch, caplog):
+    def replace(source, destination):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(os, "replace", replace)
+    adt_client = AdtClient(
+        mock_server.url, *CREDENTIALS, prettyprint_cache=PrettyPrintCache(str(tmp_path))
+    )
+    adt_client.login()
+    adt_client.prettyprint_settings(SETTINGS)
+
+    with caplog.at_level(logging.WARNING, logger="abap_adt_py.prettyprint_cache"):
+        assert adt_client.prettyprint("report z.") == "REPORT Z."
+
+    assert "pretty printer cache" in caplog.text
+    assert os.listdir(str(tmp_path)) == []
+    requests_sent = mock_server.state.request_count
+    # still served from memory
+    assert adt_client.prettyprint("report z.") == "REPORT Z."
+    assert mock_server.state.request_count == requests_sent
+    adt_client.transport.close()
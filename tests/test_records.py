@@ -0,0 +1,91 @@
+import sys
+
+import pytest
+
+from abap_adt_py.records import (
+    ComponentRecord,
+    ObjectReferenceRecord,
+    SyntaxCheckRecord,
+    UnitTestAlertRecord,
+    to_dicts,
+    to_records,
+)
+
+CLASS_URI = "/sap/bc/adt/oo/classes/zcl_zmock_0"
+
+
+def test_records_round_trip_with_extra_and_missing_keys():
+    values = {"uri": CLASS_URI, "type": "CLAS/OC", "name": "ZCL_ZMOCK_0", "custom": 1}
+
+    record = ObjectReferenceRecord.from_dict(values)
+
+    assert record.name == "ZCL_ZMOCK_0" and record.package_name is None
+    assert record.extra == {"custom": 1}
+    assert record.to_dict() == values
+    assert record == ObjectReferenceRecord.from_dict(dict(values))
+    assert not hasattr(record, "__dict__")
+
+
+def test_repeated_values_are_interned():
+    first, second = to_records(
+        SyntaxCheckRecord,
+        [
+            {"uri": "".join([CLASS_URI, ""]), "type": "E", "short_text": "Unknown " + "field"},
+            {"uri": "".join([CLASS_URI, ""]), "type": "E", "short_text": "Unknown " + "field"},
+        ],
+    )
+
+    assert first.uri is second.uri is sys.intern(CLASS_URI)
+    assert first.short_text is second.short_text
+
+
+@pytest.mark.parametrize(
+    "record_class, values",
+    [
+        (
+            UnitTestAlertRecord,
+            {
+                "title": "failed",
+                "kind": "failedAssertion",
+                "severity": "critical",
+                "details": ["a", "b"],
+                "stack": [],
+            },
+        ),
+        (
+            ComponentRecord,
+            {
+                "name": "METHOD_0",
+                "type": "CLAS/OM",
+                "links": [
+                    {
+                        "rel": "http://www.sap.com/adt/relations/source/definitionIdentifier",
+                        "href": "#start=1,0",
+                    }
+                ],
+                "level": "instance",
+                "clif_name": "ZCL_ZMOCK_0",
+                "visibility": "public",
+            },
+        ),
+    ],
+)
+def test_converted_fields_are_exported_in_their_dict_form(record_class, values):
+    (record,) = to_records(record_class, [values])
+
+    assert to_dicts([record]) == [values]
+
+
+def test_compact_client_results_match_the_dicts(client):
+    results = client.search_object("ZMOCK*", 10)
+    compact = client.search_object("ZMOCK*", 10, compact=True)
+    assert to_dicts(compact) == results
+
+    alerts = client.run_unit_test(CLASS_URI)
+    compact_alerts = client.run_unit_test(CLASS_URI, compact=True)
+    assert [alert.title for alert in compact_alerts] == [alert["title"] for alert in alerts]
+    assert compact_alerts[0].details == tuple(alerts[0]["details"])
+
+    structure = client.object_structure(CLASS_URI, compact=True)
+    assert all(isinstance(component, ComponentRecord) for component in structure["components"])
+    assert to_dicts(structure["components"]) == client.object_structure(CLASS_URI)["components"]
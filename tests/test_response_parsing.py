@@ -0,0 +1,176 @@
+import io
+import xml.etree.ElementTree as et
+
+import pytest
+
+from abap_adt_py.api import syntax
+from abap_adt_py.api.syntax import (
+    iter_grouped_syntax_check_messages,
+    iter_syntax_check_messages,
+)
+from abap_adt_py.api.unittest import _unit_test_alert, iter_alerts
+from abap_adt_py.api.xml_namespaces import XML_NAMESPACES
+from abap_adt_py.response_parsing import (
+    _et_to_attributes_dict,
+    iter_xml_elements,
+    iter_xml_elements_attributes,
+)
+
+SEARCH_RESPONSE = """<?xml version="1.0" encoding="utf-8"?>
+<adtcore:objectReferences xmlns:adtcore="http://www.sap.com/adt/core">
+  <adtcore:objectReference adtcore:uri="/sap/bc/adt/oo/classes/zcl_a" adtcore:type="CLAS/OC" adtcore:name="ZCL_A"/>
+  <adtcore:objectReference adtcore:uri="/sap/bc/adt/oo/classes/%2fabc%2fcl_b" adtcore:type="CLAS/OC" adtcore:name="/ABC/CL_B" adtcore:description="B &amp; C"/>
+  <other><adtcore:objectReference adtcore:uri="/nested" adtcore:name="NESTED"/></other>
+</adtcore:objectReferences>"""
+
+SYNTAX_RESPONSE = """<?xml version="1.0" encoding="utf-8"?>
+<chkrun:checkRunReports xmlns:chkrun="http://www.sap.com/adt/checkrun">
+  <chkrun:checkReport chkrun:reporter="abapCheckRun" chkrun:triggeringUri="/sap/bc/adt/programs/programs/z_a">
+    <chkrun:checkMessageList>
+      <chkrun:checkMessage chkrun:uri="/sap/bc/adt/programs/programs/z_a/source/main#start=3,7" chkrun:type="E" chkrun:shortText="Unknown field"/>
+      <chkrun:checkMessage chkrun:uri="/sap/bc/adt/programs/programs/z_a/source/main" chkrun:type="W" chkrun:shortText="Unused"/>
+    </chkrun:checkMessageList>
+  </chkrun:checkReport>
+  <chkrun:checkReport chkrun:reporter="abapCheckRun" chkrun:triggeringUri="/sap/bc/adt/oo/classes/zcl_b">
+    <chkrun:checkMessageList>
+      <chkrun:checkMessage chkrun:uri="/sap/bc/adt/oo/classes/zcl_b/includes/testclasses#start=12,1" chkrun:type="E" chkrun:shortText="Syntax"/>
+    </chkrun:checkMessageList>
+  </chkrun:checkReport>
+</chkrun:checkRunReports>"""
+
+UNIT_TEST_RESPONSE = """<?xml version="1.0" encoding="utf-8"?>
+<aunit:runResult xmlns:aunit="http://www.sap.com/adt/aunit" xmlns:adtcore="http://www.sap.com/adt/core">
+  <program adtcore:uri="/sap/bc/adt/oo/classes/zcl_a" adtcore:name="ZCL_A">
+    <testClasses><testClass adtcore:name="LTC_A"><testMethods>
+      <testMethod adtcore:name="FIRST">
+        <alerts>
+          <alert kind="failedAssertion" severity="critical">
+            <title>Critical Assertion Error: 'First'</title>
+            <details>
+              <detail text="Expected [1] Actual [2]"><details><detail text="Test 'FIRST'"/></details></detail>
+            </details>
+            <stack><stackEntry adtcore:uri="/sap/bc/adt/oo/classes/zcl_a/includes/testclasses#start=10" adtcore:description="Include: &lt;ZCL_A&gt; Line: &lt;10&gt;"/></stack>
+          </alert>
+        </alerts>
+      </testMethod>
+      <testMethod adtcore:name="SECOND">
+        <alerts><alert kind="exception" severity="tolerable"><title>Exception</title></alert></alerts>
+      </testMethod>
+    </testMethods></testClass></testClasses>
+  </program>
+</aunit:runResult>"""
+
+
+def dom_attributes(xml_text, tag_path):
+    root = et.fromstring(xml_text)
+    return [_et_to_attributes_dict(element) for element in root.findall(tag_path, XML_NAMESPACES)]
+
+
+@pytest.mark.parametrize(
+    "xml_text, tag_path",
+    [
+        (SEARCH_RESPONSE, "adtcore:objectReference"),
+        (SEARCH_RESPONSE, ".//adtcore:objectReference"),
+        (SEARCH_RESPONSE, "other/adtcore:objectReference"),
+        (UNIT_TEST_RESPONSE, ".//alert"),
+        (UNIT_TEST_RESPONSE, ".//title"),
+        (UNIT_TEST_RESPONSE, "program/testClasses/testClass"),
+    ],
+)
+def test_streamed_elements_match_findall(xml_text, tag_path):
+    streamed = list(iter_xml_elements_attributes(xml_text, tag_path))
+
+    assert streamed == dom_attributes(xml_text, tag_path)
+
+
+def test_streamed_search_results_match_the_dom_parser():
+    stream = io.BytesIO(SEARCH_RESPONSE.encode("utf-8"))
+
+    streamed = list(iter_xml_elements_attributes(stream, "adtcore:objectReference"))
+
+    assert streamed == dom_attributes(SEARCH_RESPONSE, "adtcore:objectReference")
+    assert streamed[1]["description"] == "B & C"
+
+
+def test_matches_keep_their_subtree_while_they_are_processed():
+    titles = [
+        alert.find("title").text for alert in iter_xml_elements(UNIT_TEST_RESPONSE, ".//alert")
+    ]
+    nested = [
+        alert.find("details/detail/details/detail").get("text")
+        for alert in iter_xml_elements(UNIT_TEST_RESPONSE, ".//alert")
+        if alert.get("kind") == "failedAssertion"
+    ]
+
+    assert titles == ["Critical Assertion Error: 'First'", "Exception"]
+    assert nested == ["Test 'FIRST'"]
+
+
+def test_nested_matches_are_yielded_innermost_first():
+    streamed = [detail.get("text") for detail in iter_xml_elements(UNIT_TEST_RESPONSE, ".//detail")]
+
+    assert streamed == ["Test 'FIRST'", "Expected [1] Actual [2]"]
+
+
+def test_streamed_syntax_messages_match_the_dom_parser():
+    root = et.fromstring(SYNTAX_RESPONSE)
+    dom_messages = [
+        syntax._syntax_check_message(message)
+        for message in root.findall(".//chkrun:checkMessage", XML_NAMESPACES)
+    ]
+
+    assert list(iter_syntax_check_messages(SYNTAX_RESPONSE)) == dom_messages
+    assert dom_messages[0] == {
+        "uri": "/sap/bc/adt/programs/programs/z_a",
+        "type": "E",
+        "short_text": "Unknown field",
+        "line": 3,
+        "offset": 7,
+    }
+
+
+def test_grouped_syntax_messages_carry_their_report():
+    grouped = list(iter_grouped_syntax_check_messages(SYNTAX_RESPONSE))
+
+    assert [triggering_uri for triggering_uri, _ in grouped] == [
+        "/sap/bc/adt/programs/programs/z_a",
+        "/sap/bc/adt/programs/programs/z_a",
+        "/sap/bc/adt/oo/classes/zcl_b",
+    ]
+    assert [message for _, message in grouped] == list(iter_syntax_check_messages(SYNTAX_RESPONSE))
+
+
+def test_grouped_syntax_messages_are_detached_from_the_tree(monkeypatch):
+    roots = []
+    iter_xml_events = syntax.iter_xml_events
+
+    def recording(source):
+        for event, element, stack in iter_xml_events(source):
+            if not roots:
+                roots.append(element)
+            yield event, element, stack
+
+    monkeypatch.setattr(syntax, "iter_xml_events", recording)
+    reports = SYNTAX_RESPONSE[
+        SYNTAX_RESPONSE.index("<chkrun:checkReport ") : SYNTAX_RESPONSE.index("</chkrun:checkRunReports>")
+    ]
+    many_reports = SYNTAX_RESPONSE.replace(
+        "</chkrun:checkRunReports>", reports * 50 + "</chkrun:checkRunReports>"
+    )
+
+    messages = list(iter_grouped_syntax_check_messages(many_reports))
+
+    assert len(messages) == 153
+    assert len(roots[0]) == 0
+
+
+def test_streamed_unit_test_alerts_match_the_dom_parser():
+    root = et.fromstring(UNIT_TEST_RESPONSE)
+    dom_alerts = [_unit_test_alert(alert) for alert in root.findall(".//alert")]
+
+    streamed = list(iter_alerts(UNIT_TEST_RESPONSE))
+
+    for alert in streamed + dom_alerts:
+        alert["stack"] = [entry.attrib for entry in alert["stack"]]
+    assert streamed == dom_alerts
+    assert streamed[0]["details"] == ["Expected [1] Actual [2]\nTest 'FIRST'"]
@@ -0,0 +1,76 @@
+import time
+
+from abap_adt_py.search_cache import SearchCache
+
+CLASS = {"uri": "/sap/bc/adt/oo/classes/zcl_a", "type": "CLAS/OC", "name": "ZCL_A"}
+INTERFACE = {"uri": "/sap/bc/adt/oo/interfaces/zcl_a", "type": "INTF/OI", "name": "ZCL_A"}
+
+
+def test_results_are_copied_and_expire():
+    cache = SearchCache(ttl=0.05)
+    cache.put("zcl*", 10, [CLASS])
+
+    cached = cache.get("ZCL*", 10)
+    cached[0]["name"] = "CHANGED"
+
+    assert cache.get("ZCL*", 10) == [CLASS]
+    assert cache.get("ZCL*", 20) is None
+    time.sleep(0.06)
+    assert cache.get("ZCL*", 10) is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_least_recently_used_results_are_evicted():
+    cache = SearchCache(max_entries=2)
+    cache.put("A*", 1, [])
+    cache.put("B*", 1, [])
+    cache.get("A*", 1)
+    cache.put("C*", 1, [])
+
+    assert cache.get("A*", 1) == []
+    assert cache.get("B*", 1) is None
+
+
+def test_lookup_by_name_and_type():
+    cache = SearchCache()
+    cache.index([CLASS, INTERFACE])
+
+    assert cache.lookup("zcl_a", "CLAS") == CLASS
+    assert cache.lookup("ZCL_A", "INTF/OI") == INTERFACE
+    assert cache.lookup("ZCL_A", "PROG") is None
+    assert cache.stats()["index_hits"] == 2
+
+
+def test_client_answers_repeated_searches_and_names_from_the_cache(mock_server, client):
+    client.search_cache = SearchCache()
+    first = client.search_object("ZMOCK_PROG*", 50)
+    requests_before = mock_server.state.request_count
+
+    second = client.search_object("ZMOCK_PROG*", 50)
+    uri = client.resolve_uri("ZMOCK_PROG_1", "PROG")
+
+    assert second == first
+    assert uri == "/sap/bc/adt/programs/programs/zmock_prog_1"
+    assert mock_server.state.request_count == requests_before
+
+
+def test_streamed_search_fills_the_cache_and_the_index(mock_server, client):
+    client.search_cache = SearchCache()
+    streamed = list(client.iter_search_object("ZMOCK_PROG*", 50))
+    requests_before = mock_server.state.request_count
+
+    assert list(client.iter_search_object("ZMOCK_PROG*", 50)) == streamed
+    assert client.search_cache.lookup("ZMOCK_PROG_2") is not None
+    assert mock_server.state.request_count == requests_before
+
+
+def test_stopped_streamed_search_only_fills_the_index(mock_server, client):
+    client.search_cache = SearchCache()
+    references = client.iter_search_object("ZMOCK_PROG*", 50)
+
+    first = next(references)
+    references.close()
+
+    assert client.search_cache.get("ZMOCK_PROG*", 50) is None
+    assert client.search_cache.lookup(first["name"]) == first
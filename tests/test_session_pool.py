@@ -0,0 +1,66 @@
+import pytest
+
+PROGRAM_URI = "/sap/bc/adt/programs/programs/zmock_prog_0"
+
+
+def test_sessions_are_reused(pool):
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        pass
+
+    assert first is second
+
+
+def _lock_handle(mock_server):
+    return mock_server.state.objects[PROGRAM_URI].lock_handle
+
+
+def test_session_still_holding_a_lock_is_discarded(pool, mock_server):
+    with pool.lease() as adt_client:
+        adt_client.lock(PROGRAM_URI)
+
+    assert pool._idle.empty()
+    assert _lock_handle(mock_server) is None
+    with pool.lease() as other:
+        assert other is not adt_client
+
+
+def test_session_is_discarded_when_the_lease_fails(pool, mock_server):
+    with pytest.raises(RuntimeError):
+        with pool.lease() as adt_client:
+            adt_client.lock(PROGRAM_URI)
+            raise RuntimeError("failed")
+
+    assert pool._idle.empty()
+    assert _lock_handle(mock_server) is None
+
+
+def test_discarded_session_is_logged_off_when_unlocking_fails(pool, mock_server):
+    with pool.lease() as adt_client:
+        adt_client.lock(PROGRAM_URI)
+        # the server forgot the handle, the unlock is rejected
+        adt_client.locks = {"stale": PROGRAM_URI}
+
+    assert _lock_handle(mock_server) is None
+    assert adt_client.locks == {}
+    assert adt_client.statefulness == "stateless"
+
+
+def test_session_stays_stateful_while_it_holds_another_lock(client):
+    first = client.lock(PROGRAM_URI)
+    second_uri = "/sap/bc/adt/programs/programs/zmock_prog_1"
+    client.lock(second_uri)
+    client.unlock(PROGRAM_URI, first)
+
+    assert client.statefulness == "stateful"
+    assert list(client.locks.values()) == [second_uri]
+
+
+def test_unlocked_session_is_returned(pool):
+    with pool.lease() as adt_client:
+        lock_handle = adt_client.lock(PROGRAM_URI)
+        adt_client.unlock(PROGRAM_URI, lock_handle)
+
+    assert pool._idle.qsize() == 1
+
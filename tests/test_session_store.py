@@ -0,0 +1,72 @@
+import json
+import os
+import stat
+
+from abap_adt_py.adt_client import AdtClient
+from abap_adt_py.session_store import SessionStore
+from conftest import CREDENTIALS
+
+PROGRAM_URI = "/sap/bc/adt/programs/programs/zmock_prog_0"
+HOST = "http://localhost:50000"
+
+
+def test_sessions_are_stored_per_system_and_user(tmp_path):
+    store = SessionStore(str(tmp_path))
+    store.save(f"{HOST}/", "001", "developer", "token", [{"name": "SAP_SESSIONID", "value": "1"}])
+
+    stored = store.load(HOST, "001", "DEVELOPER")
+    assert stored["csrf_token"] == "token"
+    assert store.load(HOST, "002", "DEVELOPER") is None
+    (path,) = tmp_path.iterdir()
+    assert stat.S_IMODE(os.stat(str(path)).st_mode) == 0o600
+
+    store.delete(HOST, "001", "DEVELOPER")
+    assert store.load(HOST, "001", "DEVELOPER") is None
+
+
+def test_old_and_unreadable_sessions_are_ignored(tmp_path):
+    store = SessionStore(str(tmp_path), max_age=60)
+    store.save(HOST, "001", "DEVELOPER", "token", [])
+    (path,) = tmp_path.iterdir()
+    stored = json.loads(path.read_text())
+    path.write_text(json.dumps(dict(stored, saved=stored["saved"] - 120)))
+
+    assert store.load(HOST, "001", "DEVELOPER") is None
+    path.write_text("{")
+    assert store.load(HOST, "001", "DEVELOPER") is None
+
+
+def test_restored_session_skips_the_login(mock_server, tmp_path):
+    store = SessionStore(str(tmp_path))
+    first = AdtClient(mock_server.url, *CREDENTIALS, session_store=store)
+    first.login()
+    first.transport.close()
+    logins = len(mock_server.state.csrf_tokens)
+
+    second = AdtClient(mock_server.url, *CREDENTIALS, session_store=store)
+    assert second.session_restored
+    second.login()
+    lock_handle = second.lock(PROGRAM_URI)
+    second.unlock(PROGRAM_URI, lock_handle)
+
+    assert second.csrf_token == first.csrf_token
+    assert len(mock_server.state.csrf_tokens) == logins
+    second.transport.close()
+
+
+def test_ended_session_is_replaced_and_stored_again(mock_server, tmp_path):
+    store = SessionStore(str(tmp_path))
+    first = AdtClient(mock_server.url, *CREDENTIALS, session_store=store)
+    first.login()
+    first.transport.close()
+    mock_server.state.csrf_tokens.clear()
+
+    second = AdtClient(mock_server.url, *CREDENTIALS, session_store=store)
+    second.login()
+    lock_handle = second.lock(PROGRAM_URI)
+    second.unlock(PROGRAM_URI, lock_handle)
+
+    assert not second.session_restored
+    assert second.csrf_token != first.csrf_token
+    assert store.load(mock_server.url, "001", "DEVELOPER")["csrf_token"] == second.csrf_token
+    second.transport.close()
@@ -0,0 +1,50 @@
+import pytest
+
+from abap_adt_py.source_cache import DiskSourceCache, MemorySourceCache
+
+PROGRAM_URI = "/sap/bc/adt/programs/programs/zmock_prog_0"
+ENTRY = {"source": "REPORT z.", "etag": '"1"', "last_modified": None}
+
+
+def test_writing_a_source_invalidates_the_cache(mock_server, client):
+    client.source_cache = MemorySourceCache()
+    source_uri = f"{PROGRAM_URI}/source/main"
+    client.get_object_source(source_uri)
+    assert client.get_object_source(source_uri).startswith("REPORT")
+    assert client.source_cache.stats()["hits"] == 1
+
+    lock_handle = client.lock(PROGRAM_URI)
+    client.set_object_source(source_uri, "REPORT zmock_prog_0.\nWRITE 'changed'.", lock_handle)
+    client.unlock(PROGRAM_URI, lock_handle)
+
+    assert client.source_cache.keys() == []
+    assert client.get_object_source(source_uri).endswith("WRITE 'changed'.")
+
+
+def test_deleting_an_object_invalidates_the_cache(mock_server, client):
+    client.source_cache = MemorySourceCache()
+    client.get_object_source(f"{PROGRAM_URI}/source/main")
+
+    lock_handle = client.lock(PROGRAM_URI)
+    client.delete(PROGRAM_URI, lock_handle)
+
+    assert client.source_cache.keys() == []
+    assert client.statefulness == "stateless"
+
+
+@pytest.mark.parametrize("cache_type", ["memory", "disk"])
+def test_invalidate_removes_the_object_and_its_includes(tmp_path, cache_type):
+    cache = MemorySourceCache() if cache_type == "memory" else DiskSourceCache(str(tmp_path))
+    class_uri = "/sap/bc/adt/oo/classes/zcl_order"
+    cache.put(("A4H", f"{class_uri}/source/main", "active"), ENTRY)
+    cache.put(("A4H", f"{class_uri}/includes/testclasses", "inactive"), ENTRY)
+    cache.put(("A4H", f"{class_uri}_item/source/main", "active"), ENTRY)
+    cache.put(("B4H", f"{class_uri}/source/main", "active"), ENTRY)
+
+    cache.invalidate("A4H", class_uri.upper())
+
+    assert sorted(cache.keys()) == [
+        ("A4H", f"{class_uri}_item/source/main", "active"),
+        ("B4H", f"{class_uri}/source/main", "active"),
+    ]
+    assert cache.get(("A4H", f"{class_uri}/source/main", "active")) is None
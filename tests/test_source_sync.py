@@ -0,0 +1,63 @@
+from abap_adt_py.source_sync import sync_object_sources
+
+
+def program_write(mock_server, index, source=None):
+    uri = f"/sap/bc/adt/programs/programs/zmock_prog_{index}"
+    mock_object = mock_server.state.objects[uri]
+    return {
+        "object_uri": uri,
+        "source_uri": f"{uri}/source/main",
+        "source": mock_object.sources[f"{uri}/source/main"] if source is None else source,
+    }
+
+
+def test_only_changed_sources_are_written_and_activated(mock_server, pool):
+    writes = [
+        program_write(mock_server, 0),
+        program_write(mock_server, 1, "REPORT zmock_prog_1.\nWRITE 'changed'."),
+    ]
+
+    result = sync_object_sources(pool, writes)
+
+    assert result["written"] == [writes[1]["source_uri"]]
+    assert result["unchanged"] == [writes[0]["source_uri"]]
+    assert result["failed"] == {}
+    assert [activation["name"] for activation in result["activation"]] == ["ZMOCK_PROG_1"]
+    mock_object = mock_server.state.objects[writes[1]["object_uri"]]
+    assert mock_object.sources[writes[1]["source_uri"]] == writes[1]["source"]
+    assert not mock_object.inactive
+
+
+def test_known_digests_are_updated(mock_server, pool):
+    write = program_write(mock_server, 0, "REPORT zmock_prog_0.\nWRITE 'changed'.")
+    known_digests = {}
+
+    sync_object_sources(pool, [write], known_digests=known_digests)
+    requests_before = mock_server.state.request_count
+    result = sync_object_sources(pool, [write], activate=False, known_digests=known_digests)
+
+    assert result["unchanged"] == [write["source_uri"]]
+    assert mock_server.state.request_count == requests_before
+
+
+def test_inactive_object_is_activated_on_the_next_sync(mock_server, pool):
+    write = program_write(mock_server, 0, "REPORT zmock_prog_0.\nWRITE 'changed'.")
+    sync_object_sources(pool, [write], activate=False)
+    assert mock_server.state.objects[write["object_uri"]].inactive
+
+    result = sync_object_sources(pool, [write])
+
+    assert result["written"] == []
+    assert [activation["name"] for activation in result["activation"]] == ["ZMOCK_PROG_0"]
+    assert not mock_server.state.objects[write["object_uri"]].inactive
+
+
+def test_locked_object_is_reported_as_failed(mock_server, client, pool):
+    write = program_write(mock_server, 0, "REPORT zmock_prog_0.\nWRITE 'changed'.")
+    client.lock(write["object_uri"])
+
+    result = sync_object_sources(pool, [write])
+
+    assert list(result["failed"]) == [write["source_uri"]]
+    assert result["failed"][write["source_uri"]].startswith("403")
+    assert result["activation"] == []
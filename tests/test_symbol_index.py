@@ -0,0 +1,58 @@
+import pytest
+
+from abap_adt_py.symbol_index import SymbolIndex
+
+CLASS_URI = "/sap/bc/adt/oo/classes/zcl_zmock_{}"
+
+
+@pytest.fixture
+def index(tmp_path):
+    with SymbolIndex(str(tmp_path / "symbols.sqlite")) as symbol_index:
+        yield symbol_index
+
+
+def test_update_indexes_classes_with_their_components(client, index):
+    result = index.update(client, "zmock")
+
+    assert sorted(result["indexed"]) == [CLASS_URI.format(number) for number in range(6)]
+    assert result["failed"] == {}
+    symbols = index.object_symbols("zcl_zmock_0")
+    assert symbols[0]["name"] == "ZCL_ZMOCK_0"
+    assert symbols[1]["name"] == "METHOD_0"
+    assert symbols[1]["definition_uri"] == f"{CLASS_URI.format(0)}/source/main#start=1,0"
+
+
+def test_second_update_reads_only_changed_objects(client, index):
+    index.update(client, "ZMOCK")
+    object_uri = CLASS_URI.format(1)
+    lock_handle = client.lock(object_uri)
+    client.set_object_source(f"{object_uri}/source/main", "CLASS zcl_zmock_1 DEFINITION.", lock_handle)
+    client.unlock(object_uri, lock_handle)
+
+    result = index.update(client, "ZMOCK")
+
+    assert result["indexed"] == [object_uri]
+    assert len(result["unchanged"]) == 5
+
+
+def test_prefix_and_fuzzy_queries(client, index):
+    index.update(client, "ZMOCK")
+
+    names = [symbol["name"] for symbol in index.find_prefix("zcl_zmock")]
+    assert names == [f"ZCL_ZMOCK_{number}" for number in range(6)]
+    in_class = index.find_prefix("method_1", object_name="ZCL_ZMOCK_2")
+    assert {symbol["object_name"] for symbol in in_class} == {"ZCL_ZMOCK_2"}
+    assert [symbol["name"] for symbol in in_class][:2] == ["METHOD_1", "METHOD_10"]
+    # a misspelled name in the middle still finds the class
+    assert "ZCL_ZMOCK_3" in [symbol["name"] for symbol in index.find_fuzzy("ZCL_ZMOK_3")]
+
+
+def test_objects_that_left_the_package_are_removed(mock_server, client, index):
+    index.update(client, "ZMOCK")
+    del mock_server.state.objects[CLASS_URI.format(2)]
+
+    result = index.update(client, "ZMOCK")
+
+    assert result["removed"] == [CLASS_URI.format(2)]
+    assert index.object_symbols("ZCL_ZMOCK_2") == []
+    assert index.find_prefix("ZCL_ZMOCK_2") == []
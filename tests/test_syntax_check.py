@@ -0,0 +1,72 @@
+import pytest
+
+from abap_adt_py.api.syntax import chunk_syntax_check_inputs
+
+CLASS_URI = "/sap/bc/adt/oo/classes/zcl_zmock_{}"
+
+
+def _checks(count, source="CLASS x DEFINITION."):
+    return [
+        (CLASS_URI.format(number), f"{CLASS_URI.format(number)}/source/main", source, "active")
+        for number in range(count)
+    ]
+
+
+def test_chunks_are_bounded_by_object_count_and_size():
+    assert [len(chunk) for chunk in chunk_syntax_check_inputs(_checks(5), 2, 1000)] == [2, 2, 1]
+    # 300 bytes of source are 400 bytes in base64
+    assert [len(chunk) for chunk in chunk_syntax_check_inputs(_checks(5, "x" * 300), 50, 1000)] == [
+        2,
+        2,
+        1,
+    ]
+
+
+def test_includes_of_an_object_stay_in_one_chunk():
+    object_uri = CLASS_URI.format(0)
+    checks = [
+        (object_uri, f"{object_uri}/source/main", "x" * 600, "active"),
+        (CLASS_URI.format(1), f"{CLASS_URI.format(1)}/source/main", "x", "active"),
+        (object_uri, f"{object_uri}/includes/testclasses", "x" * 600, "active"),
+    ]
+
+    chunks = chunk_syntax_check_inputs(checks, 50, 1000)
+
+    # the object exceeds the byte limit on its own and is sent anyway
+    assert [[include_uri for _, include_uri, _, _ in chunk] for chunk in chunks] == [
+        [f"{object_uri}/source/main", f"{object_uri}/includes/testclasses"],
+        [f"{CLASS_URI.format(1)}/source/main"],
+    ]
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_messages_are_grouped_per_object_across_chunks(client, max_workers):
+    client.instrumentation.reset()
+
+    results = client.syntax_check_many(_checks(6), chunk_size=2, max_workers=max_workers)
+
+    check_runs = [
+        record
+        for record in client.instrumentation.records
+        if record["endpoint"] == "/sap/bc/adt/checkruns"
+    ]
+    assert len(check_runs) == 3
+    assert list(results) == [CLASS_URI.format(number) for number in range(6)]
+    for object_uri, messages in results.items():
+        assert {message["uri"] for message in messages} == {object_uri}
+        assert [message["short_text"] for message in messages] == [
+            f"Mock message {number}" for number in range(5)
+        ]
+
+
+def test_compact_results_are_records(client):
+    results = client.syntax_check_many(_checks(2), compact=True)
+
+    messages = results[CLASS_URI.format(1)]
+    assert messages[0].short_text == "Mock message 0"
+    assert messages[0].type == "W"
+
+
+def test_invalid_chunk_settings_are_rejected(client):
+    with pytest.raises(ValueError):
+        client.syntax_check_many(_checks(1), chunk_size=0)
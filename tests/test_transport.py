@@ -0,0 +1,59 @@
+import pytest
+
+from abap_adt_py import transport
+from abap_adt_py.adt_client import AdtClient
+from abap_adt_py.session_pool import SessionPool
+from abap_adt_py.transport import HttpxTransport, RequestsTransport, create_transport
+from conftest import CREDENTIALS
+
+PROGRAM_URI = "/sap/bc/adt/programs/programs/zmock_prog_0"
+requires_httpx = pytest.mark.skipif(transport.httpx is None, reason="httpx is not installed")
+
+
+@requires_httpx
+def test_transports_are_selected_by_name():
+    http1 = create_transport("http1")
+    http2 = create_transport("http2")
+
+    assert isinstance(http1, RequestsTransport)
+    assert isinstance(http2, HttpxTransport)
+    with pytest.raises(ValueError, match="Unknown transport"):
+        create_transport("http3")
+    http1.close()
+    http2.close()
+
+
+def test_http2_transport_needs_httpx(monkeypatch):
+    monkeypatch.setattr(transport, "httpx", None)
+
+    with pytest.raises(ImportError, match="abap-adt-py\\[http2\\]"):
+        create_transport("http2")
+
+
+@requires_httpx
+def test_client_works_over_the_httpx_transport(mock_server):
+    adt_client = AdtClient(mock_server.url, *CREDENTIALS, transport="http2")
+    adt_client.login()
+
+    source = adt_client.get_object_source(f"{PROGRAM_URI}/source/main")
+    results = adt_client.search_object("ZMOCK_PROG*", 50)
+    # the lock is bound to the session cookie kept by the transport
+    lock_handle = adt_client.lock(PROGRAM_URI)
+    adt_client.unlock(PROGRAM_URI, lock_handle)
+
+    assert source == mock_server.state.objects[PROGRAM_URI].sources[f"{PROGRAM_URI}/source/main"]
+    assert len(results) == 6
+    assert adt_client.session is None
+    assert any(cookie.name == "SAP_SESSIONID_MCK_001" for cookie in adt_client.transport.cookies)
+    adt_client.transport.close()
+
+
+@requires_httpx
+def test_pooled_sessions_get_their_own_transport(mock_server):
+    with pytest.raises(ValueError, match="transport name"):
+        SessionPool(mock_server.url, *CREDENTIALS, transport=RequestsTransport())
+
+    with SessionPool(mock_server.url, *CREDENTIALS, size=2, transport="http2") as pool:
+        with pool.lease() as first, pool.lease() as second:
+            assert isinstance(first.transport, HttpxTransport)
+            assert first.transport is not second.transport
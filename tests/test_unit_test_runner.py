@@ -0,0 +1,69 @@
+import pytest
+
+from abap_adt_py import unit_test_runner
+from abap_adt_py.unit_test_runner import (
+    run_package_unit_tests,
+    run_unit_tests_sharded,
+    shard_object_uris,
+    shard_weights,
+)
+
+CLASS_URI = "/sap/bc/adt/oo/classes/zcl_zmock_{}"
+
+
+def _titles(run):
+    return sorted(alert["title"] for alert in run["alerts"])
+
+
+def test_shards_balance_the_weights():
+    weights = {"a": 5.0, "b": 3.0, "c": 2.0, "d": 1.0}
+
+    shards = shard_object_uris(["a", "b", "c", "d", "e", "a"], 2, weights)
+
+    # e counts as the average weight of 2.75
+    assert shards == [["a", "c"], ["b", "e", "d"]]
+    assert shard_object_uris(["a"], 4) == [["a"]]
+    with pytest.raises(ValueError):
+        shard_object_uris(["a"], 0)
+
+
+def test_sharded_run_merges_the_alerts_of_every_shard(pool):
+    object_uris = [CLASS_URI.format(number) for number in range(6)]
+
+    run = run_unit_tests_sharded(pool, object_uris, shards=3)
+
+    assert [len(shard["object_uris"]) for shard in run["shards"]] == [2, 2, 2]
+    assert all(shard["error"] is None for shard in run["shards"])
+    assert _titles(run) == sorted(
+        f"ZCL_ZMOCK_{number} alert {alert}" for number in range(6) for alert in range(5)
+    )
+    assert set(shard_weights(run)) == set(object_uris)
+
+
+def test_a_failing_shard_keeps_the_alerts_of_the_others(pool, monkeypatch):
+    run_unit_tests = unit_test_runner.AdtClient.run_unit_tests
+
+    def fail_first_class(adt_client, object_uris, unit_test_flags):
+        if CLASS_URI.format(0) in object_uris:
+            raise Exception("500 - Failed to run unit test")
+        return run_unit_tests(adt_client, object_uris, unit_test_flags)
+
+    monkeypatch.setattr(unit_test_runner.AdtClient, "run_unit_tests", fail_first_class)
+
+    run = run_unit_tests_sharded(pool, [CLASS_URI.format(number) for number in range(4)], shards=2)
+
+    failed = [shard for shard in run["shards"] if shard["error"] is not None]
+    assert len(failed) == 1 and CLASS_URI.format(0) in failed[0]["object_uris"]
+    assert len(run["alerts"]) == 10
+    # the failed shard does not get a weight
+    assert CLASS_URI.format(0) not in shard_weights(run)
+
+
+@pytest.mark.parametrize("shards", [1, 3])
+def test_package_runs_find_the_same_alerts(pool, shards):
+    run = run_package_unit_tests(pool, "ZMOCK", shards=shards)
+
+    assert len(run["shards"]) == shards
+    assert _titles(run) == sorted(
+        f"ZCL_ZMOCK_{number} alert {alert}" for number in range(6) for alert in range(5)
+    )
@@ -0,0 +1,113 @@
+import os
+import time
+
+import pytest
+
+from abap_adt_py.mirror import source_uri_to_path
+from abap_adt_py.watch import SourceWatcher
+
+PROGRAM_URI = "/sap/bc/adt/programs/programs/zmock_prog_{}"
+
+
+def _source_uri(number):
+    return f"{PROGRAM_URI.format(number)}/source/main"
+
+
+def _save(directory, number, source):
+    path = os.path.join(str(directory), source_uri_to_path(_source_uri(number)))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        file.write(source)
+    # a new modification time even on file systems with a coarse clock
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def _server_source(mock_server, number):
+    return mock_server.state.objects[PROGRAM_URI.format(number)].sources[_source_uri(number)]
+
+
+@pytest.fixture
+def mirror(tmp_path, mock_server):
+    for number in range(3):
+        _save(tmp_path, number, _server_source(mock_server, number))
+    return tmp_path
+
+
+def _wait_for_batch(watcher, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        batch = watcher.poll()
+        if batch is not None:
+            return batch
+        time.sleep(0.02)
+    raise AssertionError("no batch")
+
+
+def test_files_are_not_read_when_watching_starts(pool, mirror, monkeypatch):
+    read = []
+    monkeypatch.setattr(SourceWatcher, "_read", lambda self, path: read.append(path))
+
+    watcher = SourceWatcher(pool, str(mirror), debounce=0.05)
+
+    assert read == []
+    assert watcher.poll() is None
+
+
+def test_only_changed_sources_are_written(mock_server, pool, mirror):
+    watcher = SourceWatcher(pool, str(mirror), debounce=0.05, activate=False, syntax_check=False)
+    _save(mirror, 0, "REPORT zmock_prog_0.\n")
+    # saved again without a change
+    _save(mirror, 1, _server_source(mock_server, 1))
+
+    batch = _wait_for_batch(watcher)
+
+    assert batch["written"] == [_source_uri(0)]
+    assert batch["unchanged"] == [_source_uri(1)]
+    assert _server_source(mock_server, 0) == "REPORT zmock_prog_0.\n"
+
+    requests_sent = mock_server.state.request_count
+    _save(mirror, 0, "REPORT zmock_prog_0.\n")
+    batch = _wait_for_batch(watcher)
+    assert batch["unchanged"] == [_source_uri(0)]
+    # compared with the digest of the last write, not with the server
+    assert mock_server.state.request_count == requests_sent
+
+
+def test_saves_within_the_debounce_window_form_one_batch(pool, mirror):
+    watcher = SourceWatcher(pool, str(mirror), debounce=0.3, max_delay=10.0)
+
+    _save(mirror, 0, "REPORT zmock_prog_0.\n")
+    assert watcher.poll() is None
+    time.sleep(0.15)
+    _save(mirror, 1, "REPORT zmock_prog_1.\n")
+    assert watcher.poll() is None
+    time.sleep(0.2)
+    # the second save restarted the window
+    assert watcher.poll() is None
+
+    batch = _wait_for_batch(watcher)
+    assert batch["written"] == [_source_uri(0), _source_uri(1)]
+    assert [result["activated"] for result in batch["activation"]] == [True, True]
+    assert set(batch["latencies"]) == {
+        source_uri_to_path(_source_uri(0)),
+        source_uri_to_path(_source_uri(1)),
+    }
+
+
+def test_max_delay_ends_a_window_that_keeps_changing(pool, mirror):
+    watcher = SourceWatcher(
+        pool, str(mirror), debounce=0.2, max_delay=0.3, activate=False, syntax_check=False
+    )
+    started = time.monotonic()
+    batch = None
+    for revision in range(40):
+        _save(mirror, 0, f"REPORT zmock_prog_0. \" {revision}\n")
+        batch = watcher.poll()
+        if batch is not None:
+            break
+        time.sleep(0.05)
+
+    assert batch is not None
+    assert 0.3 <= time.monotonic() - started < 1.0
+    assert batch["written"] == [_source_uri(0)]